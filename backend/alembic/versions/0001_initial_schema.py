@@ -0,0 +1,280 @@
+"""Initial schema
+
+The tables init_db.py created with Base.metadata.create_all before
+migrations existed, exactly as it created them. Databases that were
+created that way are marked as migrated with `alembic stamp 0001`.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 00:48:27.950011
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# PostgreSQL enum types, dropped explicitly on downgrade
+ENUM_TYPES = (
+    'orgtype', 'userstatus', 'vendortype', 'taxtype', 'projecttype',
+    'projectstatus', 'orderstatus', 'processtype', 'cutstatus', 'settlementstatus',
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('organizations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('name_jp', sa.String(length=200), nullable=True),
+    sa.Column('type', sa.Enum('committee', 'prime', 'sub', name='orgtype'), nullable=False),
+    sa.Column('tier', sa.Integer(), nullable=False),
+    sa.Column('business_no', sa.String(length=50), nullable=True),
+    sa.Column('tax_id', sa.String(length=50), nullable=True),
+    sa.Column('bank_name', sa.String(length=100), nullable=True),
+    sa.Column('bank_account', sa.String(length=100), nullable=True),
+    sa.Column('account_holder', sa.String(length=100), nullable=True),
+    sa.Column('contact_person', sa.String(length=100), nullable=True),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_organizations_id'), 'organizations', ['id'], unique=False)
+
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('name_jp', sa.String(length=100), nullable=True),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('role_level', sa.Integer(), nullable=False),
+    sa.Column('tier', sa.Integer(), nullable=False),
+    sa.Column('org_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.Enum('active', 'inactive', 'suspended', name='userstatus'), nullable=False),
+    sa.Column('is_superuser', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('last_login', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['org_id'], ['organizations.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+
+    op.create_table('vendors',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('name_jp', sa.String(length=200), nullable=True),
+    sa.Column('type', sa.Enum('studio', 'freelancer', name='vendortype'), nullable=False),
+    sa.Column('tier', sa.Integer(), nullable=False),
+    sa.Column('org_id', sa.Integer(), nullable=True),
+    sa.Column('contact_person', sa.String(length=100), nullable=True),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('business_no', sa.String(length=50), nullable=True),
+    sa.Column('tax_type', sa.Enum('corporate', 'individual', name='taxtype'), nullable=False),
+    sa.Column('bank_name', sa.String(length=100), nullable=True),
+    sa.Column('bank_account', sa.String(length=100), nullable=True),
+    sa.Column('account_holder', sa.String(length=100), nullable=True),
+    sa.Column('default_rate', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['org_id'], ['organizations.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_vendors_id'), 'vendors', ['id'], unique=False)
+
+    op.create_table('projects',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_no', sa.String(length=20), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('name_jp', sa.String(length=200), nullable=True),
+    sa.Column('client_org_id', sa.Integer(), nullable=False),
+    sa.Column('type', sa.Enum('TVA', 'Movie', 'OVA', 'Web', name='projecttype'), nullable=False),
+    sa.Column('total_episodes', sa.Integer(), nullable=True),
+    sa.Column('total_cuts', sa.Integer(), nullable=True),
+    sa.Column('completed_cuts', sa.Integer(), nullable=True),
+    sa.Column('progress', sa.Numeric(precision=5, scale=2), nullable=True),
+    sa.Column('status', sa.Enum('planning', 'active', 'on_hold', 'completed', 'cancelled', name='projectstatus'), nullable=False),
+    sa.Column('budget', sa.Numeric(precision=15, scale=2), nullable=True),
+    sa.Column('deadline', sa.Date(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['client_org_id'], ['organizations.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_projects_id'), 'projects', ['id'], unique=False)
+    op.create_index(op.f('ix_projects_project_no'), 'projects', ['project_no'], unique=True)
+
+    op.create_table('episodes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('episode_no', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=True),
+    sa.Column('name_jp', sa.String(length=200), nullable=True),
+    sa.Column('total_cuts', sa.Integer(), nullable=True),
+    sa.Column('completed_cuts', sa.Integer(), nullable=True),
+    sa.Column('progress', sa.Numeric(precision=5, scale=2), nullable=True),
+    sa.Column('deadline', sa.Date(), nullable=True),
+    sa.Column('status', postgresql.ENUM('planning', 'active', 'on_hold', 'completed', 'cancelled', name='projectstatus', create_type=False), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_episodes_id'), 'episodes', ['id'], unique=False)
+
+    op.create_table('purchase_orders',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('order_no', sa.String(length=20), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('vendor_id', sa.Integer(), nullable=False),
+    sa.Column('process_type', sa.String(length=20), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('unit', sa.String(length=20), nullable=True),
+    sa.Column('unit_price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('base_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('difficulty_rate', sa.Numeric(precision=3, scale=2), nullable=True),
+    sa.Column('urgency_rate', sa.Numeric(precision=3, scale=2), nullable=True),
+    sa.Column('adjusted_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('vat_rate', sa.Numeric(precision=5, scale=4), nullable=True),
+    sa.Column('vat_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('withholding_tax_rate', sa.Numeric(precision=5, scale=4), nullable=True),
+    sa.Column('withholding_tax', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('net_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('status', sa.Enum('draft', 'pending', 'approved', 'in_progress', 'completed', 'settled', 'cancelled', name='orderstatus'), nullable=False),
+    sa.Column('ordered_by', sa.Integer(), nullable=False),
+    sa.Column('approved_by', sa.Integer(), nullable=True),
+    sa.Column('ordered_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('deadline', sa.Date(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['ordered_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['vendor_id'], ['vendors.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_purchase_orders_id'), 'purchase_orders', ['id'], unique=False)
+    op.create_index(op.f('ix_purchase_orders_order_no'), 'purchase_orders', ['order_no'], unique=True)
+
+    op.create_table('cuts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('episode_id', sa.Integer(), nullable=False),
+    sa.Column('cut_no', sa.String(length=20), nullable=False),
+    sa.Column('scene_no', sa.String(length=20), nullable=True),
+    sa.Column('process_type', sa.Enum('layout', 'genga', 'douga', 'color', 'bg', 'composite', name='processtype'), nullable=False),
+    sa.Column('difficulty_level', sa.Numeric(precision=3, scale=2), nullable=True),
+    sa.Column('assigned_to', sa.Integer(), nullable=True),
+    sa.Column('status', sa.Enum('assigned', 'in_progress', 'qc1_pending', 'qc1_approved', 'qc1_rejected', 'qc2_pending', 'qc2_approved', 'qc2_rejected', 'qc3_pending', 'qc3_approved', 'qc3_rejected', 'completed', 'rework', name='cutstatus'), nullable=False),
+    sa.Column('qc1_status', sa.String(length=20), nullable=True),
+    sa.Column('qc1_approved_by', sa.Integer(), nullable=True),
+    sa.Column('qc1_approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('qc2_status', sa.String(length=20), nullable=True),
+    sa.Column('qc2_approved_by', sa.Integer(), nullable=True),
+    sa.Column('qc2_approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('qc3_status', sa.String(length=20), nullable=True),
+    sa.Column('qc3_approved_by', sa.Integer(), nullable=True),
+    sa.Column('qc3_approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('submitted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['assigned_to'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['episode_id'], ['episodes.id'], ),
+    sa.ForeignKeyConstraint(['qc1_approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['qc2_approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['qc3_approved_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_cuts_id'), 'cuts', ['id'], unique=False)
+
+    op.create_table('settlements',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('settlement_no', sa.String(length=20), nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('vendor_id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('completed_cuts', sa.Integer(), nullable=False),
+    sa.Column('completed_sheets', sa.Integer(), nullable=True),
+    sa.Column('base_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('adjusted_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('vat_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('withholding_tax', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('net_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('penalty_amount', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('adjustment_amount', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('final_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('status', sa.Enum('pending', 'approved', 'paid', 'disputed', 'cancelled', name='settlementstatus'), nullable=False),
+    sa.Column('settled_by', sa.Integer(), nullable=True),
+    sa.Column('approved_by', sa.Integer(), nullable=True),
+    sa.Column('payment_method', sa.String(length=50), nullable=True),
+    sa.Column('payment_date', sa.Date(), nullable=True),
+    sa.Column('payment_reference', sa.String(length=100), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['order_id'], ['purchase_orders.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['settled_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['vendor_id'], ['vendors.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_settlements_id'), 'settlements', ['id'], unique=False)
+    op.create_index(op.f('ix_settlements_settlement_no'), 'settlements', ['settlement_no'], unique=True)
+
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_settlements_settlement_no'), table_name='settlements')
+    op.drop_index(op.f('ix_settlements_id'), table_name='settlements')
+
+    op.drop_table('settlements')
+    op.drop_index(op.f('ix_cuts_id'), table_name='cuts')
+
+    op.drop_table('cuts')
+    op.drop_index(op.f('ix_purchase_orders_order_no'), table_name='purchase_orders')
+    op.drop_index(op.f('ix_purchase_orders_id'), table_name='purchase_orders')
+
+    op.drop_table('purchase_orders')
+    op.drop_index(op.f('ix_episodes_id'), table_name='episodes')
+
+    op.drop_table('episodes')
+    op.drop_index(op.f('ix_projects_project_no'), table_name='projects')
+    op.drop_index(op.f('ix_projects_id'), table_name='projects')
+
+    op.drop_table('projects')
+    op.drop_index(op.f('ix_vendors_id'), table_name='vendors')
+
+    op.drop_table('vendors')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+
+    op.drop_table('users')
+    op.drop_index(op.f('ix_organizations_id'), table_name='organizations')
+
+    op.drop_table('organizations')
+
+    for name in ENUM_TYPES:
+        postgresql.ENUM(name=name).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,92 @@
+"""Document sequences, finance rollups and import jobs
+
+Tables added after the initial schema: the per-year PO-/ST- number
+counters, the pre-aggregated finance rollups and the spreadsheet import
+jobs.
+
+Counters start empty and are seeded from the existing order and
+settlement numbers on first use. Rollups also start empty: on a database
+that already holds orders or settlements, run `python rebuild_rollups.py`
+after upgrading.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:48:52.104217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('document_sequences',
+    sa.Column('prefix', sa.String(length=10), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('last_value', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('prefix', 'year')
+    )
+
+    op.create_table('finance_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source', sa.String(length=20), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('vendor_id', sa.Integer(), nullable=False),
+    sa.Column('period', sa.Date(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('document_count', sa.Integer(), nullable=False),
+    sa.Column('net_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('final_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('vat_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('withholding_tax', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['vendor_id'], ['vendors.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source', 'project_id', 'vendor_id', 'period', 'status', name='uq_finance_rollups_key')
+    )
+    op.create_index(op.f('ix_finance_rollups_id'), 'finance_rollups', ['id'], unique=False)
+
+    op.create_table('import_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('file_path', sa.String(length=500), nullable=False),
+    sa.Column('file_format', sa.String(length=10), nullable=False),
+    sa.Column('status', sa.Enum('pending', 'running', 'completed', 'failed', name='importjobstatus'), nullable=False),
+    sa.Column('last_row', sa.Integer(), nullable=False),
+    sa.Column('processed_rows', sa.Integer(), nullable=False),
+    sa.Column('imported_count', sa.Integer(), nullable=False),
+    sa.Column('error_count', sa.Integer(), nullable=False),
+    sa.Column('errors', sa.JSON(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_import_jobs_id'), 'import_jobs', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_import_jobs_id'), table_name='import_jobs')
+    op.drop_table('import_jobs')
+
+    op.drop_index(op.f('ix_finance_rollups_id'), table_name='finance_rollups')
+    op.drop_table('finance_rollups')
+
+    op.drop_table('document_sequences')
+
+    postgresql.ENUM(name='importjobstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,81 @@
+"""Keyset and hot filter indexes and one settlement per order
+
+(created_at, id) indexes for keyset pagination of order and settlement
+lists, alone and behind each single-column filter; composite indexes for
+the filters used by order, settlement and cut lists; an episode lookup
+index; and a unique constraint on settlements.order_id that replaces the
+check-then-insert in the settlement create endpoint.
+
+On PostgreSQL the indexes are built CONCURRENTLY, so writes continue
+while they build.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:49:05.553192
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns)
+INDEXES = (
+    ('ix_purchase_orders_created_at_id', 'purchase_orders', ['created_at', 'id']),
+    ('ix_purchase_orders_status_created_at_id', 'purchase_orders', ['status', 'created_at', 'id']),
+    ('ix_purchase_orders_project_id_created_at_id', 'purchase_orders', ['project_id', 'created_at', 'id']),
+    ('ix_purchase_orders_vendor_id_created_at_id', 'purchase_orders', ['vendor_id', 'created_at', 'id']),
+    ('ix_settlements_created_at_id', 'settlements', ['created_at', 'id']),
+    ('ix_settlements_status_created_at_id', 'settlements', ['status', 'created_at', 'id']),
+    ('ix_settlements_project_id_created_at_id', 'settlements', ['project_id', 'created_at', 'id']),
+    ('ix_settlements_vendor_id_created_at_id', 'settlements', ['vendor_id', 'created_at', 'id']),
+    ('ix_purchase_orders_project_id_status_created_at_id', 'purchase_orders', ['project_id', 'status', 'created_at', 'id']),
+    ('ix_purchase_orders_vendor_id_status_created_at_id', 'purchase_orders', ['vendor_id', 'status', 'created_at', 'id']),
+    ('ix_settlements_project_id_status_created_at_id', 'settlements', ['project_id', 'status', 'created_at', 'id']),
+    ('ix_settlements_vendor_id_status_created_at_id', 'settlements', ['vendor_id', 'status', 'created_at', 'id']),
+    ('ix_cuts_episode_id_status', 'cuts', ['episode_id', 'status']),
+    ('ix_cuts_assigned_to_status', 'cuts', ['assigned_to', 'status']),
+    ('ix_cuts_status_created_at_id', 'cuts', ['status', 'created_at', 'id']),
+    ('ix_episodes_project_id', 'episodes', ['project_id']),
+)
+
+
+def check_duplicate_settlements() -> None:
+    """Fail with the offending orders instead of a bare constraint error"""
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT order_id FROM settlements GROUP BY order_id HAVING COUNT(*) > 1"
+    )).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            f"Cannot add uq_settlements_order_id: orders {duplicates} have more than one "
+            "settlement. Resolve the duplicates and run the upgrade again."
+        )
+
+
+def upgrade() -> None:
+    if not op.get_context().as_sql:
+        check_duplicate_settlements()
+
+    with op.batch_alter_table('settlements') as batch_op:
+        batch_op.create_unique_constraint('uq_settlements_order_id', ['order_id'])
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+    with op.batch_alter_table('settlements') as batch_op:
+        batch_op.drop_constraint('uq_settlements_order_id', type_='unique')
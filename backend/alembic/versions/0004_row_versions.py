@@ -0,0 +1,38 @@
+"""Row versions for optimistic concurrency
+
+Adds purchase_orders.version and settlements.version, used by the ORM as a
+compare-and-swap on every UPDATE and as the ETag validator. Existing rows
+start at version 1.
+
+On PostgreSQL 11+ adding a column with a constant default does not
+rewrite the table.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 02:10:41.318270
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('purchase_orders', 'settlements')
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('version')
@@ -0,0 +1,230 @@
+"""
+Change feed - In-process pub/sub of order, settlement and cut status changes
+
+Routers publish an event after committing a status change; subscribers
+(the WebSocket and SSE endpoints) receive the events matching their
+project/vendor filters. Recent events are kept so a reconnecting client
+resumes after the last event id it saw. The feed lives in the worker
+process: events are delivered to subscribers of the worker that made the
+change, and ids restart with the process.
+"""
+import asyncio
+import json
+from collections import deque
+from datetime import datetime
+from enum import Enum
+from typing import Iterable, Optional, Set, Tuple
+from app.core.config import settings
+
+
+class SubscriptionOverflow(Exception):
+    """The subscriber fell further behind than its queue allows"""
+
+
+class ChangeEvent:
+    """One published change; `data` is encoded once and shared by every subscriber"""
+
+    __slots__ = ("id", "project_id", "vendor_id", "data")
+
+    def __init__(self, event_id: int, project_id: Optional[int], vendor_id: Optional[int], data: str):
+        self.id = event_id
+        self.project_id = project_id
+        self.vendor_id = vendor_id
+        self.data = data
+
+
+class Subscription:
+    """
+    Queue of events for one connected client
+
+    Filters left as None match every event; a vendor filter never matches
+    cut events, which have no vendor.
+    """
+
+    def __init__(self, feed: "ChangeFeed", project_id: Optional[int], vendor_id: Optional[int], queue_size: int):
+        self.feed = feed
+        self.project_id = project_id
+        self.vendor_id = vendor_id
+        self.queue: "asyncio.Queue[ChangeEvent]" = asyncio.Queue(queue_size)
+        self.overflowed = False
+
+    def matches(self, event: ChangeEvent) -> bool:
+        return (
+            (self.project_id is None or event.project_id == self.project_id)
+            and (self.vendor_id is None or event.vendor_id == self.vendor_id)
+        )
+
+    def offer(self, event: ChangeEvent) -> None:
+        if self.overflowed or not self.matches(event):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Dropping silently would leave a hole; the client reconnects
+            # with its last event id and replays from the feed buffer
+            self.overflowed = True
+            self.feed.overflows += 1
+
+    async def get(self) -> ChangeEvent:
+        """Next event; raises SubscriptionOverflow once events were dropped"""
+        if self.overflowed:
+            raise SubscriptionOverflow()
+        return await self.queue.get()
+
+    def close(self) -> None:
+        self.feed.subscribers.discard(self)
+
+
+class ChangeFeed:
+    """
+    Publisher side of the change feed
+
+    Must be used from the event loop thread (routers publish after their
+    commit, subscribers consume in the endpoint coroutines).
+    """
+
+    def __init__(self, buffer_size: int, queue_size: int, keepalive_seconds: int):
+        self.queue_size = queue_size
+        self.keepalive_seconds = keepalive_seconds  # Idle interval between stream keepalives
+        self.buffer: "deque[ChangeEvent]" = deque(maxlen=buffer_size)
+        self.subscribers: Set[Subscription] = set()
+        self.last_id = 0
+        self.published = 0
+        self.overflows = 0
+
+    def configure(self, buffer_size: int, queue_size: int, keepalive_seconds: int) -> None:
+        """Apply new sizes; buffered events beyond the new buffer size are dropped"""
+        self.queue_size = queue_size
+        self.keepalive_seconds = keepalive_seconds
+        self.buffer = deque(self.buffer, maxlen=buffer_size)
+
+    def publish(
+        self,
+        entity: str,
+        entity_id: int,
+        status,
+        previous_status=None,
+        *,
+        changed_by: Optional[int] = None,
+        project_id: Optional[int] = None,
+        vendor_id: Optional[int] = None,
+        episode_id: Optional[int] = None,
+    ) -> ChangeEvent:
+        """Record a status change and deliver it to matching subscribers"""
+        self.last_id += 1
+        data = json.dumps({
+            "event": "change",
+            "id": self.last_id,
+            "entity": entity,
+            "entity_id": entity_id,
+            "status": _value(status),
+            "previous_status": _value(previous_status),
+            "project_id": project_id,
+            "vendor_id": vendor_id,
+            "episode_id": episode_id,
+            "changed_by": changed_by,
+            "changed_at": datetime.utcnow().isoformat(),
+        })
+        event = ChangeEvent(self.last_id, project_id, vendor_id, data)
+
+        self.buffer.append(event)
+        self.published += 1
+        for subscription in self.subscribers:
+            subscription.offer(event)
+        return event
+
+    def subscribe(
+        self,
+        project_id: Optional[int] = None,
+        vendor_id: Optional[int] = None,
+        last_event_id: Optional[int] = None,
+    ) -> Tuple[Subscription, bool]:
+        """
+        Register a subscriber, replaying buffered events after `last_event_id`
+
+        Returns the subscription and whether the replay is complete; False
+        means events after `last_event_id` are no longer buffered (or the
+        id is from before a restart) and the client should reload its data.
+        """
+        subscription = Subscription(self, project_id, vendor_id, self.queue_size)
+        complete = True
+
+        if last_event_id is not None:
+            oldest = self.buffer[0].id if self.buffer else self.last_id + 1
+            complete = oldest - 1 <= last_event_id <= self.last_id
+            if complete:
+                for event in self.buffer:
+                    if event.id > last_event_id:
+                        subscription.offer(event)
+
+        self.subscribers.add(subscription)
+        return subscription, complete
+
+    def stats(self) -> dict:
+        """Subscriber count and delivery counters"""
+        return {
+            "subscribers": len(self.subscribers),
+            "last_event_id": self.last_id,
+            "buffered": len(self.buffer),
+            "published": self.published,
+            "overflows": self.overflows,
+        }
+
+
+def _value(status):
+    return status.value if isinstance(status, Enum) else status
+
+
+change_feed = ChangeFeed(
+    settings.CHANGE_FEED_BUFFER_SIZE, settings.CHANGE_FEED_QUEUE_SIZE, settings.CHANGE_FEED_KEEPALIVE_SECONDS
+)
+
+
+def order_changed(order, previous_status, changed_by: int) -> None:
+    """Publish the current status of a purchase order"""
+    change_feed.publish(
+        "order", order.id, order.status, previous_status,
+        changed_by=changed_by, project_id=order.project_id, vendor_id=order.vendor_id,
+    )
+
+
+def orders_imported(job_id: int, rows: Iterable[dict], changed_by: int) -> None:
+    """
+    Publish a committed import batch: one "order_import" event per project and vendor
+
+    An event per row would flood subscriber queues with a whole batch at
+    once; clients reload the orders they display instead. The entity id
+    is the import job's.
+    """
+    groups = {}
+    for row in rows:
+        groups.setdefault((row["project_id"], row["vendor_id"]), row["status"])
+    for (project_id, vendor_id), status in sorted(groups.items(), key=lambda group: group[0]):
+        change_feed.publish(
+            "order_import", job_id, status,
+            changed_by=changed_by, project_id=project_id, vendor_id=vendor_id,
+        )
+
+
+def settlement_changed(settlement, previous_status, changed_by: int) -> None:
+    """Publish the current status of a settlement"""
+    change_feed.publish(
+        "settlement", settlement.id, settlement.status, previous_status,
+        changed_by=changed_by, project_id=settlement.project_id, vendor_id=settlement.vendor_id,
+    )
+
+
+def cuts_changed(changes: Iterable, status, project_ids: dict, changed_by: int) -> None:
+    """
+    Publish cut status changes
+
+    Args:
+        changes: (cut_id, episode_id, previous_status) per moved cut
+        status: Status the cuts moved to
+        project_ids: episode_id -> project_id
+    """
+    for cut_id, episode_id, previous_status in changes:
+        change_feed.publish(
+            "cut", cut_id, status, previous_status,
+            changed_by=changed_by, project_id=project_ids.get(episode_id), episode_id=episode_id,
+        )
@@ -0,0 +1,250 @@
+"""
+Response compression - gzip, brotli and zstd negotiated from Accept-Encoding
+
+Text responses (JSON pages, CSV exports) are compressed with the client's
+preferred encoding among those configured; ties go to the order of
+COMPRESSION_ENCODINGS. Complete responses below COMPRESSION_MIN_SIZE are
+sent as they are, except those carrying an ETag. Streamed responses are
+compressed chunk by chunk, so an export is never buffered whole.
+Server-Sent Events and formats that are already compressed (XLSX) pass
+through untouched.
+
+An encoded response's ETag is weakened (W/). A 304 cannot tell how large
+the 200 would have been, so responses with an ETag are encoded whatever
+their size: the 200 is then weakened exactly when an encoding is
+negotiated, and the 304 for the same request carries the same validator.
+
+gzip is always available; brotli and zstd need the brotli and zstandard
+packages and are skipped when those are not installed.
+"""
+import zlib
+from typing import Dict, List, Optional, Tuple
+from app.core.config import Settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+class GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def available_encoders(config: Settings) -> Dict[str, tuple]:
+    """Configured encodings that can be produced here -> (encoder class, level), in preference order"""
+    encoders = {
+        "gzip": (GzipEncoder, config.COMPRESSION_GZIP_LEVEL),
+        "br": (BrotliEncoder, config.COMPRESSION_BROTLI_QUALITY) if brotli is not None else None,
+        "zstd": (ZstdEncoder, config.COMPRESSION_ZSTD_LEVEL) if zstandard is not None else None,
+    }
+    names = [name.strip() for name in config.COMPRESSION_ENCODINGS.split(",") if name.strip()]
+    return {name: encoders[name] for name in names if encoders.get(name) is not None}
+
+
+def negotiate(accept_encoding: str, preference: List[str]) -> Optional[str]:
+    """
+    Encoding to use for an Accept-Encoding header, or None for identity
+
+    The highest q-value wins; among equal q-values the earlier entry in
+    `preference`. `*` covers encodings the header does not name.
+    """
+    qualities: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        name = name.strip()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name] = quality
+
+    best, best_quality = None, 0.0
+    for name in preference:
+        quality = qualities.get(name, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+def compressible(headers: Dict[bytes, bytes]) -> bool:
+    """Whether a response with these headers is text that is worth compressing"""
+    if b"content-encoding" in headers or b"content-range" in headers:
+        return False
+    if b"no-transform" in headers.get(b"cache-control", b""):
+        return False
+    content_type = headers.get(b"content-type", b"").split(b";")[0].strip().lower()
+    if content_type == b"text/event-stream":
+        # Events must reach the client as they are sent, not when a
+        # compressor block fills up
+        return False
+    return (
+        content_type.startswith(b"text/")
+        or content_type.endswith(b"json")
+        or content_type.endswith(b"xml")
+        or content_type == b"application/javascript"
+    )
+
+
+def _vary(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    for index, (name, value) in enumerate(headers):
+        if name.lower() == b"vary":
+            if b"accept-encoding" not in value.lower():
+                headers[index] = (name, value + b", Accept-Encoding")
+            return headers
+    return headers + [(b"vary", b"Accept-Encoding")]
+
+
+def _weaken_etag(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    # The compressed bytes differ from the identity representation, so a
+    # strong validator would no longer be correct; W/ keeps If-None-Match working
+    return [
+        (name, b"W/" + value) if name.lower() == b"etag" and not value.startswith(b"W/") else (name, value)
+        for name, value in headers
+    ]
+
+
+def has_etag(headers: List[Tuple[bytes, bytes]]) -> bool:
+    return any(name.lower() == b"etag" for name, _ in headers)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing text responses
+
+    The response start is held until the first body chunk: a complete body
+    below the size threshold and without an ETag is sent unchanged,
+    anything else is encoded.
+    Vary: Accept-Encoding is added to every compressible response.
+    """
+
+    def __init__(self, app, config: Settings):
+        self.app = app
+        self.min_size = config.COMPRESSION_MIN_SIZE
+        self.encoders = available_encoders(config)
+        self.preference = list(self.encoders)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.encoders:
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+        encoding = negotiate(accept_encoding, self.preference) if accept_encoding else None
+
+        start = None
+        encoder = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, encoder, passthrough
+
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = dict((name.lower(), value) for name, value in message.get("headers", []))
+                if message["status"] == 304:
+                    # Carry the validator of the representation a 200 would
+                    # have had: encoded, since it has an ETag, when an
+                    # encoding was negotiated
+                    passthrough = True
+                    message["headers"] = _vary(list(message.get("headers", [])))
+                    if encoding is not None:
+                        message["headers"] = _weaken_etag(message["headers"])
+                    await send(message)
+                    return
+                if not compressible(headers):
+                    passthrough = True
+                    await send(message)
+                    return
+                message["headers"] = _vary(list(message.get("headers", [])))
+                if encoding is None:
+                    passthrough = True
+                    await send(message)
+                    return
+                start = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if encoder is None:
+                if not more_body and len(body) < self.min_size and not has_etag(start["headers"]):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+
+                encoder_class, level = self.encoders[encoding]
+                encoder = encoder_class(level)
+                headers = [
+                    (name, value) for name, value in _weaken_etag(start["headers"])
+                    if name.lower() != b"content-length"
+                ]
+                headers.append((b"content-encoding", encoding.encode()))
+                if not more_body:
+                    compressed = encoder.compress(body) + encoder.finish()
+                    headers.append((b"content-length", str(len(compressed)).encode()))
+                    start["headers"] = headers
+                    await send(start)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+                start["headers"] = headers
+                await send(start)
+
+            if more_body:
+                compressed = encoder.compress(body)
+                if compressed:
+                    await send({"type": "http.response.body", "body": compressed, "more_body": True})
+            else:
+                await send({"type": "http.response.body", "body": encoder.compress(body) + encoder.finish()})
+
+        await self.app(scope, receive, send_wrapper)
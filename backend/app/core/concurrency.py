@@ -0,0 +1,57 @@
+"""
+Optimistic concurrency - Version-checked commits and If-Match preconditions
+
+PurchaseOrder and Settlement carry a version column that the ORM uses as a
+compare-and-swap: each UPDATE is issued as
+
+    UPDATE ... SET ..., version = :loaded + 1 WHERE id = :id AND version = :loaded
+
+and matches no row when another transaction changed the row after it was
+loaded. No row or table locks are taken. A client doing read-modify-write
+sends the ETag of its GET as If-Match; when the row has changed since,
+the request is rejected with 412 before anything is written.
+"""
+import re
+from typing import Optional
+from fastapi import HTTPException, status
+from sqlalchemy.orm.exc import StaleDataError
+from app.core.etags import etag_matches, row_etag
+
+MODIFIED_DETAIL = "{name} {id} was modified by another request; reload it and retry"
+
+
+def _name(model) -> str:
+    # PurchaseOrder -> "Purchase order"
+    return " ".join(re.findall("[A-Z][a-z]*", model.__name__)).capitalize()
+
+
+def check_if_match(if_match: Optional[str], model, row) -> None:
+    """
+    Reject the request with 412 unless If-Match names the row's current ETag
+
+    The comparison is weak (W/ is ignored) because compressed responses
+    carry the weak form of the same validator.
+    """
+    if if_match is not None and not etag_matches(if_match, row_etag(model, row)):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=MODIFIED_DETAIL.format(name=_name(model), id=row.id)
+        )
+
+
+async def commit_versioned(db, instance, if_match: Optional[str] = None) -> None:
+    """
+    Commit, turning a lost compare-and-swap into 412 (with If-Match) or 409
+
+    `instance` is the row the request is about; the error names it.
+    """
+    # Read before committing: the rollback expires the instance
+    detail = MODIFIED_DETAIL.format(name=_name(type(instance)), id=instance.id)
+    try:
+        await db.commit()
+    except StaleDataError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED if if_match is not None else status.HTTP_409_CONFLICT,
+            detail=detail
+        )
@@ -1,35 +1,507 @@
 """
 Database connection and session management
 """
-from sqlalchemy import create_engine
+import logging
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import AsyncGenerator, AsyncIterator, Dict, Optional, Sequence, Union
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from app.core.config import settings
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+from app.core.config import Settings, settings
+from app.core import metrics
 
-# Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-    echo=settings.ENVIRONMENT == "development"
+logger = logging.getLogger(__name__)
+
+# Async drivers used when DATABASE_ASYNC_URL is not set explicitly
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_url(url: str) -> str:
+    """Derive the async driver URL from a sync DATABASE_URL"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+# Statement kinds used as the "operation" label; anything else is OTHER
+OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+POOL_CHECKOUT_SECONDS = metrics.registry.histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a pooled connection",
+    ["engine"],
+)
+POOL_CHECKOUT_TIMEOUTS = metrics.registry.counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after DATABASE_POOL_TIMEOUT",
+    ["engine"],
+)
+POOL_CHECKED_OUT = metrics.registry.gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    ["engine"],
+)
+POOL_SIZE = metrics.registry.gauge(
+    "db_pool_size",
+    "Connections the pool keeps open (DATABASE_POOL_SIZE)",
+    ["engine"],
 )
+POOL_OVERFLOW = metrics.registry.gauge(
+    "db_pool_overflow",
+    "Connections open beyond the pool size (up to DATABASE_MAX_OVERFLOW)",
+    ["engine"],
+)
+STATEMENT_SECONDS = metrics.registry.histogram(
+    "db_statement_seconds",
+    "Statement execution time by originating endpoint",
+    ["endpoint", "operation"],
+)
+SLOW_STATEMENTS = metrics.registry.counter(
+    "db_slow_statements_total",
+    "Statements slower than SLOW_QUERY_THRESHOLD_MS",
+    ["endpoint"],
+)
+
+
+class TimedCheckout:
+    """Pool mixin recording how long each checkout waited for a connection"""
+
+    engine_label = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.inc(self.engine_label)
+            raise
+        finally:
+            POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - started, self.engine_label)
+
+
+@lru_cache(maxsize=None)
+def timed_pool_class(pool_class, label: str):
+    """`pool_class` with checkout timing, reporting under engine=`label`"""
+    return type(f"Timed{pool_class.__name__}", (TimedCheckout, pool_class), {"engine_label": label})
+
+
+def operation_of(statement: str) -> str:
+    """Leading SQL keyword of a statement, for the operation label"""
+    words = statement.lstrip()[:7].split(None, 1)
+    keyword = words[0].upper() if words else ""
+    return keyword if keyword in OPERATIONS else "OTHER"
+
+
+def instrument_engine(target: Engine, label: str, config: Settings = settings) -> None:
+    """
+    Record pool usage and statement durations of an engine
+
+    Statements are labelled with the endpoint that issued them; those over
+    SLOW_QUERY_THRESHOLD_MS (0 disables) are also logged as warnings.
+    """
+    slow_seconds = config.SLOW_QUERY_THRESHOLD_MS / 1000
+
+    @event.listens_for(target, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        POOL_CHECKED_OUT.inc(label)
+
+    @event.listens_for(target, "checkin")
+    def checkin(dbapi_connection, connection_record):
+        POOL_CHECKED_OUT.dec(label)
+
+    @event.listens_for(target, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context.started_at = time.perf_counter()
+
+    @event.listens_for(target, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started_at = getattr(context, "started_at", None)
+        if started_at is None:
+            return
+
+        elapsed = time.perf_counter() - started_at
+        endpoint = metrics.current_endpoint()
+        STATEMENT_SECONDS.observe(elapsed, endpoint, operation_of(statement))
+
+        if slow_seconds and elapsed >= slow_seconds:
+            SLOW_STATEMENTS.inc(endpoint)
+            logger.warning("Slow query (%.1f ms) from %s: %s", elapsed * 1000, endpoint, statement)
+
+
+@metrics.registry.collector
+def collect_pool_usage() -> None:
+    """Refresh the pool size and overflow gauges of the configured engines"""
+    engines = [("sync", engine), ("replica", replica_engine)]
+    if async_engine is not None:
+        engines.append(("async", async_engine.sync_engine))
+    if async_replica_engine is not None:
+        engines.append(("async_replica", async_replica_engine.sync_engine))
+
+    for label, target in engines:
+        if target is None or not hasattr(target.pool, "overflow"):
+            continue
+        POOL_SIZE.set(label, value=target.pool.size())
+        POOL_OVERFLOW.set(label, value=max(target.pool.overflow(), 0))
+
+
+def engine_options(url: str, config: Settings = settings, label: str = "sync") -> dict:
+    """
+    Engine keyword arguments
+
+    SQLite pools take no sizing options. Each worker process holds up to
+    DATABASE_POOL_SIZE + DATABASE_MAX_OVERFLOW connections per engine, so
+    size them against the server's max_connections divided by the workers.
+    """
+    parsed = make_url(url)
+    options = {
+        "pool_pre_ping": True,
+        "echo": config.DATABASE_ECHO,
+        "poolclass": timed_pool_class(parsed.get_dialect().get_pool_class(parsed), label),
+    }
+    if parsed.get_backend_name() != "sqlite":
+        options.update(
+            pool_size=config.DATABASE_POOL_SIZE,
+            max_overflow=config.DATABASE_MAX_OVERFLOW,
+            pool_timeout=config.DATABASE_POOL_TIMEOUT,
+            pool_recycle=config.DATABASE_POOL_RECYCLE,
+        )
+    return options
+
+
+class ReplicaSession(Session):
+    """Session on the read replica; flushing raises, so writes cannot land there"""
+
+
+@event.listens_for(ReplicaSession, "before_flush")
+def _refuse_replica_writes(session, flush_context, instances):
+    raise RuntimeError("Read replica sessions are read-only; use get_db for writes")
+
+
+# Engines are created by configure_engines(): from the application lifespan,
+# at the start of a script, or on the first session opened without either.
+# The replica engines exist only when DATABASE_REPLICA_URL is set.
+engine: Optional[Engine] = None
+async_engine: Optional[AsyncEngine] = None
+replica_engine: Optional[Engine] = None
+async_replica_engine: Optional[AsyncEngine] = None
+
+# Session factories; bound to the engines by configure_engines()
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+ReplicaSessionLocal = sessionmaker(class_=ReplicaSession, autocommit=False, autoflush=False)
+AsyncReplicaSessionLocal = async_sessionmaker(
+    sync_session_class=ReplicaSession, autoflush=False, expire_on_commit=False
+)
+
+
+def configure_engines(config: Settings = settings) -> None:
+    """
+    Create the engines for `config` and bind the session factories
+
+    The sync engine is always created (scripts and DATABASE_MODE=sync use
+    it); the async engine only when DATABASE_MODE is "async". Replica
+    engines follow the same rule when DATABASE_REPLICA_URL is set. Creating
+    an engine opens no connection.
+    """
+    global engine, async_engine, replica_engine, async_replica_engine, sticky_seconds
+
+    engine = create_engine(config.DATABASE_URL, **engine_options(config.DATABASE_URL, config))
+    instrument_engine(engine, "sync", config)
+    SessionLocal.configure(bind=engine)
+
+    replica_engine = None
+    if config.DATABASE_REPLICA_URL:
+        replica_engine = create_engine(
+            config.DATABASE_REPLICA_URL, **engine_options(config.DATABASE_REPLICA_URL, config, "replica")
+        )
+        instrument_engine(replica_engine, "replica", config)
+        ReplicaSessionLocal.configure(bind=replica_engine)
+
+    async_engine = None
+    async_replica_engine = None
+    if config.DATABASE_MODE == "async":
+        async_url = config.DATABASE_ASYNC_URL or get_async_url(config.DATABASE_URL)
+        async_engine = create_async_engine(async_url, **engine_options(async_url, config, "async"))
+        instrument_engine(async_engine.sync_engine, "async", config)
+        AsyncSessionLocal.configure(bind=async_engine)
+
+        if config.DATABASE_REPLICA_URL:
+            replica_url = config.DATABASE_REPLICA_ASYNC_URL or get_async_url(config.DATABASE_REPLICA_URL)
+            async_replica_engine = create_async_engine(
+                replica_url, **engine_options(replica_url, config, "async_replica")
+            )
+            instrument_engine(async_replica_engine.sync_engine, "async_replica", config)
+            AsyncReplicaSessionLocal.configure(bind=async_replica_engine)
+
+    sticky_seconds = config.DATABASE_REPLICA_STICKY_SECONDS
+
+
+def ensure_engines() -> None:
+    """Configure the engines from the global settings unless already done"""
+    if engine is None:
+        configure_engines()
+
+
+async def warm_pool(connections: int, statements: Sequence = ()) -> None:
+    """
+    Open pooled connections and compile statements before the first request
+
+    `statements` are executed once on one connection (their results are
+    discarded), which puts their compiled SQL in the engine's cache. Then up
+    to `connections` connections are opened together and returned to the
+    pool. Only the engines of the configured DATABASE_MODE are warmed: the
+    primary and, when configured, the replica.
+    """
+    ensure_engines()
+
+    if async_engine is not None:
+        targets = [(AsyncSessionLocal, async_engine)]
+        if async_replica_engine is not None:
+            targets.append((AsyncReplicaSessionLocal, async_replica_engine))
+
+        for factory, target in targets:
+            async with factory() as db:
+                for statement in statements:
+                    await db.execute(statement)
+                await db.rollback()
+
+            opened = [await target.connect() for _ in range(pooled(target.sync_engine, connections))]
+            for connection in opened:
+                await connection.close()
+        return
+
+    def warm() -> None:
+        targets = [(SessionLocal, engine)]
+        if replica_engine is not None:
+            targets.append((ReplicaSessionLocal, replica_engine))
+
+        for factory, target in targets:
+            with factory() as db:
+                for statement in statements:
+                    db.execute(statement)
+                db.rollback()
+
+            opened = [target.connect() for _ in range(pooled(target, connections))]
+            for connection in opened:
+                connection.close()
+
+    await run_in_threadpool(warm)
+
+
+def pooled(target: Engine, connections: int) -> int:
+    """Connections worth opening ahead: ones beyond the pool size are discarded on return"""
+    size = getattr(target.pool, "size", None)
+    return min(connections, size()) if size is not None else 0
+
+
+async def dispose_engines() -> None:
+    """Close every pooled connection and forget the engines"""
+    global engine, async_engine, replica_engine, async_replica_engine
+
+    for target in (async_engine, async_replica_engine):
+        if target is not None:
+            await target.dispose()
+    for target in (engine, replica_engine):
+        if target is not None:
+            target.dispose()
+
+    engine = None
+    async_engine = None
+    replica_engine = None
+    async_replica_engine = None
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Base class for models
 Base = declarative_base()
 
 
+class SyncSessionAdapter:
+    """
+    Awaitable facade over a sync Session (DATABASE_MODE=sync).
+
+    Exposes the subset of the AsyncSession API used by the routers and
+    runs every database round-trip in the threadpool, so blocking drivers
+    never stall the event loop.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances) -> None:
+        self.sync_session.add_all(instances)
+
+    async def execute(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.execute, statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, statement, *args, **kwargs)
+
+    async def scalars(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalars, statement, *args, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def flush(self) -> None:
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def refresh(self, instance, attribute_names=None) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance, attribute_names)
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+
+
+# Session type handed to route handlers in either mode
+DbSession = Union[AsyncSession, SyncSessionAdapter]
+
+
+# User on whose behalf the current request runs (set by get_current_user),
+# so commits can be attributed for read-your-writes
+session_user: ContextVar[Optional[int]] = ContextVar("session_user", default=None)
+
+# Seconds a user's reads stay on the primary after they commit a write
+sticky_seconds = settings.DATABASE_REPLICA_STICKY_SECONDS
+
+# Expired entries are pruned once this many users are tracked
+RECENT_WRITERS_PRUNE_AT = 10000
+
+# user_id -> monotonic time until which the user reads from the primary
+_recent_writers: Dict[int, float] = {}
+
+
+def record_write(user_id: int) -> None:
+    """Keep `user_id` reading from the primary for the sticky window"""
+    now = time.monotonic()
+    _recent_writers[user_id] = now + sticky_seconds
+
+    if len(_recent_writers) > RECENT_WRITERS_PRUNE_AT:
+        for writer, until in list(_recent_writers.items()):
+            if until <= now:
+                del _recent_writers[writer]
+
+
+def reads_from_replica(user_id: Optional[int]) -> bool:
+    """
+    Whether reads for `user_id` may be served by the replica
+
+    False when no replica is configured, and for a user who committed a
+    write within the last DATABASE_REPLICA_STICKY_SECONDS, so they read
+    their own writes despite replication lag. Writes are tracked per
+    worker process.
+    """
+    ensure_engines()
+    if replica_engine is None:
+        return False
+
+    until = _recent_writers.get(user_id)
+    return until is None or until <= time.monotonic()
+
+
+@event.listens_for(Session, "after_flush")
+def _note_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_statement_write(orm_execute_state):
+    # Bulk UPDATE/INSERT/DELETE statements bypass the flush
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _note_commit(session):
+    if session.info.pop("wrote", False):
+        user_id = session_user.get()
+        if user_id is not None:
+            record_write(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_writes(session):
+    session.info.pop("wrote", None)
+
+
+@asynccontextmanager
+async def open_session(replica: bool = False) -> AsyncIterator[DbSession]:
+    """
+    Open a database session for the configured DATABASE_MODE.
+
+    Yields an AsyncSession when DATABASE_MODE is "async", otherwise a
+    threadpool-backed adapter over the sync session. The session is
+    closed on exit in both modes. With `replica`, the session reads from
+    DATABASE_REPLICA_URL when one is configured (and refuses to flush).
+    """
+    ensure_engines()
+    replica = replica and replica_engine is not None
+
+    if async_engine is not None:
+        factory = AsyncReplicaSessionLocal if replica else AsyncSessionLocal
+        async with factory() as db:
+            yield db
+        return
+
+    factory = ReplicaSessionLocal if replica else SessionLocal
+    db = SyncSessionAdapter(factory(expire_on_commit=False))
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
 # Dependency to get database session
-def get_db():
+async def get_db() -> AsyncGenerator[DbSession, None]:
     """
     Dependency function to get database session.
     Yields a session and ensures it's closed after use.
     """
-    db = SessionLocal()
-    try:
+    async with open_session() as db:
         yield db
-    finally:
-        db.close()
+
+
+async def stream_partitions(db: DbSession, statement, size: int) -> AsyncIterator[Sequence]:
+    """
+    Iterate a query's rows in partitions using a server-side cursor
+
+    Only one partition is held in memory at a time, in either mode.
+    """
+    statement = statement.execution_options(yield_per=size)
+
+    if isinstance(db, AsyncSession):
+        result = await db.stream(statement)
+        async for partition in result.partitions():
+            yield partition
+        return
+
+    result = await db.execute(statement)
+    partitions = result.partitions()
+    while True:
+        partition = await run_in_threadpool(next, partitions, None)
+        if partition is None:
+            break
+        yield partition
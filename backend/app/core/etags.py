@@ -0,0 +1,55 @@
+"""
+Conditional GET helpers - Strong ETags and 304 Not Modified responses
+
+Detail ETags are derived from the row's id and version, list ETags from
+the request parameters plus count(), max(updated_at) and sum(version) of
+the filtered rows. A matching If-None-Match is answered with an empty 304
+before the response is serialized (and, for lists, before the page is
+loaded). Responses embedding related records (expand=) carry no ETag:
+those records change independently of the rows they are attached to.
+"""
+import hashlib
+from typing import List, Optional
+from fastapi import Response
+from sqlalchemy import func, select
+
+# Clients may keep responses but must revalidate them on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag over the repr of `parts`"""
+    return '"' + hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison (weak, as RFC 9110 specifies for GET)"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response for a matching If-None-Match"""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def version_query(model):
+    """SELECT count(), max(updated_at), sum(version) FROM model; callers add the list filters"""
+    return select(func.count(model.id), func.max(model.updated_at), func.sum(model.version))
+
+
+def row_etag(model, row, fields: Optional[List[str]] = None) -> str:
+    """
+    ETag of one row (an instance of `model` or a row selecting its id and version)
+
+    `fields` is the fields= selection of a projected response; If-Match
+    compares against the ETag of the full representation.
+    """
+    return make_etag(model.__tablename__, row.id, row.version, fields)
@@ -0,0 +1,119 @@
+"""
+Streaming export - CSV/XLSX responses fed from server-side cursors
+"""
+import csv
+import io
+import tempfile
+from datetime import date, datetime, timezone
+from enum import Enum
+from typing import AsyncIterator, List, Sequence
+from fastapi.responses import StreamingResponse
+from openpyxl import Workbook
+from starlette.concurrency import run_in_threadpool
+from app.core.database import open_session, stream_partitions
+
+# Rows fetched per server-side cursor round-trip
+EXPORT_BATCH_SIZE = 1000
+
+# Bytes per chunk when streaming a finished XLSX file
+XLSX_CHUNK_SIZE = 64 * 1024
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def _csv_value(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _xlsx_value(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        # Excel has no time zones; export UTC wall time
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+async def _csv_stream(statement, header: List[str], replica: bool) -> AsyncIterator[bytes]:
+    """Encode rows as CSV one cursor partition at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    # BOM so Excel opens UTF-8 (Japanese/Korean names) correctly
+    yield ("\ufeff" + buffer.getvalue()).encode("utf-8")
+
+    # The request's session is closed before the body streams, so the export opens its own
+    async with open_session(replica=replica) as db:
+        async for partition in stream_partitions(db, statement, EXPORT_BATCH_SIZE):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows([_csv_value(value) for value in row] for row in partition)
+            yield buffer.getvalue().encode("utf-8")
+
+
+def _append_rows(sheet, rows: Sequence) -> None:
+    for row in rows:
+        sheet.append([_xlsx_value(value) for value in row])
+
+
+async def _xlsx_stream(statement, header: List[str], title: str, replica: bool) -> AsyncIterator[bytes]:
+    """
+    Write rows to a write-only workbook, then stream the finished file
+
+    Write-only worksheets spool rows to disk as they are appended, so memory
+    stays flat; the ZIP container can only be streamed once it is complete.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title)
+    sheet.append(header)
+
+    async with open_session(replica=replica) as db:
+        async for partition in stream_partitions(db, statement, EXPORT_BATCH_SIZE):
+            await run_in_threadpool(_append_rows, sheet, partition)
+
+    with tempfile.TemporaryFile() as output:
+        await run_in_threadpool(workbook.save, output)
+        output.seek(0)
+        while True:
+            chunk = await run_in_threadpool(output.read, XLSX_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+def export_response(
+    statement,
+    header: List[str],
+    name: str,
+    file_format: str,
+    replica: bool = False
+) -> StreamingResponse:
+    """
+    StreamingResponse exporting a column SELECT as CSV or XLSX
+
+    Args:
+        statement: SELECT of plain columns, in header order
+        header: Column names for the first row
+        name: Download file name (without extension) and XLSX sheet title
+        file_format: "csv" or "xlsx"
+        replica: Read from the read replica (see reads_from_replica)
+    """
+    if file_format == "xlsx":
+        body = _xlsx_stream(statement, header, name, replica)
+    else:
+        body = _csv_stream(statement, header, replica)
+
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[file_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{file_format}"'},
+    )
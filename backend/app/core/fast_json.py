@@ -0,0 +1,67 @@
+"""
+Fast JSON responses - Column rows encoded directly with orjson
+
+The default response path loads ORM objects, validates each through the
+response schema (from_attributes) and encodes the dumped dicts with the
+standard json module. With FAST_JSON_RESPONSES enabled, list and detail
+endpoints instead select exactly the schema's columns and encode the rows
+with orjson. The column types already match the schema, so the per-row
+validation is skipped; the bytes are identical to the default path
+(Decimal as its string, UTC datetimes with a Z suffix, enums as values).
+
+orjson is optional: without it the setting has no effect.
+"""
+import logging
+from decimal import Decimal
+from typing import Iterable, List, Optional, Sequence, Type
+from fastapi import Response
+from pydantic import BaseModel
+from app.core.config import Settings, settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Set by configure_fast_json(); the global settings until an app configures it
+_enabled = settings.FAST_JSON_RESPONSES and orjson is not None
+
+
+def configure_fast_json(config: Settings = settings) -> None:
+    """Enable the orjson path when `config` asks for it and orjson is installed"""
+    global _enabled
+
+    if config.FAST_JSON_RESPONSES and orjson is None:
+        logger.warning("FAST_JSON_RESPONSES is enabled but orjson is not installed; using the default encoder")
+    _enabled = config.FAST_JSON_RESPONSES and orjson is not None
+
+
+def fast_json_enabled() -> bool:
+    return _enabled
+
+
+def schema_columns(model, schema: Type[BaseModel]) -> list:
+    """Model columns of every schema field, in the schema's field order"""
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def encode_rows(rows: Iterable[Sequence], names: List[str]) -> bytes:
+    """JSON array of objects, one per row of values in `names` order"""
+    return orjson.dumps([dict(zip(names, row)) for row in rows], default=_default, option=orjson.OPT_UTC_Z)
+
+
+def encode_row(row: Sequence, names: List[str]) -> bytes:
+    return orjson.dumps(dict(zip(names, row)), default=_default, option=orjson.OPT_UTC_Z)
+
+
+def fast_json_response(content: bytes, headers: Optional[dict] = None) -> Response:
+    """Response for JSON already encoded by encode_rows/encode_row"""
+    return Response(content=content, media_type="application/json", headers=headers)
@@ -0,0 +1,305 @@
+"""
+Spreadsheet order import - Streaming CSV/XLSX parsing and batched bulk loads
+"""
+import csv
+import io
+import itertools
+import os
+import shutil
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Iterator, List, Optional, Sequence, Tuple
+from fastapi import UploadFile
+from openpyxl import load_workbook
+from pydantic import ValidationError
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.database import DbSession, open_session
+from app.core import changes, rollups
+from app.core.sequences import document_numbers
+from app.models import ImportJob, ImportJobStatus, OrderStatus, Project, PurchaseOrder, Vendor
+from app.models.purchase_order import VAT_RATE, calculate_order_amounts_batch
+from app.schemas.purchase_order import PurchaseOrderCreate
+
+IMPORT_FORMATS = ("csv", "xlsx")
+
+# (sheet row number, {header: value}) for one non-blank data row
+SheetRow = Tuple[int, dict]
+
+
+def import_format(filename: Optional[str]) -> Optional[str]:
+    """Import format for an uploaded file name, or None if unsupported"""
+    extension = os.path.splitext(filename or "")[1].lower().lstrip(".")
+    return extension if extension in IMPORT_FORMATS else None
+
+
+async def store_upload(upload: UploadFile, file_format: str) -> str:
+    """Copy an upload into IMPORT_STORAGE_DIR so the job can (re)read it"""
+    os.makedirs(settings.IMPORT_STORAGE_DIR, exist_ok=True)
+    path = os.path.join(settings.IMPORT_STORAGE_DIR, f"{uuid.uuid4().hex}.{file_format}")
+
+    def copy() -> None:
+        with open(path, "wb") as target:
+            shutil.copyfileobj(upload.file, target, 1024 * 1024)
+
+    await run_in_threadpool(copy)
+    return path
+
+
+def _csv_rows(path: str) -> Iterator[Sequence]:
+    with open(path, newline="", encoding="utf-8-sig") as source:
+        yield from csv.reader(source)
+
+
+def _xlsx_rows(path: str) -> Iterator[Sequence]:
+    # Read-only workbooks parse the sheet XML lazily, one row at a time
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def read_sheet(path: str, file_format: str) -> Iterator[SheetRow]:
+    """
+    Stream the data rows of a CSV/XLSX sheet
+
+    Row 1 is the header and names PurchaseOrderCreate fields; other columns
+    are ignored. Blank cells are dropped so schema defaults apply, and
+    blank rows are skipped.
+    """
+    rows = _xlsx_rows(path) if file_format == "xlsx" else _csv_rows(path)
+    header = [str(name).strip() if name is not None else "" for name in next(rows, [])]
+
+    for number, values in enumerate(rows, start=2):
+        record = {}
+        for name, value in zip(header, values):
+            if isinstance(value, str):
+                value = value.strip()
+            if name and value not in (None, ""):
+                record[name] = value
+        if record:
+            yield number, record
+
+
+def _next_batch(rows: Iterator[SheetRow], size: int) -> List[SheetRow]:
+    return list(itertools.islice(rows, size))
+
+
+def _error_detail(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()
+    )
+
+
+def validate_rows(batch: List[SheetRow]) -> Tuple[List[Tuple[int, PurchaseOrderCreate]], List[dict]]:
+    """Validate sheet rows against PurchaseOrderCreate; returns (valid items, row errors)"""
+    items = []
+    errors = []
+    for number, record in batch:
+        try:
+            items.append((number, PurchaseOrderCreate.model_validate(record)))
+        except ValidationError as e:
+            errors.append({"row": number, "detail": _error_detail(e)})
+    return items, errors
+
+
+async def check_references(
+    db: DbSession, items: List[Tuple[int, PurchaseOrderCreate]]
+) -> Tuple[List[Tuple[int, PurchaseOrderCreate]], List[dict]]:
+    """Drop items whose project or vendor does not exist (one query each per batch)"""
+    known_projects = set((await db.scalars(
+        select(Project.id).where(Project.id.in_({item.project_id for _, item in items}))
+    )).all())
+    known_vendors = set((await db.scalars(
+        select(Vendor.id).where(Vendor.id.in_({item.vendor_id for _, item in items}))
+    )).all())
+
+    valid = []
+    errors = []
+    for number, item in items:
+        if item.project_id not in known_projects:
+            errors.append({"row": number, "detail": f"Project {item.project_id} not found"})
+        elif item.vendor_id not in known_vendors:
+            errors.append({"row": number, "detail": f"Vendor {item.vendor_id} not found"})
+        else:
+            valid.append((number, item))
+    return valid, errors
+
+
+def build_order_rows(
+    items: Sequence[PurchaseOrderCreate],
+    order_nos: Sequence[str],
+    ordered_by: int,
+    ordered_at: datetime,
+) -> List[dict]:
+    """Column values for new draft orders, with amounts computed in one pass"""
+    amounts = calculate_order_amounts_batch(
+        [item.quantity for item in items],
+        [item.unit_price for item in items],
+        [item.difficulty_rate for item in items],
+        [item.urgency_rate for item in items],
+        [VAT_RATE] * len(items),
+        [item.withholding_tax_rate for item in items],
+    )
+
+    rows = []
+    for i, (order_no, item) in enumerate(zip(order_nos, items)):
+        row = item.model_dump()
+        row.update(
+            order_no=order_no,
+            vat_rate=VAT_RATE,
+            ordered_by=ordered_by,
+            ordered_at=ordered_at,
+            status=OrderStatus.draft,
+        )
+        row.update({field: values[i] for field, values in amounts.items()})
+        rows.append(row)
+    return rows
+
+
+def _copy_value(value):
+    # SQLAlchemy stores Enum members by name
+    return value.name if isinstance(value, Enum) else value
+
+
+def _copy_text(value) -> str:
+    """One field in COPY text format"""
+    if value is None:
+        return "\\N"
+    text = str(_copy_value(value))
+    return text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def _load_rows_sync(session: Session, rows: List[dict]) -> None:
+    """COPY through psycopg2, or a plain executemany INSERT on other drivers"""
+    connection = session.connection()
+    table = PurchaseOrder.__table__
+
+    if connection.dialect.name != "postgresql" or connection.dialect.driver != "psycopg2":
+        connection.execute(table.insert(), rows)
+        return
+
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_text(row[column]) for column in columns))
+        buffer.write("\n")
+    buffer.seek(0)
+
+    with connection.connection.driver_connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN", buffer)
+
+
+async def load_rows(db: DbSession, rows: List[dict]) -> None:
+    """
+    Insert order rows in the session's transaction as fast as the driver allows
+
+    PostgreSQL gets COPY (asyncpg's binary copy_records_to_table or
+    psycopg2's copy_expert); other databases fall back to executemany.
+    COPY bypasses ORM events, so callers update rollups themselves.
+    """
+    if isinstance(db, AsyncSession):
+        connection = await db.connection()
+        if connection.dialect.driver == "asyncpg":
+            columns = list(rows[0])
+            raw = await connection.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                PurchaseOrder.__tablename__,
+                columns=columns,
+                records=[tuple(_copy_value(row[column]) for column in columns) for row in rows],
+            )
+            return
+
+    await db.run_sync(_load_rows_sync, rows)
+
+
+async def _claim(db: DbSession, job_id: int) -> Optional[ImportJob]:
+    """Move a pending job to running; None if another worker got it first"""
+    result = await db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id, ImportJob.status == ImportJobStatus.pending)
+        .values(status=ImportJobStatus.running, started_at=func.now(), last_error=None)
+    )
+    await db.commit()
+    if result.rowcount == 0:
+        return None
+    return await db.get(ImportJob, job_id, populate_existing=True)
+
+
+async def _import_batches(db: DbSession, job: ImportJob) -> None:
+    rows = read_sheet(job.file_path, job.file_format)
+    # Resume after the last committed batch
+    rows = itertools.dropwhile(lambda row: row[0] <= job.last_row, rows)
+
+    while True:
+        batch = await run_in_threadpool(_next_batch, rows, settings.IMPORT_BATCH_SIZE)
+        if not batch:
+            break
+
+        items, errors = validate_rows(batch)
+        if items:
+            items, reference_errors = await check_references(db, items)
+            errors.extend(reference_errors)
+
+        if items:
+            order_nos = await document_numbers.allocate(
+                db, "PO", count=len(items), seed_column=PurchaseOrder.order_no
+            )
+            # Transaction timestamp; set explicitly so rollups know each row's month
+            now = await db.scalar(select(func.now()))
+            order_rows = build_order_rows([item for _, item in items], order_nos, job.created_by, now)
+            for row in order_rows:
+                row.update(created_at=now, updated_at=now)
+
+            await load_rows(db, order_rows)
+            await db.run_sync(rollups.record_rows, PurchaseOrder, order_rows)
+
+        # Progress commits with the batch, so resuming never duplicates rows
+        errors.sort(key=lambda error: error["row"])
+        room = settings.IMPORT_MAX_ERRORS - len(job.errors)
+        if errors and room > 0:
+            job.errors = job.errors + errors[:room]
+        job.last_row = batch[-1][0]
+        job.processed_rows += len(batch)
+        job.imported_count += len(items)
+        job.error_count += len(errors)
+        await db.commit()
+
+        if items:
+            changes.orders_imported(job.id, order_rows, job.created_by)
+
+
+async def run_import(job_id: int) -> None:
+    """
+    Run (or resume) an import job to completion
+
+    Meant for a background task: it opens its own session, and failures
+    are recorded on the job instead of raised.
+    """
+    async with open_session() as db:
+        job = await _claim(db, job_id)
+        if job is None:
+            return
+
+        try:
+            await _import_batches(db, job)
+        except Exception as e:
+            await db.rollback()
+            job = await db.get(ImportJob, job_id, populate_existing=True)
+            job.status = ImportJobStatus.failed
+            job.last_error = str(e)
+            await db.commit()
+            return
+
+        job.status = ImportJobStatus.completed
+        job.finished_at = await db.scalar(select(func.now()))
+        await db.commit()
+
+    # The stored copy is only needed for resuming
+    if os.path.exists(job.file_path):
+        await run_in_threadpool(os.remove, job.file_path)
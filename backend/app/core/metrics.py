@@ -0,0 +1,307 @@
+"""
+Metrics - In-process counters, gauges and histograms in Prometheus text format
+
+Values are kept per worker process and served by GET /metrics; scrape each
+worker (or aggregate in Prometheus) when running several.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Response size buckets in bytes
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# ASGI scope of the request being served; FastAPI adds the matched route to
+# it during routing, so the endpoint is resolved when a label is needed
+request_scope: ContextVar[Optional[dict]] = ContextVar("request_scope", default=None)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """Labelled metric family; label values are passed positionally"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _labels(self, values: Tuple[str, ...], extra: Sequence[Tuple[str, str]] = ()) -> str:
+        pairs = list(zip(self.labelnames, values)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self.samples(),
+        ]
+
+
+class Counter(Metric):
+    """Monotonically increasing value"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def values(self) -> Dict[Tuple[str, ...], float]:
+        """Current value of every label combination"""
+        with self._lock:
+            return dict(self._values)
+
+    def samples(self) -> List[str]:
+        values = self.values().items()
+        return [f"{self.name}{self._labels(labels)} {_format_value(value)}" for labels, value in values]
+
+
+class Gauge(Counter):
+    """Value that goes up and down"""
+
+    kind = "gauge"
+
+    def set(self, *labels: str, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed buckets"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series is not None else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            series = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+
+        lines = []
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = self._labels(labels, [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{self._labels(labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """
+    Metric families served together
+
+    Collectors run before every render to refresh values that are read
+    rather than recorded (e.g. current pool usage).
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def collector(self, fn: Callable[[], None]) -> Callable[[], None]:
+        """Register `fn` to run before each render (usable as a decorator)"""
+        self._collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format"""
+        for collect in self._collectors:
+            collect()
+
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_seconds",
+    "Time from receiving a request to sending the last byte of its response",
+    ["method", "route"],
+)
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total",
+    "Completed requests by response status",
+    ["method", "route", "status"],
+)
+HTTP_RESPONSE_BYTES = registry.histogram(
+    "http_response_bytes",
+    "Response body size",
+    ["method", "route"],
+    SIZE_BUCKETS,
+)
+HTTP_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight",
+    "Requests currently being served",
+)
+
+
+def route_of(scope: dict) -> str:
+    """Templated path of the matched route (e.g. /api/v1/orders/{order_id})"""
+    route = scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+
+def current_endpoint() -> str:
+    """
+    Templated path of the route serving the current request
+
+    "unmatched" when no route matched, "none" outside a request (scripts,
+    startup warmup).
+    """
+    scope = request_scope.get()
+    return route_of(scope) if scope is not None else "none"
+
+
+def request_stats() -> dict:
+    """Request totals by status class, for /health"""
+    by_class: Dict[str, int] = {}
+    for labels, count in HTTP_REQUESTS.values().items():
+        status_class = f"{labels[2][0]}xx"
+        by_class[status_class] = by_class.get(status_class, 0) + int(count)
+    return {
+        "in_flight": int(HTTP_IN_FLIGHT.value()),
+        "completed": sum(by_class.values()),
+        "by_status": dict(sorted(by_class.items())),
+    }
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request by route
+
+    Records latency, status and response size under the templated route
+    path, which is known once routing has run, plus the number of requests
+    in flight. Also sets `request_scope` for the lifetime of each request
+    (including its streaming body and background tasks) so database
+    metrics can name the endpoint. WebSocket connections only get the scope.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "websocket":
+            token = request_scope.set(scope)
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                request_scope.reset(token)
+            return
+
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        token = request_scope.set(scope)
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_FLIGHT.dec()
+            request_scope.reset(token)
+
+            method = scope["method"]
+            route = route_of(scope)
+            HTTP_REQUEST_SECONDS.observe(elapsed, method, route)
+            HTTP_REQUESTS.inc(method, route, str(status))
+            HTTP_RESPONSE_BYTES.observe(size, method, route)
@@ -0,0 +1,55 @@
+"""
+Keyset (cursor) pagination helpers for list endpoints
+"""
+import base64
+from datetime import datetime
+from typing import Sequence, Tuple
+from fastapi import HTTPException, Response, status
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.sql import Select
+
+# Response header carrying the cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Encode a (created_at, id) position as an opaque cursor"""
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def apply_cursor(query: Select, model, cursor: str) -> Select:
+    """
+    Restrict a query ordered by (created_at DESC, id DESC) to rows after the cursor
+    
+    The row-value comparison is answered by the (..., created_at, id) composite
+    indexes, so every page costs the same regardless of depth.
+    """
+    created_at, row_id = decode_cursor(cursor)
+    
+    # Compare against the stored timestamp of the cursor row (a primary key
+    # lookup) so the bound value has the same representation as the column;
+    # the decoded timestamp is only used if that row has since been deleted.
+    anchor = select(model.created_at).where(model.id == row_id).scalar_subquery()
+    position = tuple_(func.coalesce(anchor, created_at), row_id)
+    return query.where(tuple_(model.created_at, model.id) < position)
+
+
+def set_next_cursor(response: Response, rows: Sequence, limit: int) -> None:
+    """Expose the cursor for the next page when the current page is full"""
+    if len(rows) == limit:
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
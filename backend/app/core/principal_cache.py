@@ -0,0 +1,166 @@
+"""
+Authenticated principal cache - TTL + LRU cache of users resolved from JWTs
+"""
+import time
+from collections import OrderedDict
+from typing import Optional
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.core.config import settings
+from app.models.user import User
+
+# User columns that affect authorization; changing any of them evicts the cached principal
+AUTHZ_ATTRIBUTES = ("status", "role_level", "org_id")
+
+# Session.info key of the user ids to evict when the session commits (None: every user)
+PENDING_EVICTIONS = "principal_cache_evictions"
+
+
+class PrincipalCache:
+    """
+    In-process cache of authenticated users keyed by the token's user_id
+
+    Entries expire after ttl_seconds and the least recently used entry is
+    dropped once max_size is reached. Cached users are detached copies
+    (see detached_copy) and must be treated as read-only.
+
+    Every eviction bumps `generation`. A caller loading a user reads the
+    generation first and passes it to set(), which drops the user when an
+    eviction happened meanwhile: the load may have seen the row as it was
+    before the change that caused the eviction.
+    """
+
+    def __init__(self, ttl_seconds: int, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def configure(self, ttl_seconds: int, max_size: int) -> None:
+        """Apply new limits and evict every user (they may come from another database)"""
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.clear()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_size > 0
+
+    def get(self, user_id: int) -> Optional[User]:
+        """Return the cached user if present and fresh"""
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, user: User, generation: Optional[int] = None) -> None:
+        """
+        Cache a user; pass a detached_copy, never an instance bound to a session
+
+        `generation` is the value of self.generation read before the user
+        was loaded; the user is not cached if an eviction happened since.
+        """
+        if not self.enabled or (generation is not None and generation != self.generation):
+            return
+
+        self._entries[user.id] = (time.monotonic() + self.ttl_seconds, user)
+        self._entries.move_to_end(user.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        """Evict a single user"""
+        self.generation += 1
+        if self._entries.pop(user_id, None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """Evict every user"""
+        self.generation += 1
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+def detached_copy(user: User) -> User:
+    """
+    Detached User holding the column values of a loaded user
+
+    The copy belongs to no session, so a rollback in the request that
+    loaded `user` cannot expire it for the requests served from the cache.
+    """
+    copy = User(**{attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs})
+    make_transient_to_detached(copy)
+    return copy
+
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_TTL_SECONDS, settings.PRINCIPAL_CACHE_MAX_SIZE)
+
+
+def _schedule_eviction(session: Session, user_id: Optional[int]) -> None:
+    session.info.setdefault(PENDING_EVICTIONS, set()).add(user_id)
+
+
+@event.listens_for(User, "after_update")
+def _invalidate_on_authz_change(mapper, connection, target):
+    """Evict a user whose status, role_level or org_id was changed, once committed"""
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in AUTHZ_ATTRIBUTES):
+        _schedule_eviction(state.session, target.id)
+
+
+@event.listens_for(User, "after_delete")
+def _invalidate_on_delete(mapper, connection, target):
+    """Evict a deleted user, once committed"""
+    _schedule_eviction(inspect(target).session, target.id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_on_bulk_change(orm_execute_state):
+    """
+    ORM UPDATE/DELETE statements on users skip the mapper events above, and
+    the affected ids are unknown: evict every user once committed
+
+    Core statements on the users table and raw SQL bypass the ORM entirely;
+    code issuing them must call principal_cache.clear() after committing.
+    """
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and orm_execute_state.bind_mapper is inspect(User):
+        _schedule_eviction(orm_execute_state.session, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_committed(session):
+    """
+    Apply the evictions recorded during the session's flushes
+
+    Evicting at flush time would let a concurrent request miss the cache
+    before the commit, reload the old committed row and cache it again.
+    Evictions of a session that rolls back are dropped with it (or applied
+    by a later commit, which costs at most a cache miss).
+    """
+    evictions = session.info.pop(PENDING_EVICTIONS, None)
+    if not evictions:
+        return
+    if None in evictions:
+        principal_cache.clear()
+        return
+    for user_id in evictions:
+        principal_cache.invalidate(user_id)
@@ -0,0 +1,244 @@
+"""
+Production progress - Incremental cut counters on episodes and projects
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import case, event, func, literal_column, or_, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from app.core.rollups import keep_previous_values, previous_values
+from app.models.project import Project, Episode, Cut, CutStatus
+
+# Numeric literal, so progress is computed in exact decimal on PostgreSQL
+PERCENT = literal_column("100.0")
+
+# Cut attributes that move the counters
+ATTRIBUTES = ("episode_id", "status")
+
+
+def _new_deltas() -> Dict[int, List[int]]:
+    # id -> [total_cuts delta, completed_cuts delta]
+    return defaultdict(lambda: [0, 0])
+
+
+def _accumulate(deltas: Dict[int, List[int]], values: dict, sign: int = 1) -> None:
+    """Add (or with sign -1, subtract) one cut to its episode's deltas"""
+    if values.get("episode_id") is None:
+        return
+    counters = deltas[values["episode_id"]]
+    counters[0] += sign
+    if values.get("status") == CutStatus.completed:
+        counters[1] += sign
+
+
+def progress_of(completed, total):
+    """SQL expression for completed / total as a percentage (0 without cuts)"""
+    return case((total > 0, func.round(completed * PERCENT / total, 2)), else_=0)
+
+
+def _counter_values(model, total_delta: int, completed_delta: int) -> dict:
+    # SET expressions see the row as it was before the UPDATE
+    total = func.coalesce(model.total_cuts, 0) + total_delta
+    completed = func.coalesce(model.completed_cuts, 0) + completed_delta
+    return {"total_cuts": total, "completed_cuts": completed, "progress": progress_of(completed, total)}
+
+
+def apply_deltas(
+    connection: Connection,
+    deltas: Dict[int, List[int]],
+    episode_projects: Optional[Dict[int, int]] = None,
+) -> None:
+    """
+    Add per-episode counter deltas to episodes and their projects
+
+    One UPDATE per touched episode and project; no cuts are counted.
+    Rows are updated in id order so concurrent transactions take row
+    locks in the same sequence. episode_projects supplies the project of
+    episodes deleted in the same flush.
+    """
+    project_deltas = _new_deltas()
+
+    for episode_id in sorted(deltas):
+        total, completed = deltas[episode_id]
+        if not total and not completed:
+            continue
+
+        project_id = connection.execute(
+            update(Episode)
+            .where(Episode.id == episode_id)
+            .values(_counter_values(Episode, total, completed))
+            .returning(Episode.project_id)
+        ).scalar()
+        if project_id is None and episode_projects:
+            project_id = episode_projects.get(episode_id)
+        if project_id is not None:
+            project_deltas[project_id][0] += total
+            project_deltas[project_id][1] += completed
+
+    for project_id in sorted(project_deltas):
+        total, completed = project_deltas[project_id]
+        if total or completed:
+            connection.execute(
+                update(Project).where(Project.id == project_id).values(_counter_values(Project, total, completed))
+            )
+
+
+def _maintain_progress(session: Session, flush_context) -> None:
+    """
+    Turn every flushed cut insert, status change, move or delete into
+    episode and project counter deltas
+
+    Runs inside the flush, so counters commit or roll back together with
+    the cuts. Moving an episode to another project is not tracked; run
+    the repair (recompute_progress) after doing that.
+    """
+    deltas = _new_deltas()
+    episode_projects = {}
+
+    for instance in session.new:
+        if isinstance(instance, Cut):
+            _accumulate(deltas, {name: getattr(instance, name) for name in ATTRIBUTES})
+
+    for instance in session.dirty:
+        if isinstance(instance, Cut) and session.is_modified(instance):
+            _accumulate(deltas, previous_values(instance, ATTRIBUTES), -1)
+            _accumulate(deltas, {name: getattr(instance, name) for name in ATTRIBUTES})
+
+    for instance in session.deleted:
+        if isinstance(instance, Cut):
+            _accumulate(deltas, previous_values(instance, ATTRIBUTES), -1)
+        elif isinstance(instance, Episode):
+            episode_projects[instance.id] = previous_values(instance, ("project_id",))["project_id"]
+
+    if deltas:
+        apply_deltas(session.connection(), deltas, episode_projects)
+
+
+def register_listeners() -> None:
+    """
+    Maintain the cut counters on every Session flush from now on
+
+    Called by create_app and init_db; scripts writing cuts through their
+    own sessions call it too. Safe to call more than once.
+    """
+    keep_previous_values(Cut, ATTRIBUTES)
+    if not event.contains(Session, "after_flush", _maintain_progress):
+        event.listen(Session, "after_flush", _maintain_progress)
+
+
+def record_status_changes(session: Session, changes: Iterable[Tuple[int, CutStatus, CutStatus]]) -> None:
+    """
+    Apply counter deltas for cut status changes made outside the unit of work
+
+    Bulk UPDATE statements bypass flush events, so callers changing cut
+    status that way report (episode_id, old_status, new_status) here.
+    """
+    deltas = _new_deltas()
+    for episode_id, old_status, new_status in changes:
+        _accumulate(deltas, {"episode_id": episode_id, "status": old_status}, -1)
+        _accumulate(deltas, {"episode_id": episode_id, "status": new_status})
+
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+
+
+def _cut_counts():
+    """Per-episode cut counts, counted from the cuts table"""
+    return (
+        select(
+            Cut.episode_id,
+            func.count(Cut.id).label("total_cuts"),
+            func.sum(case((Cut.status == CutStatus.completed, 1), else_=0)).label("completed_cuts"),
+        )
+        .group_by(Cut.episode_id)
+        .subquery()
+    )
+
+
+def recompute_progress(session: Session) -> Tuple[int, int]:
+    """
+    Recount every episode and project counter from the cuts table (repair)
+
+    Returns the number of (episodes, projects) updated. The caller commits.
+    """
+    connection = session.connection()
+
+    total = select(func.count(Cut.id)).where(Cut.episode_id == Episode.id).scalar_subquery()
+    completed = (
+        select(func.count(Cut.id))
+        .where(Cut.episode_id == Episode.id, Cut.status == CutStatus.completed)
+        .scalar_subquery()
+    )
+    episodes = connection.execute(update(Episode).values(total_cuts=total, completed_cuts=completed)).rowcount
+    connection.execute(update(Episode).values(progress=progress_of(Episode.completed_cuts, Episode.total_cuts)))
+
+    total = select(func.coalesce(func.sum(Episode.total_cuts), 0)).where(Episode.project_id == Project.id).scalar_subquery()
+    completed = (
+        select(func.coalesce(func.sum(Episode.completed_cuts), 0))
+        .where(Episode.project_id == Project.id)
+        .scalar_subquery()
+    )
+    projects = connection.execute(update(Project).values(total_cuts=total, completed_cuts=completed)).rowcount
+    connection.execute(update(Project).values(progress=progress_of(Project.completed_cuts, Project.total_cuts)))
+
+    return episodes, projects
+
+
+def find_drift(session: Session) -> List[dict]:
+    """
+    Episodes and projects whose stored counters differ from a recount
+
+    Read-only; suitable for a scheduled consistency check.
+    """
+    counts = _cut_counts()
+    actual_total = func.coalesce(counts.c.total_cuts, 0)
+    actual_completed = func.coalesce(counts.c.completed_cuts, 0)
+
+    drift = []
+    episode_rows = session.execute(
+        select(Episode.id, Episode.total_cuts, Episode.completed_cuts, actual_total, actual_completed)
+        .outerjoin(counts, counts.c.episode_id == Episode.id)
+        .where(or_(
+            func.coalesce(Episode.total_cuts, 0) != actual_total,
+            func.coalesce(Episode.completed_cuts, 0) != actual_completed,
+        ))
+        .order_by(Episode.id)
+    )
+    for episode_id, total, completed, counted_total, counted_completed in episode_rows:
+        drift.append({
+            "scope": "episode",
+            "id": episode_id,
+            "stored": (total, completed),
+            "counted": (counted_total, counted_completed),
+        })
+
+    project_counts = (
+        select(
+            Episode.project_id,
+            func.sum(actual_total).label("total_cuts"),
+            func.sum(actual_completed).label("completed_cuts"),
+        )
+        .outerjoin(counts, counts.c.episode_id == Episode.id)
+        .group_by(Episode.project_id)
+        .subquery()
+    )
+    project_total = func.coalesce(project_counts.c.total_cuts, 0)
+    project_completed = func.coalesce(project_counts.c.completed_cuts, 0)
+    project_rows = session.execute(
+        select(Project.id, Project.total_cuts, Project.completed_cuts, project_total, project_completed)
+        .outerjoin(project_counts, project_counts.c.project_id == Project.id)
+        .where(or_(
+            func.coalesce(Project.total_cuts, 0) != project_total,
+            func.coalesce(Project.completed_cuts, 0) != project_completed,
+        ))
+        .order_by(Project.id)
+    )
+    for project_id, total, completed, counted_total, counted_completed in project_rows:
+        drift.append({
+            "scope": "project",
+            "id": project_id,
+            "stored": (total, completed),
+            "counted": (counted_total, counted_completed),
+        })
+
+    return drift
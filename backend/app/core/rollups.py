@@ -0,0 +1,250 @@
+"""
+Finance rollups - Incremental maintenance of pre-aggregated order/settlement totals
+"""
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy import delete, event, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from app.models.purchase_order import PurchaseOrder
+from app.models.settlement import Settlement
+from app.models.rollup import FinanceRollup
+
+# Dialect inserts supporting ON CONFLICT DO UPDATE
+UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+# Rollup measures, in the order used by contribution tuples
+MEASURES = ("document_count", "net_amount", "final_amount", "vat_amount", "withholding_tax")
+
+# (source, project_id, vendor_id, period, status)
+RollupKey = Tuple[str, int, int, date, str]
+
+
+def month_of(moment: datetime) -> date:
+    """First day of the month containing moment"""
+    return date(moment.year, moment.month, 1)
+
+
+def _status_value(status) -> str:
+    return status.value if hasattr(status, "value") else str(status)
+
+
+def contribution(source: str, values: dict) -> Optional[Tuple[RollupKey, tuple]]:
+    """Rollup key and measures contributed by one order or settlement"""
+    if values.get("created_at") is None:
+        return None
+
+    key = (
+        source,
+        values["project_id"],
+        values["vendor_id"],
+        month_of(values["created_at"]),
+        _status_value(values["status"]),
+    )
+    measures = (
+        1,
+        values.get("net_amount") or Decimal("0"),
+        values.get("final_amount") or Decimal("0"),
+        values.get("vat_amount") or Decimal("0"),
+        values.get("withholding_tax") or Decimal("0"),
+    )
+    return key, measures
+
+
+# Model attributes feeding each source's rollup
+SOURCES = {
+    PurchaseOrder: ("order", ("project_id", "vendor_id", "created_at", "status", "net_amount", "vat_amount", "withholding_tax")),
+    Settlement: ("settlement", ("project_id", "vendor_id", "created_at", "status", "net_amount", "final_amount", "vat_amount", "withholding_tax")),
+}
+
+
+def _current_values(instance, attributes: Iterable[str]) -> dict:
+    return {name: getattr(instance, name) for name in attributes}
+
+
+def _keep_value(target, value, oldvalue, initiator):
+    return value
+
+
+def keep_previous_values(model, attributes: Iterable[str]) -> None:
+    """
+    Load the old value whenever one of these attributes is set
+
+    Without active history, assigning to an expired attribute (e.g. after a
+    commit) records no previous value and the old contribution is lost.
+    """
+    for name in attributes:
+        attribute = getattr(model, name)
+        if not event.contains(attribute, "set", _keep_value):
+            event.listen(attribute, "set", _keep_value, active_history=True, retval=True)
+
+
+def previous_values(instance, attributes: Iterable[str]) -> dict:
+    """Attribute values as of the last load, using attribute history"""
+    state = inspect(instance)
+    values = {}
+    for name in attributes:
+        history = state.attrs[name].history
+        if history.deleted:
+            values[name] = history.deleted[0]
+        elif history.unchanged:
+            values[name] = history.unchanged[0]
+        else:
+            values[name] = None
+    return values
+
+
+def _new_deltas() -> Dict[RollupKey, list]:
+    return defaultdict(lambda: [0] * len(MEASURES))
+
+
+def _accumulate(deltas: Dict[RollupKey, list], entry, sign: int = 1) -> None:
+    """Add (or with sign -1, subtract) one contribution to a delta map"""
+    if entry is None:
+        return
+    key, measures = entry
+    for i, value in enumerate(measures):
+        deltas[key][i] += sign * value
+
+
+def apply_deltas(connection: Connection, deltas: Dict[RollupKey, list]) -> None:
+    """
+    Add measure deltas to rollup rows, creating rows as needed
+
+    Rows left without documents are deleted, so the rollups hold the same
+    rows as a rebuild from the source tables.
+    """
+    upsert = UPSERT_INSERTS.get(connection.dialect.name)
+    emptied = []
+
+    for (source, project_id, vendor_id, period, status), measures in deltas.items():
+        if not any(measures):
+            continue
+
+        increments = dict(zip(MEASURES, measures))
+        key = {"source": source, "project_id": project_id, "vendor_id": vendor_id, "period": period, "status": status}
+        if increments["document_count"] < 0:
+            emptied.append(key)
+
+        if upsert is not None:
+            stmt = upsert(FinanceRollup).values(**key, **increments)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["source", "project_id", "vendor_id", "period", "status"],
+                set_={name: getattr(FinanceRollup, name) + getattr(stmt.excluded, name) for name in MEASURES},
+            )
+            connection.execute(stmt)
+            continue
+
+        result = connection.execute(
+            update(FinanceRollup)
+            .where(*(getattr(FinanceRollup, name) == value for name, value in key.items()))
+            .values({name: getattr(FinanceRollup, name) + value for name, value in increments.items()})
+        )
+        if result.rowcount == 0:
+            connection.execute(FinanceRollup.__table__.insert().values(**key, **increments))
+
+    for key in emptied:
+        connection.execute(
+            delete(FinanceRollup)
+            .where(*(getattr(FinanceRollup, name) == value for name, value in key.items()))
+            .where(FinanceRollup.document_count == 0)
+        )
+
+
+def _maintain_rollups(session: Session, flush_context) -> None:
+    """
+    Turn every flushed order/settlement change into rollup deltas
+
+    Runs inside the flush, so rollups commit or roll back together with
+    the documents themselves. Changed rows subtract their previous
+    contribution and add their new one.
+    """
+    deltas = _new_deltas()
+
+    for instance in session.new:
+        if type(instance) in SOURCES:
+            source, attributes = SOURCES[type(instance)]
+            _accumulate(deltas, contribution(source, _current_values(instance, attributes)))
+
+    for instance in session.dirty:
+        if type(instance) in SOURCES and session.is_modified(instance):
+            source, attributes = SOURCES[type(instance)]
+            _accumulate(deltas, contribution(source, previous_values(instance, attributes)), -1)
+            _accumulate(deltas, contribution(source, _current_values(instance, attributes)))
+
+    for instance in session.deleted:
+        if type(instance) in SOURCES:
+            source, attributes = SOURCES[type(instance)]
+            _accumulate(deltas, contribution(source, previous_values(instance, attributes)), -1)
+
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+
+
+def register_listeners() -> None:
+    """
+    Maintain the rollups on every Session flush from now on
+
+    Called by create_app and init_db; scripts writing orders or settlements
+    through their own sessions call it too. Safe to call more than once.
+    """
+    for model, (source, attributes) in SOURCES.items():
+        keep_previous_values(model, attributes)
+    if not event.contains(Session, "after_flush", _maintain_rollups):
+        event.listen(Session, "after_flush", _maintain_rollups)
+
+
+def record_inserted(session: Session, instances: Iterable) -> None:
+    """
+    Add rollup contributions for rows inserted outside the unit of work
+
+    Bulk INSERT statements bypass flush events, so callers inserting
+    orders or settlements that way report the returned rows here.
+    """
+    deltas = _new_deltas()
+    for instance in instances:
+        source, attributes = SOURCES[type(instance)]
+        _accumulate(deltas, contribution(source, _current_values(instance, attributes)))
+
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+
+
+def record_rows(session: Session, model, rows: Iterable[dict]) -> None:
+    """
+    Add rollup contributions for rows loaded as plain values (e.g. COPY)
+
+    Each row must carry the model's rollup attributes, including created_at.
+    """
+    source, attributes = SOURCES[model]
+    deltas = _new_deltas()
+    for row in rows:
+        _accumulate(deltas, contribution(source, {name: row.get(name) for name in attributes}))
+
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+
+
+def rebuild_rollups(session: Session, batch_size: int = 1000) -> int:
+    """
+    Recompute every rollup row from the source tables (backfill / repair)
+
+    Returns the number of rollup rows written. The caller commits.
+    """
+    session.execute(delete(FinanceRollup))
+
+    deltas = _new_deltas()
+    for model, (source, attributes) in SOURCES.items():
+        columns = [getattr(model, name) for name in attributes]
+        rows = session.execute(select(*columns).execution_options(yield_per=batch_size))
+        for row in rows:
+            _accumulate(deltas, contribution(source, dict(zip(attributes, row))))
+
+    apply_deltas(session.connection(), deltas)
+    return len(deltas)
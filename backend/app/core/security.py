@@ -1,6 +1,8 @@
 """
 Security utilities for authentication and authorization
 """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Union
 from jose import JWTError, jwt
@@ -21,6 +23,79 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordPoolSaturated(Exception):
+    """Raised when the password hashing pool has no queue capacity left"""
+
+
+class PasswordHashPool:
+    """
+    Bounded worker pool for bcrypt hashing and verification
+
+    bcrypt releases the GIL, so a thread pool gives real parallelism while
+    keeping the event loop free. Jobs beyond max_workers + max_queue are
+    rejected with PasswordPoolSaturated instead of queueing without bound.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def configure(self, max_workers: int, max_queue: int) -> None:
+        """
+        Resize the pool
+
+        Jobs already submitted are drained on the previous workers first
+        (blocking until they finish), so no more than max_workers hashes
+        ever run at once and every job counted in in_flight completes.
+        """
+        self.max_queue = max_queue
+        if max_workers != self.max_workers:
+            self._executor.shutdown(wait=True)
+            self.max_workers = max_workers
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+
+    async def run(self, fn, *args):
+        """Run fn(*args) on the pool; only called from the event loop thread"""
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise PasswordPoolSaturated()
+
+        self.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def stats(self) -> dict:
+        """Current pool utilisation and queue depth"""
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "active": min(self.in_flight, self.max_workers),
+            "queue_depth": max(self.in_flight - self.max_workers, 0),
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+password_pool = PasswordHashPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a hash on the password pool"""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Generate password hash on the password pool"""
+    return await password_pool.run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create JWT access token
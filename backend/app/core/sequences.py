@@ -0,0 +1,127 @@
+"""
+Document number allocator - Race-free PO-/ST- numbers from per-year counters
+"""
+import asyncio
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import Integer, cast, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import DbSession
+from app.models.document_sequence import DocumentSequence
+
+# Dialect inserts supporting ON CONFLICT DO NOTHING for counter creation
+CONFLICT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def format_document_no(prefix: str, year: int, number: int) -> str:
+    """Format a document number: PREFIX-YYYY-NNNN"""
+    return f"{prefix}-{year}-{number:04d}"
+
+
+def _existing_max(connection: Connection, prefix: str, year: int, seed_column) -> int:
+    """Highest number already issued before the counter existed (one-time scan)"""
+    if seed_column is None:
+        return 0
+    
+    # Compare the numbers, not the strings: PO-2025-10000 sorts below PO-2025-9999
+    head = f"{prefix}-{year}-"
+    number = cast(func.substr(seed_column, len(head) + 1), Integer)
+    latest = connection.execute(
+        select(func.max(number)).where(seed_column.like(f"{head}%"))
+    ).scalar()
+    return latest or 0
+
+
+def reserve_range(connection: Connection, prefix: str, year: int, count: int, seed_column=None) -> int:
+    """
+    Atomically reserve `count` numbers and return the last one reserved
+    
+    The counter row is created on first use, seeded from existing documents
+    when seed_column is given. The row stays locked until the surrounding
+    transaction ends, so concurrent callers are serialized on it.
+    """
+    bump = (
+        update(DocumentSequence)
+        .where(DocumentSequence.prefix == prefix, DocumentSequence.year == year)
+        .values(last_value=DocumentSequence.last_value + count)
+        .returning(DocumentSequence.last_value)
+    )
+    
+    last = connection.execute(bump).scalar()
+    if last is not None:
+        return last
+    
+    values = {"prefix": prefix, "year": year, "last_value": _existing_max(connection, prefix, year, seed_column)}
+    conflict_insert = CONFLICT_INSERTS.get(connection.dialect.name)
+    if conflict_insert is not None:
+        stmt = conflict_insert(DocumentSequence).values(**values).on_conflict_do_nothing(
+            index_elements=["prefix", "year"]
+        )
+    else:
+        stmt = insert(DocumentSequence).values(**values)
+    connection.execute(stmt)
+    
+    return connection.execute(bump).scalar_one()
+
+
+class DocumentNumberAllocator:
+    """
+    Hands out document numbers for a prefix (PO, ST) and the current year
+    
+    With block_size 1 each number is reserved inside the caller's transaction,
+    so numbers are gap-free. With a larger block_size the worker reserves a
+    block in its own short transaction and serves numbers from memory; the
+    counter row is never held for the length of a request, at the cost of
+    gaps when a worker exits with unused numbers.
+    """
+
+    def __init__(self, block_size: int):
+        self.block_size = block_size
+        self._blocks: Dict[Tuple[str, int], List[int]] = {}  # (prefix, year) -> [next, last]
+        self._lock = asyncio.Lock()
+
+    def configure(self, block_size: int) -> None:
+        """Apply a new block size and drop the reserved blocks (their numbers become gaps)"""
+        self.block_size = block_size
+        self._blocks.clear()
+
+    async def allocate(self, db: DbSession, prefix: str, count: int = 1, seed_column=None) -> List[str]:
+        """Allocate `count` consecutive-per-worker document numbers"""
+        year = date.today().year
+        
+        if self.block_size <= 1:
+            last = await db.run_sync(
+                lambda session: reserve_range(session.connection(), prefix, year, count, seed_column)
+            )
+            return [format_document_no(prefix, year, n) for n in range(last - count + 1, last + 1)]
+        
+        numbers: List[int] = []
+        async with self._lock:
+            block = self._blocks.get((prefix, year))
+            while len(numbers) < count:
+                if block is None or block[0] > block[1]:
+                    size = max(self.block_size, count - len(numbers))
+                    last = await db.run_sync(self._reserve_block, prefix, year, size, seed_column)
+                    block = [last - size + 1, last]
+                    self._blocks[(prefix, year)] = block
+                
+                take = min(count - len(numbers), block[1] - block[0] + 1)
+                numbers.extend(range(block[0], block[0] + take))
+                block[0] += take
+        
+        return [format_document_no(prefix, year, n) for n in numbers]
+
+    @staticmethod
+    def _reserve_block(session: Session, prefix: str, year: int, size: int, seed_column) -> int:
+        """Reserve a block in a separate, immediately committed transaction"""
+        with session.get_bind().begin() as connection:
+            return reserve_range(connection, prefix, year, size, seed_column)
+
+
+document_numbers = DocumentNumberAllocator(settings.DOCUMENT_NUMBER_BLOCK_SIZE)
@@ -0,0 +1,43 @@
+"""
+Startup warmup - Statements compiled before the first request
+
+Each statement has the same shape as the query an endpoint runs (bound
+values such as limits and ids do not change SQLAlchemy's cache key), so
+executing it once fills the engine's compiled cache for that endpoint.
+"""
+from typing import List
+
+from sqlalchemy import desc, func, select
+
+from app.core.etags import version_query
+from app.models import PurchaseOrder, Settlement, Cut, User
+
+
+def newest_first_page(model):
+    """Unfiltered first page of a list endpoint (GET /orders, /settlements, /cuts)"""
+    return (
+        select(model)
+        .order_by(desc(model.created_at), desc(model.id))
+        .offset(0)
+        .limit(0)
+    )
+
+
+def hot_statements() -> List:
+    """Statements executed by warm_pool() at startup"""
+    return [
+        # Principal lookup on a principal cache miss
+        select(User).where(User.email == ""),
+        newest_first_page(PurchaseOrder),
+        newest_first_page(Settlement),
+        newest_first_page(Cut),
+        # ETag of the unfiltered order and settlement lists
+        version_query(PurchaseOrder),
+        version_query(Settlement),
+        # Unfiltered settlement summary
+        select(
+            Settlement.status,
+            func.count(Settlement.id),
+            func.coalesce(func.sum(Settlement.final_amount), 0),
+        ).group_by(Settlement.status),
+    ]
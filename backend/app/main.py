@@ -1,64 +1,167 @@
 """
 RECESS IMS Backend API
 Reliable Entertainment Contents Settlement System v3.0
+
+The schema is owned by Alembic: run `alembic upgrade head` once per
+deployment before starting workers. Building the application performs
+no DDL; the lifespan creates the engines, applies the configuration to
+the process-wide services, warms the connection pool and disposes the
+engines on shutdown.
 """
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from app.core.config import settings
-from app.core.database import Base, engine
-
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-# Initialize FastAPI app
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    version=settings.VERSION,
-    description="Japanese Animation Production Management System",
-    docs_url="/docs",
-    redoc_url="/redoc",
-)
-
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.ALLOWED_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-
-@app.get("/")
-async def root():
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from starlette.requests import Request
+
+from app.core.config import Settings, settings
+
+
+async def root(request: Request):
     """Root endpoint - API health check"""
+    config = request.app.state.config
     return {
         "message": "RECESS IMS API",
-        "version": settings.VERSION,
+        "version": config.VERSION,
         "status": "operational",
         "docs": "/docs",
         "redoc": "/redoc"
     }
 
 
-@app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint"""
+    from app.core.security import password_pool
+    from app.core.principal_cache import principal_cache
+    from app.core.metrics import request_stats
+    from app.core.changes import change_feed
+
+    config = request.app.state.config
     return {
         "status": "healthy",
-        "environment": settings.ENVIRONMENT,
-        "version": settings.VERSION
+        "environment": config.ENVIRONMENT,
+        "version": config.VERSION,
+        "password_pool": password_pool.stats(),
+        "principal_cache": principal_cache.stats(),
+        "requests": request_stats(),
+        "change_feed": change_feed.stats()
     }
 
 
-# Import and include routers
-from app.routers import auth, purchase_orders, settlements
+async def metrics_endpoint():
+    """Request, database pool and query metrics in Prometheus text format"""
+    from fastapi import Response
+    from app.core.metrics import CONTENT_TYPE, registry
+
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
+
+def configure_services(config: Settings) -> None:
+    """
+    Apply `config` to the process-wide services the routers share
+
+    The password pool, principal cache, document number allocator, change
+    feed and fast JSON switch are module singletons; the last application
+    started in a process decides their settings.
+    """
+    from app.core.changes import change_feed
+    from app.core.fast_json import configure_fast_json
+    from app.core.principal_cache import principal_cache
+    from app.core.security import password_pool
+    from app.core.sequences import document_numbers
+
+    password_pool.configure(config.PASSWORD_HASH_WORKERS, config.PASSWORD_HASH_MAX_QUEUE)
+    principal_cache.configure(config.PRINCIPAL_CACHE_TTL_SECONDS, config.PRINCIPAL_CACHE_MAX_SIZE)
+    document_numbers.configure(config.DOCUMENT_NUMBER_BLOCK_SIZE)
+    change_feed.configure(
+        config.CHANGE_FEED_BUFFER_SIZE, config.CHANGE_FEED_QUEUE_SIZE, config.CHANGE_FEED_KEEPALIVE_SECONDS
+    )
+    configure_fast_json(config)
+
+
+def create_app(config: Optional[Settings] = None):
+    """
+    Build the FastAPI application
+
+    Routers, models and the database layer are imported here rather than
+    at module import, so `import app.main` stays cheap; `app.main:app` is
+    built on first access. `config` (defaults to the global settings) is
+    kept on app.state.config and, when the application starts, selects the
+    database and pools and configures the shared services (see
+    configure_services). Token signing and import storage always use the
+    global settings.
+    """
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+    from app.core import database, progress, rollups
+    from app.core.compression import CompressionMiddleware
+    from app.core.metrics import RequestMetricsMiddleware
+    from app.core.pagination import NEXT_CURSOR_HEADER
+    from app.core.warmup import hot_statements
+    from app.routers import auth, purchase_orders, settlements, reports, cuts, changes
+
+    config = config or settings
+    rollups.register_listeners()
+    progress.register_listeners()
+
+    @asynccontextmanager
+    async def lifespan(app):
+        database.configure_engines(config)
+        configure_services(config)
+        await database.warm_pool(config.DATABASE_POOL_WARMUP, hot_statements())
+        try:
+            yield
+        finally:
+            await database.dispose_engines()
+
+    # Initialize FastAPI app
+    app = FastAPI(
+        title=config.PROJECT_NAME,
+        version=config.VERSION,
+        description="Japanese Animation Production Management System",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        lifespan=lifespan,
+    )
+    app.state.config = config
+
+    # Configure CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=config.ALLOWED_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
+    )
+
+    # gzip/brotli/zstd for JSON pages and CSV exports (not SSE)
+    app.add_middleware(CompressionMiddleware, config=config)
+
+    # Per-route latency, status and (compressed) size; also lets database metrics name the endpoint
+    app.add_middleware(RequestMetricsMiddleware)
+
+    app.add_api_route("/", root, methods=["GET"])
+    app.add_api_route("/health", health_check, methods=["GET"])
+    app.add_api_route("/metrics", metrics_endpoint, methods=["GET"], include_in_schema=False)
+
+    app.include_router(auth.router, prefix=config.API_V1_PREFIX, tags=["Authentication"])
+    app.include_router(purchase_orders.router, prefix=config.API_V1_PREFIX, tags=["Purchase Orders"])
+    app.include_router(settlements.router, prefix=config.API_V1_PREFIX, tags=["Settlements"])
+    app.include_router(reports.router, prefix=config.API_V1_PREFIX, tags=["Reports"])
+    app.include_router(cuts.router, prefix=config.API_V1_PREFIX, tags=["Cuts"])
+    app.include_router(changes.router, prefix=config.API_V1_PREFIX, tags=["Changes"])
+
+    return app
+
 
-app.include_router(auth.router, prefix=settings.API_V1_PREFIX, tags=["Authentication"])
-app.include_router(purchase_orders.router, prefix=settings.API_V1_PREFIX, tags=["Purchase Orders"])
-app.include_router(settlements.router, prefix=settings.API_V1_PREFIX, tags=["Settlements"])
+def __getattr__(name: str):
+    # Module-level `app` is created lazily (PEP 562) for `uvicorn app.main:app`
+    if name == "app":
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -8,6 +8,9 @@ from app.models.project import Project, Episode, Cut, ProjectType, ProjectStatus
 from app.models.vendor import Vendor, VendorType, TaxType
 from app.models.purchase_order import PurchaseOrder, OrderStatus
 from app.models.settlement import Settlement, SettlementStatus
+from app.models.document_sequence import DocumentSequence
+from app.models.rollup import FinanceRollup
+from app.models.import_job import ImportJob, ImportJobStatus
 
 __all__ = [
     "Base",
@@ -29,4 +32,8 @@ __all__ = [
     "OrderStatus",
     "Settlement",
     "SettlementStatus",
+    "DocumentSequence",
+    "FinanceRollup",
+    "ImportJob",
+    "ImportJobStatus",
 ]
@@ -0,0 +1,26 @@
+"""
+Document sequence model - Per-prefix, per-year document number counters
+"""
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class DocumentSequence(Base):
+    """
+    Counter backing PO-/ST- document numbers
+
+    One row per (prefix, year); last_value is the highest number handed out.
+    Numbers are reserved with an atomic UPDATE ... RETURNING, so concurrent
+    creates never see the same value.
+    """
+    __tablename__ = "document_sequences"
+    
+    prefix = Column(String(10), primary_key=True)  # PO, ST
+    year = Column(Integer, primary_key=True)
+    last_value = Column(Integer, nullable=False, default=0)
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<DocumentSequence(prefix='{self.prefix}', year={self.year}, last_value={self.last_value})>"
@@ -0,0 +1,55 @@
+"""
+Import job model - Progress of a spreadsheet import into purchase orders
+"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum, Text, JSON
+from sqlalchemy.sql import func
+from app.core.database import Base
+import enum
+
+
+class ImportJobStatus(str, enum.Enum):
+    """Import job status"""
+    pending = "pending"       # Uploaded, not started
+    running = "running"       # Rows being loaded
+    completed = "completed"   # Every row processed
+    failed = "failed"         # Stopped by an error; can be resumed
+
+
+class ImportJob(Base):
+    """
+    One uploaded CSV/XLSX sheet of legacy orders (발주서) being imported
+
+    Rows are loaded in batches; each batch commits together with the job's
+    progress counters, so last_row always matches what is in the
+    database and a failed or interrupted job resumes after the last
+    committed batch.
+    """
+    __tablename__ = "import_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Source file
+    filename = Column(String(255), nullable=False)  # Name as uploaded
+    file_path = Column(String(500), nullable=False)  # Stored copy read by the job
+    file_format = Column(String(10), nullable=False)  # csv, xlsx
+
+    # Progress
+    status = Column(SQLEnum(ImportJobStatus), default=ImportJobStatus.pending, nullable=False)
+    last_row = Column(Integer, default=1, nullable=False)  # Sheet row of the last committed row (resume point)
+    processed_rows = Column(Integer, default=0, nullable=False)  # Data rows consumed, valid or not
+    imported_count = Column(Integer, default=0, nullable=False)
+    error_count = Column(Integer, default=0, nullable=False)
+    errors = Column(JSON, default=list, nullable=False)  # [{"row": 12, "detail": "..."}], capped
+    last_error = Column(Text, nullable=True)  # Why the job failed
+
+    # People
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    # Timestamps
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<ImportJob(id={self.id}, filename='{self.filename}', status='{self.status}', processed_rows={self.processed_rows})>"
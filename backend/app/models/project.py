@@ -1,10 +1,11 @@
 """
 Project, Episode, and Cut models - Core production tracking
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum, Numeric, Date, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum, Numeric, Date, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+from typing import List
 import enum
 
 
@@ -52,6 +53,42 @@ class CutStatus(str, enum.Enum):
     rework = "rework"
 
 
+# Allowed Cut.status transitions: current status -> next statuses
+CUT_TRANSITIONS = {
+    CutStatus.assigned: {CutStatus.in_progress},
+    CutStatus.in_progress: {CutStatus.qc1_pending},
+    CutStatus.qc1_pending: {CutStatus.qc1_approved, CutStatus.qc1_rejected},
+    CutStatus.qc1_approved: {CutStatus.qc2_pending},
+    CutStatus.qc1_rejected: {CutStatus.rework},
+    CutStatus.qc2_pending: {CutStatus.qc2_approved, CutStatus.qc2_rejected},
+    CutStatus.qc2_approved: {CutStatus.qc3_pending},
+    CutStatus.qc2_rejected: {CutStatus.rework},
+    CutStatus.qc3_pending: {CutStatus.qc3_approved, CutStatus.qc3_rejected},
+    CutStatus.qc3_approved: {CutStatus.completed},
+    CutStatus.qc3_rejected: {CutStatus.rework},
+    CutStatus.rework: {CutStatus.in_progress},
+    CutStatus.completed: {CutStatus.rework},  # Reopened after final QC
+}
+
+# QC decisions: target status -> (QC stage, qcN_status value)
+QC_DECISIONS = {
+    CutStatus.qc1_pending: (1, "pending"),
+    CutStatus.qc1_approved: (1, "approved"),
+    CutStatus.qc1_rejected: (1, "rejected"),
+    CutStatus.qc2_pending: (2, "pending"),
+    CutStatus.qc2_approved: (2, "approved"),
+    CutStatus.qc2_rejected: (2, "rejected"),
+    CutStatus.qc3_pending: (3, "pending"),
+    CutStatus.qc3_approved: (3, "approved"),
+    CutStatus.qc3_rejected: (3, "rejected"),
+}
+
+
+def cut_sources(target: CutStatus) -> List[CutStatus]:
+    """Statuses a cut may move to `target` from"""
+    return [source for source, targets in CUT_TRANSITIONS.items() if target in targets]
+
+
 class Project(Base):
     """Project model - Animation production project"""
     __tablename__ = "projects"
@@ -91,6 +128,9 @@ class Project(Base):
 class Episode(Base):
     """Episode model - Individual episodes within a project"""
     __tablename__ = "episodes"
+    __table_args__ = (
+        Index("ix_episodes_project_id", "project_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
@@ -117,6 +157,13 @@ class Episode(Base):
 class Cut(Base):
     """Cut model - Individual animation cuts (minimum work unit)"""
     __tablename__ = "cuts"
+    __table_args__ = (
+        # QC queues and assignee worklists: filter by episode/assignee and status
+        Index("ix_cuts_episode_id_status", "episode_id", "status"),
+        Index("ix_cuts_assigned_to_status", "assigned_to", "status"),
+        # Keyset pagination of cut lists filtered by status
+        Index("ix_cuts_status_created_at_id", "status", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     episode_id = Column(Integer, ForeignKey("episodes.id"), nullable=False)
@@ -1,12 +1,17 @@
 """
 Purchase Order model - Core order management (발주서)
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum, Numeric, Date, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum, Numeric, Date, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+from decimal import Decimal
+from typing import Dict, List, Sequence
 import enum
 
+# Fixed VAT rate applied to every order
+VAT_RATE = Decimal("0.10")
+
 
 class OrderStatus(str, enum.Enum):
     """Purchase order status"""
@@ -27,7 +32,16 @@ class PurchaseOrder(Base):
     Contains pricing, quantity, and payment terms
     """
     __tablename__ = "purchase_orders"
-    
+    __table_args__ = (
+        # Keyset pagination: ORDER BY created_at DESC, id DESC, optionally filtered
+        Index("ix_purchase_orders_created_at_id", "created_at", "id"),
+        Index("ix_purchase_orders_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_purchase_orders_project_id_created_at_id", "project_id", "created_at", "id"),
+        Index("ix_purchase_orders_vendor_id_created_at_id", "vendor_id", "created_at", "id"),
+        # Combined project/vendor + status filters (order lists, dashboards)
+        Index("ix_purchase_orders_project_id_status_created_at_id", "project_id", "status", "created_at", "id"),
+        Index("ix_purchase_orders_vendor_id_status_created_at_id", "vendor_id", "status", "created_at", "id"),
+    )
     # Primary Key
     id = Column(Integer, primary_key=True, index=True)
     order_no = Column(String(20), unique=True, nullable=False, index=True)  # PO-2026-0001
@@ -80,6 +94,13 @@ class PurchaseOrder(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
+    # Optimistic concurrency: every ORM UPDATE matches the loaded version and
+    # increments it, so a concurrent change fails instead of being overwritten
+    version = Column(Integer, nullable=False, server_default="1")
+    
+    # Load server-generated created_at on INSERT; finance rollups key on its month
+    __mapper_args__ = {"eager_defaults": True, "version_id_col": version}
+    
     # Relationships
     project = relationship("Project", back_populates="purchase_orders")
     vendor = relationship("Vendor", back_populates="purchase_orders")
@@ -99,17 +120,87 @@ class PurchaseOrder(Base):
         4. withholding_tax = adjusted_amount × withholding_rate (3.3% for freelancers)
         5. net_amount = adjusted_amount + vat_amount - withholding_tax
         """
+        amounts = calculate_order_amounts(
+            self.quantity,
+            self.unit_price,
+            self.difficulty_rate,
+            self.urgency_rate,
+            self.vat_rate,
+            self.withholding_tax_rate,
+        )
+        for field, value in amounts.items():
+            setattr(self, field, value)
+
+
+def calculate_order_amounts(
+    quantity: int,
+    unit_price: Decimal,
+    difficulty_rate: Decimal,
+    urgency_rate: Decimal,
+    vat_rate: Decimal,
+    withholding_tax_rate: Decimal,
+) -> dict:
+    """
+    Derived order amounts for one set of pricing inputs
+    
+    Shared by PurchaseOrder.calculate_amounts and paths that build order
+    rows without ORM instances (bulk creation).
+    """
+    amounts = calculate_order_amounts_batch(
+        [quantity], [unit_price], [difficulty_rate], [urgency_rate], [vat_rate], [withholding_tax_rate]
+    )
+    return {field: values[0] for field, values in amounts.items()}
+
+
+def calculate_order_amounts_batch(
+    quantities: Sequence[int],
+    unit_prices: Sequence[Decimal],
+    difficulty_rates: Sequence[Decimal],
+    urgency_rates: Sequence[Decimal],
+    vat_rates: Sequence[Decimal],
+    withholding_tax_rates: Sequence[Decimal],
+) -> Dict[str, List[Decimal]]:
+    """
+    Derived order amounts for columns of pricing inputs
+    
+    The single implementation of the pricing formula: every column is
+    processed in one pass and the result is column-oriented, matching the
+    inputs index for index. Arithmetic stays in exact Decimal, so results
+    are identical whether an order is priced alone or in a batch.
+    """
+    base_amounts = []
+    adjusted_amounts = []
+    vat_amounts = []
+    withholding_taxes = []
+    net_amounts = []
+    
+    for quantity, unit_price, difficulty_rate, urgency_rate, vat_rate, withholding_tax_rate in zip(
+        quantities, unit_prices, difficulty_rates, urgency_rates, vat_rates, withholding_tax_rates
+    ):
         # Base calculation
-        self.base_amount = self.quantity * self.unit_price
+        base_amount = quantity * unit_price
         
         # Apply adjustment multipliers
-        self.adjusted_amount = self.base_amount * self.difficulty_rate * self.urgency_rate
+        adjusted_amount = base_amount * difficulty_rate * urgency_rate
         
         # Calculate VAT (always 10%)
-        self.vat_amount = self.adjusted_amount * self.vat_rate
+        vat_amount = adjusted_amount * vat_rate
         
         # Calculate withholding tax (3.3% for freelancers, 0% for studios)
-        self.withholding_tax = self.adjusted_amount * self.withholding_tax_rate
+        withholding_tax = adjusted_amount * withholding_tax_rate
+        
+        base_amounts.append(base_amount)
+        adjusted_amounts.append(adjusted_amount)
+        vat_amounts.append(vat_amount)
+        withholding_taxes.append(withholding_tax)
         
         # Final net payment amount
-        self.net_amount = self.adjusted_amount + self.vat_amount - self.withholding_tax
+        net_amounts.append(adjusted_amount + vat_amount - withholding_tax)
+    
+    return {
+        "base_amount": base_amounts,
+        "adjusted_amount": adjusted_amounts,
+        "vat_amount": vat_amounts,
+        "withholding_tax": withholding_taxes,
+        "net_amount": net_amounts,
+    }
@@ -0,0 +1,42 @@
+"""
+Finance rollup model - Pre-aggregated order and settlement totals
+"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Numeric, Date, UniqueConstraint
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class FinanceRollup(Base):
+    """
+    Running totals per (source, project, vendor, month, status)
+    
+    source is "order" for purchase orders and "settlement" for settlements.
+    Rows are maintained incrementally on every flush that creates, changes
+    or deletes an order or settlement (see app.core.rollups), so dashboard
+    reads never scan the source tables.
+    """
+    __tablename__ = "finance_rollups"
+    __table_args__ = (
+        UniqueConstraint("source", "project_id", "vendor_id", "period", "status", name="uq_finance_rollups_key"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Rollup key
+    source = Column(String(20), nullable=False)  # order, settlement
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    vendor_id = Column(Integer, ForeignKey("vendors.id"), nullable=False)
+    period = Column(Date, nullable=False)  # First day of the month
+    status = Column(String(20), nullable=False)
+    
+    # Totals
+    document_count = Column(Integer, nullable=False, default=0)
+    net_amount = Column(Numeric(15, 2), nullable=False, default=0)
+    final_amount = Column(Numeric(15, 2), nullable=False, default=0)
+    vat_amount = Column(Numeric(15, 2), nullable=False, default=0)
+    withholding_tax = Column(Numeric(15, 2), nullable=False, default=0)
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<FinanceRollup(source='{self.source}', project_id={self.project_id}, vendor_id={self.vendor_id}, period={self.period}, status='{self.status}')>"
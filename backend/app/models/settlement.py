@@ -1,7 +1,7 @@
 """
 Settlement model - Payment processing (정산)
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum, Numeric, Date, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum, Numeric, Date, Text, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -25,7 +25,18 @@ class Settlement(Base):
     Created after QC3 approval, tracks actual payment
     """
     __tablename__ = "settlements"
-    
+    __table_args__ = (
+        # Keyset pagination: ORDER BY created_at DESC, id DESC, optionally filtered
+        Index("ix_settlements_created_at_id", "created_at", "id"),
+        Index("ix_settlements_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_settlements_project_id_created_at_id", "project_id", "created_at", "id"),
+        Index("ix_settlements_vendor_id_created_at_id", "vendor_id", "created_at", "id"),
+        # Combined project/vendor + status filters (settlement lists, summary)
+        Index("ix_settlements_project_id_status_created_at_id", "project_id", "status", "created_at", "id"),
+        Index("ix_settlements_vendor_id_status_created_at_id", "vendor_id", "status", "created_at", "id"),
+        # One settlement per order; also serves lookups by order
+        UniqueConstraint("order_id", name="uq_settlements_order_id"),
+    )
     # Primary Key
     id = Column(Integer, primary_key=True, index=True)
     settlement_no = Column(String(20), unique=True, nullable=False, index=True)  # ST-2026-0001
@@ -71,6 +82,13 @@ class Settlement(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     completed_at = Column(DateTime(timezone=True), nullable=True)
     
+    # Optimistic concurrency: every ORM UPDATE matches the loaded version and
+    # increments it, so a concurrent change fails instead of being overwritten
+    version = Column(Integer, nullable=False, server_default="1")
+    
+    # Load server-generated created_at on INSERT; finance rollups key on its month
+    __mapper_args__ = {"eager_defaults": True, "version_id_col": version}
+    
     # Relationships
     order = relationship("PurchaseOrder", back_populates="settlements")
     vendor = relationship("Vendor", back_populates="settlements")
@@ -1,6 +1,6 @@
 """
 Routers package
 """
-from app.routers import auth, purchase_orders, settlements
+from app.routers import auth, purchase_orders, settlements, reports, cuts, changes
 
-__all__ = ["auth", "purchase_orders", "settlements"]
+__all__ = ["auth", "purchase_orders", "settlements", "reports", "cuts", "changes"]
@@ -3,25 +3,46 @@ Authentication router - Login, logout, token management
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
-from app.core.database import get_db
-from app.core.security import verify_password, get_password_hash, create_access_token, create_refresh_token, decode_token
+from app.core.database import DbSession, get_db, open_session, reads_from_replica, session_user
+from app.core.principal_cache import detached_copy, principal_cache
+from app.core.security import (
+    verify_password_async,
+    get_password_hash_async,
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    PasswordPoolSaturated,
+)
 from app.models import User
 from app.schemas.user import UserCreate, User as UserSchema, Token
-from typing import Optional
+from typing import AsyncGenerator, Optional
 
 router = APIRouter()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"/api/v1/auth/login")
 
 
+def password_pool_busy() -> HTTPException:
+    """429 response used when the password hashing pool is saturated"""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Authentication service is busy, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     """
     Dependency to get current authenticated user from JWT token
+    
+    Users are served from the principal cache while fresh, so most
+    authenticated requests resolve the caller without a database query.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -37,15 +58,42 @@ async def get_current_user(
     if email is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == email).first()
+    user_id: Optional[int] = payload.get("user_id")
+    if user_id is not None:
+        user = principal_cache.get(user_id)
+        if user is not None and user.email == email:
+            session_user.set(user.id)
+            return user
+    
+    # Read before loading: an eviction committed meanwhile keeps the result out of the cache
+    generation = principal_cache.generation
+    user = await db.scalar(select(User).where(User.email == email))
     if user is None:
         raise credentials_exception
     
+    # Detached, so rolling back this request's session cannot expire it
+    user = detached_copy(user)
+    principal_cache.set(user, generation)
+    session_user.set(user.id)
     return user
 
 
+async def get_read_db(
+    current_user: User = Depends(get_current_user)
+) -> AsyncGenerator[DbSession, None]:
+    """
+    Dependency yielding a read-only session for GET endpoints
+    
+    Reads go to the replica (DATABASE_REPLICA_URL) unless none is
+    configured or the caller committed a write within the sticky window,
+    in which case they read from the primary.
+    """
+    async with open_session(replica=reads_from_replica(current_user.id)) as db:
+        yield db
+
+
 @router.post("/auth/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     Register a new user
     
@@ -56,17 +104,23 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     - **tier**: Organization tier 0-2
     """
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
+    # Hash password on the worker pool
+    try:
+        password_hash = await get_password_hash_async(user_data.password)
+    except PasswordPoolSaturated:
+        raise password_pool_busy()
+    
     # Create new user
     db_user = User(
         email=user_data.email,
-        password_hash=get_password_hash(user_data.password),
+        password_hash=password_hash,
         name=user_data.name,
         name_jp=user_data.name_jp,
         phone=user_data.phone,
@@ -76,8 +130,8 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
@@ -85,7 +139,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
 @router.post("/auth/login", response_model=Token)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Login with email and password
@@ -93,9 +147,14 @@ async def login(
     Returns access token and refresh token
     """
     # Find user by email
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = await db.scalar(select(User).where(User.email == form_data.username))
+    
+    try:
+        password_ok = user is not None and await verify_password_async(form_data.password, user.password_hash)
+    except PasswordPoolSaturated:
+        raise password_pool_busy()
     
-    if not user or not verify_password(form_data.password, user.password_hash):
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -111,7 +170,8 @@ async def login(
     
     # Update last login
     user.last_login = datetime.utcnow()
-    db.commit()
+    await db.commit()
+    await db.refresh(user)
     
     # Create tokens
     access_token = create_access_token(data={"sub": user.email, "user_id": user.id})
@@ -0,0 +1,191 @@
+"""
+Changes router - Server push of order, settlement and cut status changes
+
+Clients subscribe instead of polling the list endpoints. Each event is a
+JSON object:
+
+    {"event": "change", "id": 42, "entity": "order", "entity_id": 7,
+     "status": "approved", "previous_status": "pending", "project_id": 1,
+     "vendor_id": 2, "episode_id": null, "changed_by": 3,
+     "changed_at": "2026-10-18T09:30:00"}
+
+Orders created by a spreadsheet import arrive as one "order_import" event
+per project and vendor for each committed batch (entity_id is the import
+job's id, previous_status is null); reload the orders on receiving one.
+
+A reconnecting client passes the last id it saw to receive what it missed.
+When those events are no longer available it gets a reset event first and
+should reload the data it displays.
+"""
+import asyncio
+import json
+from typing import AsyncIterator, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, WebSocket, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import OAuth2PasswordBearer
+from app.core.changes import Subscription, SubscriptionOverflow, change_feed
+from app.core.database import open_session
+from app.models import User
+from app.routers.auth import get_current_user
+
+router = APIRouter()
+
+# WebSocket close code asking the client to reconnect (it fell too far behind)
+TRY_AGAIN_LATER = 1013
+
+# Authorization header, optional because browsers pass ?token= instead
+bearer_token = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
+
+
+async def token_user(token: Optional[str]) -> Optional[User]:
+    """User an access token belongs to, or None; the session is closed before returning"""
+    if token is None:
+        return None
+
+    async with open_session() as db:
+        try:
+            return await get_current_user(token=token, db=db)
+        except HTTPException:
+            return None
+
+
+async def get_stream_user(
+    token: Optional[str] = Query(None, description="Access token (EventSource cannot set headers)"),
+    authorization: Optional[str] = Depends(bearer_token)
+) -> User:
+    """Authenticate an event stream from ?token= or the Authorization header"""
+    user = await token_user(token if token is not None else authorization)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+def reset_event() -> str:
+    return json.dumps({"event": "reset", "last_event_id": change_feed.last_id})
+
+
+async def sse_events(
+    project_id: Optional[int],
+    vendor_id: Optional[int],
+    last_event_id: Optional[int]
+) -> AsyncIterator[str]:
+    """Encode feed events as text/event-stream until the client disconnects"""
+    subscription, complete = change_feed.subscribe(project_id, vendor_id, last_event_id)
+    try:
+        yield "retry: 3000\n\n"
+        if not complete:
+            yield f"event: reset\ndata: {reset_event()}\n\n"
+
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), change_feed.keepalive_seconds)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            except SubscriptionOverflow:
+                # End the stream; EventSource reconnects with Last-Event-ID
+                return
+            yield f"id: {event.id}\nevent: change\ndata: {event.data}\n\n"
+    finally:
+        subscription.close()
+
+
+@router.get("/changes/stream")
+async def stream_changes(
+    project_id: Optional[int] = None,
+    vendor_id: Optional[int] = None,
+    last_event_id: Optional[int] = Query(None, description="Resume after this event id"),
+    last_event_id_header: Optional[int] = Header(None, alias="Last-Event-ID"),
+    current_user: User = Depends(get_stream_user)
+):
+    """
+    Server-Sent Events stream of status changes
+
+    Authenticate with ?token=<access token> (EventSource cannot set
+    headers) or an Authorization header. The stream holds no database
+    session while it is open.
+
+    **Filters:**
+    - project_id: Only changes in this project
+    - vendor_id: Only changes for this vendor (excludes cut changes)
+
+    **Resume:** send the Last-Event-ID header (EventSource does this on
+    reconnect) or the last_event_id query parameter.
+    """
+    resume_after = last_event_id if last_event_id is not None else last_event_id_header
+
+    return StreamingResponse(
+        sse_events(project_id, vendor_id, resume_after),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def websocket_user(websocket: WebSocket, token: Optional[str]) -> Optional[User]:
+    """Authenticate a WebSocket from ?token= or the Authorization header"""
+    if token is None:
+        scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and credentials:
+            token = credentials
+    return await token_user(token)
+
+
+async def pump_websocket(websocket: WebSocket, subscription: Subscription) -> None:
+    """Send feed events until the client disconnects or falls too far behind"""
+    receiver = asyncio.ensure_future(websocket.receive())
+    getter = asyncio.ensure_future(subscription.get())
+    try:
+        while True:
+            done, _ = await asyncio.wait({receiver, getter}, return_when=asyncio.FIRST_COMPLETED)
+
+            if receiver in done:
+                if receiver.result()["type"] == "websocket.disconnect":
+                    return
+                # Clients have nothing to say; ignore anything they send
+                receiver = asyncio.ensure_future(websocket.receive())
+
+            if getter in done:
+                try:
+                    event = getter.result()
+                except SubscriptionOverflow:
+                    await websocket.close(code=TRY_AGAIN_LATER)
+                    return
+                await websocket.send_text(event.data)
+                getter = asyncio.ensure_future(subscription.get())
+    finally:
+        receiver.cancel()
+        getter.cancel()
+
+
+@router.websocket("/changes/ws")
+async def websocket_changes(
+    websocket: WebSocket,
+    token: Optional[str] = None,
+    project_id: Optional[int] = None,
+    vendor_id: Optional[int] = None,
+    last_event_id: Optional[int] = None
+):
+    """
+    WebSocket stream of status changes
+
+    Authenticate with ?token=<access token> (browsers cannot set headers on
+    WebSockets) or an Authorization header. Filters and resume work as for
+    GET /changes/stream; each message is one JSON event.
+    """
+    user = await websocket_user(websocket, token)
+    if user is None:
+        await websocket.close(code=1008)
+        return
+
+    await websocket.accept()
+    subscription, complete = change_feed.subscribe(project_id, vendor_id, last_event_id)
+    try:
+        if not complete:
+            await websocket.send_text(reset_event())
+        await pump_websocket(websocket, subscription)
+    finally:
+        subscription.close()
@@ -0,0 +1,245 @@
+"""
+Cuts router - Cut production status and QC workflow API
+"""
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import desc, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime
+from app.core.database import get_db
+from app.core.pagination import apply_cursor, set_next_cursor
+from app.core import changes, progress
+from app.models import Cut, Episode, User, CutStatus
+from app.models.project import CUT_TRANSITIONS, QC_DECISIONS, cut_sources
+from app.schemas.cut import (
+    Cut as CutSchema,
+    CutTransition,
+    CutBatchTransition,
+    CutBatchTransitionResult
+)
+from app.routers.auth import get_current_user, get_read_db
+
+router = APIRouter()
+
+
+def check_transition_permission(user: User, target: CutStatus) -> None:
+    """
+    QC decisions require role_level <= 5 (L5: PM, L4: Desk, L3: PD, L2: EP, L1: CEO)
+    """
+    decision = QC_DECISIONS.get(target)
+    if decision is not None and decision[1] != "pending" and user.role_level > 5:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Insufficient permissions to record QC decisions"
+        )
+
+
+def transition_values(target: CutStatus, user_id: int, at: datetime) -> dict:
+    """Column values written when a cut moves to `target`"""
+    values = {"status": target}
+
+    if target in QC_DECISIONS:
+        stage, decision = QC_DECISIONS[target]
+        values[f"qc{stage}_status"] = decision
+        if decision != "pending":
+            # Reviewer and time of the stage's latest decision
+            values[f"qc{stage}_approved_by"] = user_id
+            values[f"qc{stage}_approved_at"] = at
+
+    if target == CutStatus.qc1_pending:
+        values["submitted_at"] = at
+    elif target == CutStatus.completed:
+        values["completed_at"] = at
+    elif target == CutStatus.rework:
+        values["completed_at"] = None
+
+    return values
+
+
+async def episode_projects(db: AsyncSession, episode_ids) -> dict:
+    """episode_id -> project_id, for the change feed"""
+    rows = await db.execute(select(Episode.id, Episode.project_id).where(Episode.id.in_(set(episode_ids))))
+    return dict(rows.all())
+
+
+@router.get("/cuts", response_model=List[CutSchema])
+async def list_cuts(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from X-Next-Cursor (replaces skip)"),
+    episode_id: Optional[int] = None,
+    assigned_to: Optional[int] = None,
+    status: Optional[CutStatus] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    List cuts with optional filters
+
+    **Filters:**
+    - episode_id: Filter by episode
+    - assigned_to: Filter by assignee
+    - status: Filter by cut status (e.g. qc1_pending for a QC queue)
+    """
+    query = select(Cut)
+
+    if episode_id:
+        query = query.where(Cut.episode_id == episode_id)
+    if assigned_to:
+        query = query.where(Cut.assigned_to == assigned_to)
+    if status:
+        query = query.where(Cut.status == status)
+
+    query = query.order_by(desc(Cut.created_at), desc(Cut.id))
+    if cursor:
+        query = apply_cursor(query, Cut, cursor)
+    else:
+        query = query.offset(skip)
+
+    cuts = (await db.scalars(query.limit(limit))).all()
+    set_next_cursor(response, cuts, limit)
+
+    return cuts
+
+
+@router.get("/cuts/transitions")
+async def get_cut_transitions(
+    current_user: User = Depends(get_current_user)
+):
+    """Allowed cut status transitions: current status -> next statuses"""
+    return {
+        source.value: sorted(target.value for target in targets)
+        for source, targets in CUT_TRANSITIONS.items()
+    }
+
+
+@router.post("/cuts/transitions/batch", response_model=CutBatchTransitionResult)
+async def transition_cuts_batch(
+    batch: CutBatchTransition,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Apply one status decision to many cuts (e.g. a QC sitting)
+
+    Cuts whose current status allows the transition are moved with a
+    single UPDATE and one commit; episode and project progress is updated
+    in the same transaction. Every requested cut gets an outcome:
+    transitioned, not_found, invalid_transition or conflict.
+    """
+    check_transition_permission(current_user, batch.status)
+
+    cut_ids = list(dict.fromkeys(batch.cut_ids))
+    sources = cut_sources(batch.status)
+
+    # Lock the requested cuts so the statuses read here are the ones replaced
+    current = {
+        row.id: row
+        for row in (await db.execute(
+            select(Cut.id, Cut.episode_id, Cut.status)
+            .where(Cut.id.in_(cut_ids))
+            .with_for_update()
+        )).all()
+    }
+    eligible = [cut_id for cut_id in cut_ids if cut_id in current and current[cut_id].status in sources]
+
+    moved = set()
+    if eligible:
+        moved = set((await db.scalars(
+            update(Cut)
+            .where(Cut.id.in_(eligible), Cut.status.in_(sources))
+            .values(transition_values(batch.status, current_user.id, datetime.utcnow()))
+            .returning(Cut.id)
+            .execution_options(synchronize_session=False)
+        )).all())
+        await db.run_sync(
+            progress.record_status_changes,
+            [(current[cut_id].episode_id, current[cut_id].status, batch.status) for cut_id in moved]
+        )
+        await db.commit()
+
+    if moved:
+        changes.cuts_changed(
+            [(cut_id, current[cut_id].episode_id, current[cut_id].status) for cut_id in sorted(moved)],
+            batch.status,
+            await episode_projects(db, (current[cut_id].episode_id for cut_id in moved)),
+            current_user.id
+        )
+
+    outcomes = []
+    for cut_id in cut_ids:
+        row = current.get(cut_id)
+        if row is None:
+            outcomes.append({"cut_id": cut_id, "outcome": "not_found"})
+        elif cut_id in moved:
+            outcomes.append({"cut_id": cut_id, "outcome": "transitioned", "from_status": row.status})
+        elif row.status not in sources:
+            outcomes.append({"cut_id": cut_id, "outcome": "invalid_transition", "from_status": row.status})
+        else:
+            outcomes.append({"cut_id": cut_id, "outcome": "conflict", "from_status": row.status})
+
+    return {"status": batch.status, "transitioned": len(moved), "outcomes": outcomes}
+
+
+@router.get("/cuts/{cut_id}", response_model=CutSchema)
+async def get_cut(
+    cut_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get cut details"""
+    cut = await db.get(Cut, cut_id)
+
+    if not cut:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Cut {cut_id} not found"
+        )
+
+    return cut
+
+
+@router.post("/cuts/{cut_id}/transition", response_model=CutSchema)
+async def transition_cut(
+    cut_id: int,
+    transition: CutTransition,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Move one cut to a new status
+
+    See GET /cuts/transitions for the allowed transitions. QC approvals and
+    rejections require role_level <= 5.
+    """
+    check_transition_permission(current_user, transition.status)
+
+    cut = await db.get(Cut, cut_id)
+
+    if not cut:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Cut {cut_id} not found"
+        )
+
+    if transition.status not in CUT_TRANSITIONS.get(cut.status, ()):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot move cut from {cut.status.value} to {transition.status.value}"
+        )
+
+    previous_status = cut.status
+    for field, value in transition_values(transition.status, current_user.id, datetime.utcnow()).items():
+        setattr(cut, field, value)
+
+    await db.commit()
+    changes.cuts_changed(
+        [(cut.id, cut.episode_id, previous_status)],
+        cut.status,
+        await episode_projects(db, [cut.episode_id]),
+        current_user.id
+    )
+    await db.refresh(cut)
+
+    return cut
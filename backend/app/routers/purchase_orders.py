@@ -1,48 +1,76 @@
 """
 Purchase Orders router - Core order management API
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, status, Query, Header, Response, UploadFile
+from sqlalchemy import desc, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime
 from decimal import Decimal
-from app.core.database import get_db
-from app.models import PurchaseOrder, User, OrderStatus
+from app.core.concurrency import check_if_match, commit_versioned
+from app.core.database import get_db, reads_from_replica
+from app.core import changes
+from app.core.etags import etag_matches, make_etag, not_modified, row_etag, set_etag, version_query
+from app.core.export import export_response
+from app.core.fast_json import encode_row, encode_rows, fast_json_enabled, fast_json_response, schema_columns
+from app.core.imports import build_order_rows, import_format, run_import, store_upload
+from app.core.pagination import apply_cursor, set_next_cursor
+from app.core.projection import load_options, parse_expand, parse_fields, projected_response
+from app.core import rollups
+from app.core.sequences import document_numbers
+from app.models import PurchaseOrder, Project, Vendor, User, OrderStatus, ImportJob, ImportJobStatus
+from app.models.purchase_order import VAT_RATE, calculate_order_amounts, calculate_order_amounts_batch
 from app.schemas.purchase_order import (
     PurchaseOrderCreate,
+    PurchaseOrderBulkCreate,
+    PurchaseOrderBulkResult,
     PurchaseOrderUpdate,
     PurchaseOrder as PurchaseOrderSchema,
-    PurchaseOrderCalculation
+    PurchaseOrderCalculation,
+    PurchaseOrderBatchCalculationRequest,
+    PurchaseOrderBatchCalculation
 )
-from app.routers.auth import get_current_user
+from app.schemas.import_job import ImportJob as ImportJobSchema
+from app.schemas.reference import ProjectBrief, VendorBrief
+from app.schemas.settlement import SettlementBrief
+from app.routers.auth import get_current_user, get_read_db
 
 router = APIRouter()
 
+# Relationships available through expand=, with their embedded schemas
+ORDER_RELATIONS = {
+    "project": ProjectBrief,
+    "vendor": VendorBrief,
+    "settlements": SettlementBrief,
+}
 
-def generate_order_no(db: Session) -> str:
+
+async def generate_order_no(db: AsyncSession) -> str:
     """Generate unique order number: PO-YYYY-NNNN"""
-    from datetime import date
-    year = date.today().year
-    
-    # Get latest order number for this year
-    latest = db.query(PurchaseOrder).filter(
-        PurchaseOrder.order_no.like(f"PO-{year}-%")
-    ).order_by(desc(PurchaseOrder.order_no)).first()
-    
-    if latest:
-        last_num = int(latest.order_no.split("-")[2])
-        new_num = last_num + 1
-    else:
-        new_num = 1
-    
-    return f"PO-{year}-{new_num:04d}"
+    numbers = await document_numbers.allocate(db, "PO", seed_column=PurchaseOrder.order_no)
+    return numbers[0]
+
+
+def filter_purchase_orders(
+    query,
+    status: Optional[OrderStatus],
+    project_id: Optional[int],
+    vendor_id: Optional[int]
+):
+    """Apply the list filters shared by listing and export"""
+    if status:
+        query = query.where(PurchaseOrder.status == status)
+    if project_id:
+        query = query.where(PurchaseOrder.project_id == project_id)
+    if vendor_id:
+        query = query.where(PurchaseOrder.vendor_id == vendor_id)
+    return query
 
 
 @router.post("/orders", response_model=PurchaseOrderSchema, status_code=status.HTTP_201_CREATED)
 async def create_purchase_order(
     order_data: PurchaseOrderCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -56,7 +84,7 @@ async def create_purchase_order(
     5. net_amount = adjusted_amount + vat - withholding
     """
     # Generate order number
-    order_no = generate_order_no(db)
+    order_no = await generate_order_no(db)
     
     # Create order instance
     order = PurchaseOrder(
@@ -69,6 +97,7 @@ async def create_purchase_order(
         unit_price=order_data.unit_price,
         difficulty_rate=order_data.difficulty_rate,
         urgency_rate=order_data.urgency_rate,
+        vat_rate=VAT_RATE,  # Column default only applies on INSERT
         withholding_tax_rate=order_data.withholding_tax_rate,
         deadline=order_data.deadline,
         description=order_data.description,
@@ -83,20 +112,189 @@ async def create_purchase_order(
     
     # Save to database
     db.add(order)
-    db.commit()
-    db.refresh(order)
+    await db.commit()
+    changes.order_changed(order, None, current_user.id)
+    await db.refresh(order)
     
     return order
 
 
+@router.post("/orders/bulk", response_model=PurchaseOrderBulkResult, status_code=status.HTTP_201_CREATED)
+async def create_purchase_orders_bulk(
+    bulk_data: PurchaseOrderBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Create many purchase orders in one transaction
+    
+    Items are validated together (one query each for project and vendor
+    references), order numbers are allocated as one block, amounts are
+    computed in a single pass and all rows are written with one multi-row
+    INSERT. Created orders are returned in request order.
+    
+    **Modes:**
+    - all_or_nothing: any invalid item rejects the whole request (400)
+    - partial: invalid items are reported in `errors`, valid items are created
+    """
+    items = bulk_data.items
+    
+    # Validate references for the whole batch
+    known_projects = set((await db.scalars(
+        select(Project.id).where(Project.id.in_({item.project_id for item in items}))
+    )).all())
+    known_vendors = set((await db.scalars(
+        select(Vendor.id).where(Vendor.id.in_({item.vendor_id for item in items}))
+    )).all())
+    
+    errors = []
+    valid_items = []
+    for index, item in enumerate(items):
+        if item.project_id not in known_projects:
+            errors.append({"index": index, "detail": f"Project {item.project_id} not found"})
+        elif item.vendor_id not in known_vendors:
+            errors.append({"index": index, "detail": f"Vendor {item.vendor_id} not found"})
+        else:
+            valid_items.append(item)
+    
+    if errors and bulk_data.mode == "all_or_nothing":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"message": "Bulk order validation failed", "errors": errors}
+        )
+    
+    if not valid_items:
+        return {"created": [], "errors": errors}
+    
+    # Allocate numbers as one block and compute amounts in one pass
+    order_nos = await document_numbers.allocate(
+        db, "PO", count=len(valid_items), seed_column=PurchaseOrder.order_no
+    )
+    rows = build_order_rows(valid_items, order_nos, current_user.id, datetime.utcnow())
+    
+    # Multi-row INSERT ... RETURNING; bulk statements bypass flush events,
+    # so rollups are updated explicitly in the same transaction
+    created = (await db.scalars(
+        insert(PurchaseOrder).returning(PurchaseOrder, sort_by_parameter_order=True),
+        rows
+    )).all()
+    await db.run_sync(rollups.record_inserted, created)
+    await db.commit()
+    for order in created:
+        changes.order_changed(order, None, current_user.id)
+    
+    return {"created": created, "errors": errors}
+
+
+@router.post("/orders/imports", response_model=ImportJobSchema, status_code=status.HTTP_202_ACCEPTED)
+async def import_purchase_orders(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Import purchase orders from a CSV or XLSX sheet (legacy 발주서 migration)
+    
+    The header row names PurchaseOrderCreate fields (project_id, vendor_id,
+    process_type, quantity, unit_price, ...). The sheet is read as a
+    stream in the background: each row is validated, amounts are
+    recomputed with the order pricing rules, and valid rows are loaded in
+    batches (COPY on PostgreSQL). Invalid rows are reported on the job by
+    sheet row number and do not stop the import.
+    
+    Poll `GET /orders/imports/{job_id}` for progress.
+    """
+    file_format = import_format(file.filename)
+    if file_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only .csv and .xlsx files can be imported"
+        )
+    
+    job = ImportJob(
+        filename=file.filename,
+        file_path=await store_upload(file, file_format),
+        file_format=file_format,
+        created_by=current_user.id
+    )
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    
+    background_tasks.add_task(run_import, job.id)
+    return job
+
+
+@router.get("/orders/imports/{job_id}", response_model=ImportJobSchema)
+async def get_import_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get import job progress and row errors"""
+    job = await db.get(ImportJob, job_id)
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Import job {job_id} not found"
+        )
+    
+    return job
+
+
+@router.post("/orders/imports/{job_id}/resume", response_model=ImportJobSchema, status_code=status.HTTP_202_ACCEPTED)
+async def resume_import_job(
+    job_id: int,
+    background_tasks: BackgroundTasks,
+    force: bool = Query(False, description="Also take over a job left running by a stopped worker"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Resume a failed import after its last committed batch
+    
+    Rows already loaded are not imported again. Use force=true only for a
+    job whose worker died while it was running.
+    """
+    resumable = [ImportJobStatus.failed, ImportJobStatus.running] if force else [ImportJobStatus.failed]
+    result = await db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id, ImportJob.status.in_(resumable))
+        .values(status=ImportJobStatus.pending)
+    )
+    await db.commit()
+    
+    job = await db.get(ImportJob, job_id, populate_existing=True)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Import job {job_id} not found"
+        )
+    if result.rowcount == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot resume import job in {job.status.value} status"
+        )
+    
+    background_tasks.add_task(run_import, job.id)
+    return job
+
+
 @router.get("/orders", response_model=List[PurchaseOrderSchema])
 async def list_purchase_orders(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from X-Next-Cursor (replaces skip)"),
+    fields: Optional[str] = Query(None, description="Comma-separated response fields to return"),
+    expand: Optional[str] = Query(None, description="Comma-separated related records to embed: project, vendor, settlements"),
     status: Optional[OrderStatus] = None,
     project_id: Optional[int] = None,
     vendor_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -106,28 +304,115 @@ async def list_purchase_orders(
     - status: Filter by order status
     - project_id: Filter by project
     - vendor_id: Filter by vendor
+    
+    **Projection:**
+    - fields: Return only these fields (e.g. `fields=id,status,net_amount`)
+    - expand: Embed related records (project, vendor, settlements); each adds
+      one query per page regardless of page size
+    
+    **Pagination:**
+    - skip/limit: Offset pagination
+    - cursor: Keyset pagination; pass the X-Next-Cursor header of the
+      previous page to fetch the next one at constant cost
+    
+    **Caching:** Responses without expand= carry an ETag; send it back as
+    If-None-Match to get an empty 304 while nothing matching the filters
+    has changed.
+    
+    With FAST_JSON_RESPONSES, full rows (no fields= or expand=) are encoded
+    with orjson; the response body is the same.
     """
-    query = db.query(PurchaseOrder)
+    field_names = parse_fields(fields, PurchaseOrderSchema)
+    expand_names = parse_expand(expand, ORDER_RELATIONS)
+    
+    if not expand_names:
+        # Count and newest updated_at of the filtered rows change with any
+        # insert, update or delete that can affect this page
+        version = (await db.execute(filter_purchase_orders(version_query(PurchaseOrder), status, project_id, vendor_id))).one()
+        etag = make_etag("orders", skip, limit, cursor, field_names, status, project_id, vendor_id, *version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        set_etag(response, etag)
+    
+    fast = fast_json_enabled() and field_names is None and not expand_names
+    if fast:
+        query = select(*schema_columns(PurchaseOrder, PurchaseOrderSchema))
+    else:
+        query = select(PurchaseOrder).options(*load_options(PurchaseOrder, field_names, expand_names))
     
-    if status:
-        query = query.filter(PurchaseOrder.status == status)
-    if project_id:
-        query = query.filter(PurchaseOrder.project_id == project_id)
-    if vendor_id:
-        query = query.filter(PurchaseOrder.vendor_id == vendor_id)
+    query = filter_purchase_orders(query, status, project_id, vendor_id)
+    query = query.order_by(desc(PurchaseOrder.created_at), desc(PurchaseOrder.id))
+    if cursor:
+        query = apply_cursor(query, PurchaseOrder, cursor)
+    else:
+        query = query.offset(skip)
+    
+    if fast:
+        rows = (await db.execute(query.limit(limit))).all()
+        set_next_cursor(response, rows, limit)
+        return fast_json_response(encode_rows(rows, list(PurchaseOrderSchema.model_fields)), headers=dict(response.headers))
+    
+    orders = (await db.scalars(query.limit(limit))).all()
+    set_next_cursor(response, orders, limit)
     
-    orders = query.order_by(desc(PurchaseOrder.created_at)).offset(skip).limit(limit).all()
+    if field_names is not None or expand_names:
+        return projected_response(
+            orders, PurchaseOrderSchema, field_names, expand_names, ORDER_RELATIONS, headers=dict(response.headers)
+        )
     return orders
 
 
+@router.get("/orders/export")
+async def export_purchase_orders(
+    file_format: str = Query("csv", alias="format", pattern="^(csv|xlsx)$"),
+    status: Optional[OrderStatus] = None,
+    project_id: Optional[int] = None,
+    vendor_id: Optional[int] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Export purchase orders as CSV or XLSX
+    
+    Honors the same filters as the list endpoint. Rows are read through a
+    server-side cursor and streamed as they are encoded, so memory use does
+    not grow with the size of the export.
+    """
+    columns = list(PurchaseOrderSchema.model_fields)
+    query = select(*(getattr(PurchaseOrder, column) for column in columns))
+    query = filter_purchase_orders(query, status, project_id, vendor_id)
+    query = query.order_by(desc(PurchaseOrder.created_at), desc(PurchaseOrder.id))
+    
+    return export_response(query, columns, "purchase_orders", file_format, replica=reads_from_replica(current_user.id))
+
+
 @router.get("/orders/{order_id}", response_model=PurchaseOrderSchema)
 async def get_purchase_order(
     order_id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated response fields to return"),
+    expand: Optional[str] = Query(None, description="Comma-separated related records to embed: project, vendor, settlements"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get purchase order by ID"""
-    order = db.query(PurchaseOrder).filter(PurchaseOrder.id == order_id).first()
+    """
+    Get purchase order by ID
+    
+    Supports the same fields= and expand= projection, ETag caching and
+    fast JSON encoding as the list endpoint.
+    """
+    field_names = parse_fields(fields, PurchaseOrderSchema)
+    expand_names = parse_expand(expand, ORDER_RELATIONS)
+    
+    fast = fast_json_enabled() and field_names is None and not expand_names
+    if fast:
+        # version follows the schema columns: it feeds the ETag, encode_row leaves it out
+        columns = schema_columns(PurchaseOrder, PurchaseOrderSchema) + [PurchaseOrder.version]
+        order = (await db.execute(select(*columns).where(PurchaseOrder.id == order_id))).first()
+    else:
+        order = await db.get(
+            PurchaseOrder, order_id, options=load_options(PurchaseOrder, field_names, expand_names)
+        )
     
     if not order:
         raise HTTPException(
@@ -135,6 +420,19 @@ async def get_purchase_order(
             detail=f"Purchase order {order_id} not found"
         )
     
+    if not expand_names:
+        etag = row_etag(PurchaseOrder, order, field_names)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        set_etag(response, etag)
+    
+    if fast:
+        return fast_json_response(encode_row(order, list(PurchaseOrderSchema.model_fields)), headers=dict(response.headers))
+    
+    if field_names is not None or expand_names:
+        return projected_response(
+            order, PurchaseOrderSchema, field_names, expand_names, ORDER_RELATIONS, headers=dict(response.headers)
+        )
     return order
 
 
@@ -142,17 +440,26 @@ async def get_purchase_order(
 async def update_purchase_order(
     order_id: int,
     order_update: PurchaseOrderUpdate,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Update purchase order"""
-    order = db.query(PurchaseOrder).filter(PurchaseOrder.id == order_id).first()
+    """
+    Update purchase order
+    
+    Send the ETag of the order as If-Match to have the update rejected with
+    412 if someone else changed the order in the meantime. The response
+    carries the new ETag.
+    """
+    order = await db.get(PurchaseOrder, order_id)
     
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Purchase order {order_id} not found"
         )
+    check_if_match(if_match, PurchaseOrder, order)
     
     # Only allow updates if order is in draft or pending status
     if order.status not in [OrderStatus.draft, OrderStatus.pending]:
@@ -162,6 +469,7 @@ async def update_purchase_order(
         )
     
     # Update fields
+    previous_status = order.status
     update_data = order_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(order, field, value)
@@ -170,8 +478,11 @@ async def update_purchase_order(
     if any(k in update_data for k in ['quantity', 'unit_price', 'difficulty_rate', 'urgency_rate']):
         order.calculate_amounts()
     
-    db.commit()
-    db.refresh(order)
+    await commit_versioned(db, order, if_match)
+    if order.status != previous_status:
+        changes.order_changed(order, previous_status, current_user.id)
+    await db.refresh(order)
+    response.headers["ETag"] = row_etag(PurchaseOrder, order)
     
     return order
 
@@ -179,7 +490,7 @@ async def update_purchase_order(
 @router.post("/orders/{order_id}/approve", response_model=PurchaseOrderSchema)
 async def approve_purchase_order(
     order_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -193,7 +504,7 @@ async def approve_purchase_order(
             detail="Insufficient permissions to approve orders"
         )
     
-    order = db.query(PurchaseOrder).filter(PurchaseOrder.id == order_id).first()
+    order = await db.get(PurchaseOrder, order_id)
     
     if not order:
         raise HTTPException(
@@ -211,8 +522,9 @@ async def approve_purchase_order(
     order.approved_by = current_user.id
     order.approved_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(order)
+    await commit_versioned(db, order)
+    changes.order_changed(order, OrderStatus.pending, current_user.id)
+    await db.refresh(order)
     
     return order
 
@@ -220,11 +532,11 @@ async def approve_purchase_order(
 @router.post("/orders/{order_id}/cancel", response_model=PurchaseOrderSchema)
 async def cancel_purchase_order(
     order_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Cancel purchase order"""
-    order = db.query(PurchaseOrder).filter(PurchaseOrder.id == order_id).first()
+    order = await db.get(PurchaseOrder, order_id)
     
     if not order:
         raise HTTPException(
@@ -238,10 +550,12 @@ async def cancel_purchase_order(
             detail="Cannot cancel order in current status"
         )
     
+    previous_status = order.status
     order.status = OrderStatus.cancelled
     
-    db.commit()
-    db.refresh(order)
+    await commit_versioned(db, order)
+    changes.order_changed(order, previous_status, current_user.id)
+    await db.refresh(order)
     
     return order
 
@@ -260,24 +574,44 @@ async def calculate_order_amount(
     
     Useful for frontend to show calculated amounts before order creation
     """
-    vat_rate = Decimal("0.10")  # Fixed 10% VAT
+    vat_rate = VAT_RATE  # Fixed 10% VAT
     
-    base_amount = quantity * unit_price
-    adjusted_amount = base_amount * difficulty_rate * urgency_rate
-    vat_amount = adjusted_amount * vat_rate
-    withholding_tax = adjusted_amount * withholding_tax_rate
-    net_amount = adjusted_amount + vat_amount - withholding_tax
+    amounts = calculate_order_amounts(
+        quantity, unit_price, difficulty_rate, urgency_rate, vat_rate, withholding_tax_rate
+    )
     
     return {
         "quantity": quantity,
         "unit_price": unit_price,
-        "base_amount": base_amount,
         "difficulty_rate": difficulty_rate,
         "urgency_rate": urgency_rate,
-        "adjusted_amount": adjusted_amount,
         "vat_rate": vat_rate,
-        "vat_amount": vat_amount,
         "withholding_tax_rate": withholding_tax_rate,
-        "withholding_tax": withholding_tax,
-        "net_amount": net_amount
+        **amounts
     }
+
+
+@router.post("/orders/calculate/batch", response_model=PurchaseOrderBatchCalculation)
+async def calculate_order_amounts_in_batch(
+    batch: PurchaseOrderBatchCalculationRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Calculate order amounts for many pricing scenarios in one call
+    
+    Inputs and outputs are index-aligned arrays. Uses the same formula as
+    /orders/calculate and order creation, so results are identical to
+    pricing each scenario individually.
+    """
+    size = len(batch.quantity)
+    
+    amounts = calculate_order_amounts_batch(
+        batch.quantity,
+        batch.unit_price,
+        batch.difficulty_rate or [Decimal("1.0")] * size,
+        batch.urgency_rate or [Decimal("1.0")] * size,
+        [VAT_RATE] * size,
+        batch.withholding_tax_rate or [Decimal("0.033")] * size,
+    )
+    
+    return {"vat_rate": VAT_RATE, **amounts}
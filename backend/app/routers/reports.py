@@ -0,0 +1,112 @@
+"""
+Reports router - Finance dashboard reads answered from rollup tables
+"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import date
+from app.core.rollups import month_of
+from app.models import FinanceRollup, User
+from app.schemas.report import FinanceRollupRow, FinanceTotals
+from app.routers.auth import get_current_user, get_read_db
+
+router = APIRouter()
+
+# Summed rollup measures, labelled with their response field names
+SUMMED_MEASURES = [
+    func.sum(FinanceRollup.document_count).label("document_count"),
+    func.sum(FinanceRollup.net_amount).label("net_amount"),
+    func.sum(FinanceRollup.final_amount).label("final_amount"),
+    func.sum(FinanceRollup.vat_amount).label("vat_amount"),
+    func.sum(FinanceRollup.withholding_tax).label("withholding_tax"),
+]
+
+
+def filter_rollups(
+    query,
+    source: Optional[str],
+    project_id: Optional[int],
+    vendor_id: Optional[int],
+    period_from: Optional[date],
+    period_to: Optional[date],
+    status: Optional[str],
+    include_cancelled: bool,
+):
+    """Apply the shared report filters to a rollup query"""
+    if source:
+        query = query.where(FinanceRollup.source == source)
+    if project_id:
+        query = query.where(FinanceRollup.project_id == project_id)
+    if vendor_id:
+        query = query.where(FinanceRollup.vendor_id == vendor_id)
+    if period_from:
+        query = query.where(FinanceRollup.period >= month_of(period_from))
+    if period_to:
+        query = query.where(FinanceRollup.period <= month_of(period_to))
+    if status:
+        query = query.where(FinanceRollup.status == status)
+    elif not include_cancelled:
+        query = query.where(FinanceRollup.status != "cancelled")
+    return query
+
+
+@router.get("/reports/finance/monthly", response_model=List[FinanceRollupRow])
+async def get_monthly_finance(
+    source: Optional[str] = Query(None, pattern="^(order|settlement)$"),
+    project_id: Optional[int] = None,
+    vendor_id: Optional[int] = None,
+    period_from: Optional[date] = Query(None, description="First month to include"),
+    period_to: Optional[date] = Query(None, description="Last month to include"),
+    status: Optional[str] = None,
+    include_cancelled: bool = False,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Per-project, per-vendor, per-month totals
+    
+    Read from the finance rollup table, so cost depends on the number of
+    project/vendor/month combinations, not on the number of documents.
+    Cancelled documents are excluded unless include_cancelled or status is set.
+    """
+    query = select(
+        FinanceRollup.source,
+        FinanceRollup.project_id,
+        FinanceRollup.vendor_id,
+        FinanceRollup.period,
+        *SUMMED_MEASURES,
+    ).group_by(
+        FinanceRollup.source,
+        FinanceRollup.project_id,
+        FinanceRollup.vendor_id,
+        FinanceRollup.period,
+    ).order_by(
+        FinanceRollup.period,
+        FinanceRollup.source,
+        FinanceRollup.project_id,
+        FinanceRollup.vendor_id,
+    )
+    query = filter_rollups(query, source, project_id, vendor_id, period_from, period_to, status, include_cancelled)
+    
+    rows = (await db.execute(query)).mappings().all()
+    return rows
+
+
+@router.get("/reports/finance/totals", response_model=List[FinanceTotals])
+async def get_finance_totals(
+    project_id: Optional[int] = None,
+    vendor_id: Optional[int] = None,
+    period_from: Optional[date] = Query(None, description="First month to include"),
+    period_to: Optional[date] = Query(None, description="Last month to include"),
+    status: Optional[str] = None,
+    include_cancelled: bool = False,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Order and settlement totals across all matching rollup rows"""
+    query = select(FinanceRollup.source, *SUMMED_MEASURES).group_by(FinanceRollup.source)
+    query = filter_rollups(query, None, project_id, vendor_id, period_from, period_to, status, include_cancelled)
+    
+    rows = (await db.execute(query)).mappings().all()
+    return rows
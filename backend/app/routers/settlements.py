@@ -1,13 +1,22 @@
 """
 Settlements router - Payment processing API
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Response
+from sqlalchemy import desc, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
 from decimal import Decimal
-from app.core.database import get_db
+from app.core.concurrency import check_if_match, commit_versioned
+from app.core.database import get_db, reads_from_replica
+from app.core import changes
+from app.core.etags import etag_matches, make_etag, not_modified, row_etag, set_etag, version_query
+from app.core.export import export_response
+from app.core.fast_json import encode_row, encode_rows, fast_json_enabled, fast_json_response, schema_columns
+from app.core.pagination import apply_cursor, set_next_cursor
+from app.core.projection import load_options, parse_expand, parse_fields, projected_response
+from app.core.sequences import document_numbers
 from app.models import Settlement, PurchaseOrder, User, SettlementStatus, OrderStatus
 from app.schemas.settlement import (
     SettlementCreate,
@@ -15,34 +24,46 @@ from app.schemas.settlement import (
     Settlement as SettlementSchema,
     SettlementSummary
 )
-from app.routers.auth import get_current_user
+from app.schemas.purchase_order import PurchaseOrderBrief
+from app.schemas.reference import ProjectBrief, VendorBrief
+from app.routers.auth import get_current_user, get_read_db
 
 router = APIRouter()
 
+# Relationships available through expand=, with their embedded schemas
+SETTLEMENT_RELATIONS = {
+    "order": PurchaseOrderBrief,
+    "project": ProjectBrief,
+    "vendor": VendorBrief,
+}
 
-def generate_settlement_no(db: Session) -> str:
+
+async def generate_settlement_no(db: AsyncSession) -> str:
     """Generate unique settlement number: ST-YYYY-NNNN"""
-    from datetime import date
-    year = date.today().year
-    
-    # Get latest settlement number for this year
-    latest = db.query(Settlement).filter(
-        Settlement.settlement_no.like(f"ST-{year}-%")
-    ).order_by(desc(Settlement.settlement_no)).first()
-    
-    if latest:
-        last_num = int(latest.settlement_no.split("-")[2])
-        new_num = last_num + 1
-    else:
-        new_num = 1
-    
-    return f"ST-{year}-{new_num:04d}"
+    numbers = await document_numbers.allocate(db, "ST", seed_column=Settlement.settlement_no)
+    return numbers[0]
+
+
+def filter_settlements(
+    query,
+    status: Optional[SettlementStatus],
+    project_id: Optional[int],
+    vendor_id: Optional[int]
+):
+    """Apply the list filters shared by listing and export"""
+    if status:
+        query = query.where(Settlement.status == status)
+    if project_id:
+        query = query.where(Settlement.project_id == project_id)
+    if vendor_id:
+        query = query.where(Settlement.vendor_id == vendor_id)
+    return query
 
 
 @router.post("/settlements", response_model=SettlementSchema, status_code=status.HTTP_201_CREATED)
 async def create_settlement(
     settlement_data: SettlementCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -50,13 +71,12 @@ async def create_settlement(
     
     **Requirements:**
     - Purchase order must exist and be approved
+    - One settlement per order
     - Copies monetary amounts from purchase order
     - Calculates final amount with penalties/adjustments
     """
     # Get the purchase order
-    order = db.query(PurchaseOrder).filter(
-        PurchaseOrder.id == settlement_data.order_id
-    ).first()
+    order = await db.get(PurchaseOrder, settlement_data.order_id)
     
     if not order:
         raise HTTPException(
@@ -71,19 +91,8 @@ async def create_settlement(
             detail="Purchase order must be approved before settlement"
         )
     
-    # Check if settlement already exists for this order
-    existing = db.query(Settlement).filter(
-        Settlement.order_id == settlement_data.order_id
-    ).first()
-    
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Settlement already exists for this order"
-        )
-    
     # Generate settlement number
-    settlement_no = generate_settlement_no(db)
+    settlement_no = await generate_settlement_no(db)
     
     # Create settlement
     settlement = Settlement(
@@ -112,24 +121,46 @@ async def create_settlement(
     settlement.calculate_final_amount()
     
     # Update order status
+    previous_order_status = order.status
     order.status = OrderStatus.completed
     
-    # Save to database
+    # Save to database; uq_settlements_order_id rejects a second settlement
+    # for the same order, including one created concurrently; a concurrent
+    # change to the order is a 409
     db.add(settlement)
-    db.commit()
-    db.refresh(settlement)
+    try:
+        await commit_versioned(db, order)
+    except IntegrityError:
+        await db.rollback()
+        existing = await db.scalar(
+            select(Settlement.id).where(Settlement.order_id == settlement_data.order_id).limit(1)
+        )
+        if existing is None:
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Settlement already exists for this order"
+        )
+    changes.settlement_changed(settlement, None, current_user.id)
+    changes.order_changed(order, previous_order_status, current_user.id)
+    await db.refresh(settlement)
     
     return settlement
 
 
 @router.get("/settlements", response_model=List[SettlementSchema])
 async def list_settlements(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from X-Next-Cursor (replaces skip)"),
+    fields: Optional[str] = Query(None, description="Comma-separated response fields to return"),
+    expand: Optional[str] = Query(None, description="Comma-separated related records to embed: order, project, vendor"),
     status: Optional[SettlementStatus] = None,
     project_id: Optional[int] = None,
     vendor_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -139,28 +170,188 @@ async def list_settlements(
     - status: Filter by settlement status
     - project_id: Filter by project
     - vendor_id: Filter by vendor
+    
+    **Projection:**
+    - fields: Return only these fields (e.g. `fields=id,status,net_amount`)
+    - expand: Embed related records (order, project, vendor); each adds
+      one query per page regardless of page size
+    
+    **Pagination:**
+    - skip/limit: Offset pagination
+    - cursor: Keyset pagination; pass the X-Next-Cursor header of the
+      previous page to fetch the next one at constant cost
+    
+    **Caching:** Responses without expand= carry an ETag; send it back as
+    If-None-Match to get an empty 304 while nothing matching the filters
+    has changed.
+    
+    With FAST_JSON_RESPONSES, full rows (no fields= or expand=) are encoded
+    with orjson; the response body is the same.
+    """
+    field_names = parse_fields(fields, SettlementSchema)
+    expand_names = parse_expand(expand, SETTLEMENT_RELATIONS)
+    
+    if not expand_names:
+        # Count and newest updated_at of the filtered rows change with any
+        # insert, update or delete that can affect this page
+        version = (await db.execute(filter_settlements(version_query(Settlement), status, project_id, vendor_id))).one()
+        etag = make_etag("settlements", skip, limit, cursor, field_names, status, project_id, vendor_id, *version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        set_etag(response, etag)
+    
+    fast = fast_json_enabled() and field_names is None and not expand_names
+    if fast:
+        query = select(*schema_columns(Settlement, SettlementSchema))
+    else:
+        query = select(Settlement).options(*load_options(Settlement, field_names, expand_names))
+    
+    query = filter_settlements(query, status, project_id, vendor_id)
+    query = query.order_by(desc(Settlement.created_at), desc(Settlement.id))
+    if cursor:
+        query = apply_cursor(query, Settlement, cursor)
+    else:
+        query = query.offset(skip)
+    
+    if fast:
+        rows = (await db.execute(query.limit(limit))).all()
+        set_next_cursor(response, rows, limit)
+        return fast_json_response(encode_rows(rows, list(SettlementSchema.model_fields)), headers=dict(response.headers))
+    
+    settlements = (await db.scalars(query.limit(limit))).all()
+    set_next_cursor(response, settlements, limit)
+    
+    if field_names is not None or expand_names:
+        return projected_response(
+            settlements, SettlementSchema, field_names, expand_names, SETTLEMENT_RELATIONS, headers=dict(response.headers)
+        )
+    return settlements
+
+
+@router.get("/settlements/summary", response_model=SettlementSummary)
+async def get_settlements_summary(
+    response: Response,
+    status: Optional[SettlementStatus] = None,
+    project_id: Optional[int] = None,
+    vendor_id: Optional[int] = None,
+    date_from: Optional[date] = Query(None, description="Created on or after this date"),
+    date_to: Optional[date] = Query(None, description="Created on or before this date"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get settlement summary statistics for dashboard
+    
+    Returns counts and totals by status, computed in a single grouped
+    aggregate query that honors every filter.
+    
+    **Filters:**
+    - status: Filter by status (the other statuses report zero)
+    - project_id: Filter by project
+    - vendor_id: Filter by vendor
+    - date_from / date_to: Filter by creation date (inclusive)
+    
+    The ETag is a hash of the totals, so polling dashboards get an empty
+    304 until a figure changes.
     """
-    query = db.query(Settlement)
+    query = select(
+        Settlement.status,
+        func.count(Settlement.id),
+        func.coalesce(func.sum(Settlement.final_amount), 0),
+    ).group_by(Settlement.status)
     
     if status:
-        query = query.filter(Settlement.status == status)
+        query = query.where(Settlement.status == status)
     if project_id:
-        query = query.filter(Settlement.project_id == project_id)
+        query = query.where(Settlement.project_id == project_id)
     if vendor_id:
-        query = query.filter(Settlement.vendor_id == vendor_id)
+        query = query.where(Settlement.vendor_id == vendor_id)
+    if date_from:
+        query = query.where(Settlement.created_at >= datetime.combine(date_from, time.min))
+    if date_to:
+        query = query.where(Settlement.created_at < datetime.combine(date_to + timedelta(days=1), time.min))
+    
+    # One row per status present; statuses without settlements report zero
+    rows = (await db.execute(query)).all()
+    totals = {row_status: (count, Decimal(amount)) for row_status, count, amount in rows}
+    empty = (0, Decimal("0"))
+    by_status = {
+        settlement_status: totals.get(settlement_status, empty)
+        for settlement_status in SettlementStatus
+    }
     
-    settlements = query.order_by(desc(Settlement.created_at)).offset(skip).limit(limit).all()
-    return settlements
+    etag = make_etag("settlement-summary", status, project_id, vendor_id, date_from, date_to, by_status)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    return {
+        "total_settlements": sum(count for count, _ in by_status.values()),
+        "pending_count": by_status[SettlementStatus.pending][0],
+        "approved_count": by_status[SettlementStatus.approved][0],
+        "paid_count": by_status[SettlementStatus.paid][0],
+        "total_pending_amount": by_status[SettlementStatus.pending][1],
+        "total_approved_amount": by_status[SettlementStatus.approved][1],
+        "total_paid_amount": by_status[SettlementStatus.paid][1],
+        "by_status": [
+            {"status": settlement_status, "count": count, "total_amount": amount}
+            for settlement_status, (count, amount) in by_status.items()
+        ]
+    }
+
+
+@router.get("/settlements/export")
+async def export_settlements(
+    file_format: str = Query("csv", alias="format", pattern="^(csv|xlsx)$"),
+    status: Optional[SettlementStatus] = None,
+    project_id: Optional[int] = None,
+    vendor_id: Optional[int] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Export settlements as CSV or XLSX
+    
+    Honors the same filters as the list endpoint. Rows are read through a
+    server-side cursor and streamed as they are encoded, so memory use does
+    not grow with the size of the export.
+    """
+    columns = list(SettlementSchema.model_fields)
+    query = select(*(getattr(Settlement, column) for column in columns))
+    query = filter_settlements(query, status, project_id, vendor_id)
+    query = query.order_by(desc(Settlement.created_at), desc(Settlement.id))
+    
+    return export_response(query, columns, "settlements", file_format, replica=reads_from_replica(current_user.id))
 
 
 @router.get("/settlements/{settlement_id}", response_model=SettlementSchema)
 async def get_settlement(
     settlement_id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated response fields to return"),
+    expand: Optional[str] = Query(None, description="Comma-separated related records to embed: order, project, vendor"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get settlement by ID"""
-    settlement = db.query(Settlement).filter(Settlement.id == settlement_id).first()
+    """
+    Get settlement by ID
+    
+    Supports the same fields= and expand= projection, ETag caching and
+    fast JSON encoding as the list endpoint.
+    """
+    field_names = parse_fields(fields, SettlementSchema)
+    expand_names = parse_expand(expand, SETTLEMENT_RELATIONS)
+    
+    fast = fast_json_enabled() and field_names is None and not expand_names
+    if fast:
+        # version follows the schema columns: it feeds the ETag, encode_row leaves it out
+        columns = schema_columns(Settlement, SettlementSchema) + [Settlement.version]
+        settlement = (await db.execute(select(*columns).where(Settlement.id == settlement_id))).first()
+    else:
+        settlement = await db.get(
+            Settlement, settlement_id, options=load_options(Settlement, field_names, expand_names)
+        )
     
     if not settlement:
         raise HTTPException(
@@ -168,6 +359,19 @@ async def get_settlement(
             detail=f"Settlement {settlement_id} not found"
         )
     
+    if not expand_names:
+        etag = row_etag(Settlement, settlement, field_names)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        set_etag(response, etag)
+    
+    if fast:
+        return fast_json_response(encode_row(settlement, list(SettlementSchema.model_fields)), headers=dict(response.headers))
+    
+    if field_names is not None or expand_names:
+        return projected_response(
+            settlement, SettlementSchema, field_names, expand_names, SETTLEMENT_RELATIONS, headers=dict(response.headers)
+        )
     return settlement
 
 
@@ -175,17 +379,26 @@ async def get_settlement(
 async def update_settlement(
     settlement_id: int,
     settlement_update: SettlementUpdate,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Update settlement"""
-    settlement = db.query(Settlement).filter(Settlement.id == settlement_id).first()
+    """
+    Update settlement
+    
+    Send the ETag of the settlement as If-Match to have the update rejected
+    with 412 if someone else changed it in the meantime. The response
+    carries the new ETag.
+    """
+    settlement = await db.get(Settlement, settlement_id)
     
     if not settlement:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Settlement {settlement_id} not found"
         )
+    check_if_match(if_match, Settlement, settlement)
     
     # Only allow updates if settlement is pending or approved
     if settlement.status not in [SettlementStatus.pending, SettlementStatus.approved]:
@@ -195,6 +408,7 @@ async def update_settlement(
         )
     
     # Update fields
+    previous_status = settlement.status
     update_data = settlement_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(settlement, field, value)
@@ -203,8 +417,11 @@ async def update_settlement(
     if any(k in update_data for k in ['penalty_amount', 'adjustment_amount']):
         settlement.calculate_final_amount()
     
-    db.commit()
-    db.refresh(settlement)
+    await commit_versioned(db, settlement, if_match)
+    if settlement.status != previous_status:
+        changes.settlement_changed(settlement, previous_status, current_user.id)
+    await db.refresh(settlement)
+    response.headers["ETag"] = row_etag(Settlement, settlement)
     
     return settlement
 
@@ -212,7 +429,7 @@ async def update_settlement(
 @router.post("/settlements/{settlement_id}/complete", response_model=SettlementSchema)
 async def complete_settlement(
     settlement_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -226,7 +443,7 @@ async def complete_settlement(
             detail="Insufficient permissions to complete settlements"
         )
     
-    settlement = db.query(Settlement).filter(Settlement.id == settlement_id).first()
+    settlement = await db.get(Settlement, settlement_id)
     
     if not settlement:
         raise HTTPException(
@@ -245,57 +462,15 @@ async def complete_settlement(
     settlement.approved_by = current_user.id
     
     # Update related purchase order status
-    order = db.query(PurchaseOrder).filter(PurchaseOrder.id == settlement.order_id).first()
+    order = await db.get(PurchaseOrder, settlement.order_id)
     if order:
+        previous_order_status = order.status
         order.status = OrderStatus.settled
     
-    db.commit()
-    db.refresh(settlement)
+    await commit_versioned(db, settlement)
+    changes.settlement_changed(settlement, SettlementStatus.approved, current_user.id)
+    if order:
+        changes.order_changed(order, previous_order_status, current_user.id)
+    await db.refresh(settlement)
     
     return settlement
-
-
-@router.get("/settlements/summary", response_model=SettlementSummary)
-async def get_settlements_summary(
-    project_id: Optional[int] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """
-    Get settlement summary statistics for dashboard
-    
-    Returns counts and totals by status
-    """
-    query = db.query(Settlement)
-    
-    if project_id:
-        query = query.filter(Settlement.project_id == project_id)
-    
-    # Count by status
-    total_settlements = query.count()
-    pending_count = query.filter(Settlement.status == SettlementStatus.pending).count()
-    approved_count = query.filter(Settlement.status == SettlementStatus.approved).count()
-    paid_count = query.filter(Settlement.status == SettlementStatus.paid).count()
-    
-    # Sum amounts by status
-    pending_sum = db.query(func.sum(Settlement.final_amount)).filter(
-        Settlement.status == SettlementStatus.pending
-    ).scalar() or Decimal("0")
-    
-    approved_sum = db.query(func.sum(Settlement.final_amount)).filter(
-        Settlement.status == SettlementStatus.approved
-    ).scalar() or Decimal("0")
-    
-    paid_sum = db.query(func.sum(Settlement.final_amount)).filter(
-        Settlement.status == SettlementStatus.paid
-    ).scalar() or Decimal("0")
-    
-    return {
-        "total_settlements": total_settlements,
-        "pending_count": pending_count,
-        "approved_count": approved_count,
-        "paid_count": paid_count,
-        "total_pending_amount": pending_sum,
-        "total_approved_amount": approved_sum,
-        "total_paid_amount": paid_sum
-    }
@@ -0,0 +1,75 @@
+"""
+Cut schemas - Pydantic models for cut production and QC workflow
+"""
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+from decimal import Decimal
+from app.models.project import CutStatus, ProcessType
+
+
+class Cut(BaseModel):
+    """Schema for cut response"""
+    id: int
+    episode_id: int
+    cut_no: str
+    scene_no: Optional[str]
+    process_type: ProcessType
+    difficulty_level: Optional[Decimal]
+    assigned_to: Optional[int]
+    status: CutStatus
+    qc1_status: Optional[str]
+    qc1_approved_by: Optional[int]
+    qc1_approved_at: Optional[datetime]
+    qc2_status: Optional[str]
+    qc2_approved_by: Optional[int]
+    qc2_approved_at: Optional[datetime]
+    qc3_status: Optional[str]
+    qc3_approved_by: Optional[int]
+    qc3_approved_at: Optional[datetime]
+    submitted_at: Optional[datetime]
+    completed_at: Optional[datetime]
+    notes: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class CutTransition(BaseModel):
+    """Schema for moving one cut to a new status"""
+    status: CutStatus
+
+
+class CutBatchTransition(BaseModel):
+    """Schema for applying one status decision to many cuts"""
+    cut_ids: List[int] = Field(..., min_length=1, max_length=10000)
+    status: CutStatus
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "cut_ids": [101, 102, 103],
+                "status": "qc1_approved"
+            }
+        }
+
+
+class CutTransitionOutcome(BaseModel):
+    """
+    Result for one cut of a batch transition
+
+    outcome is one of: transitioned, not_found, invalid_transition,
+    conflict (the cut changed status while the batch was applied)
+    """
+    cut_id: int
+    outcome: str
+    from_status: Optional[CutStatus] = None
+
+
+class CutBatchTransitionResult(BaseModel):
+    """Schema for batch transition response"""
+    status: CutStatus
+    transitioned: int
+    outcomes: List[CutTransitionOutcome]
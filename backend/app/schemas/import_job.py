@@ -0,0 +1,35 @@
+"""
+Import job schemas - Pydantic models for spreadsheet order imports
+"""
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+from app.models.import_job import ImportJobStatus
+
+
+class ImportRowError(BaseModel):
+    """Validation error for one sheet row (row 1 is the header)"""
+    row: int
+    detail: str
+
+
+class ImportJob(BaseModel):
+    """Schema for import job response"""
+    id: int
+    filename: str
+    file_format: str
+    status: ImportJobStatus
+    last_row: int
+    processed_rows: int
+    imported_count: int
+    error_count: int
+    errors: List[ImportRowError]
+    last_error: Optional[str]
+    created_by: int
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
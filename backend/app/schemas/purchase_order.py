@@ -1,8 +1,8 @@
 """
 Purchase Order schemas - Pydantic models for order management
 """
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import Annotated, List, Optional
 from datetime import datetime, date
 from decimal import Decimal
 from app.models.purchase_order import OrderStatus
@@ -62,6 +62,37 @@ class PurchaseOrder(PurchaseOrderBase):
         from_attributes = True
 
 
+class PurchaseOrderBrief(BaseModel):
+    """Order fields shown next to settlements (expand=order)"""
+    id: int
+    order_no: str
+    process_type: str
+    quantity: int
+    net_amount: Decimal
+    status: OrderStatus
+    
+    class Config:
+        from_attributes = True
+
+
+class PurchaseOrderBulkCreate(BaseModel):
+    """Schema for creating many purchase orders in one request"""
+    items: List[PurchaseOrderCreate] = Field(..., min_length=1, max_length=10000)
+    mode: str = Field(default="all_or_nothing", pattern="^(all_or_nothing|partial)$")
+
+
+class BulkItemError(BaseModel):
+    """Validation error for one item of a bulk request"""
+    index: int
+    detail: str
+
+
+class PurchaseOrderBulkResult(BaseModel):
+    """Schema for bulk purchase order creation response"""
+    created: List[PurchaseOrder]
+    errors: List[BulkItemError]
+
+
 class PurchaseOrderCalculation(BaseModel):
     """Schema for order calculation preview"""
     quantity: int
@@ -92,3 +123,43 @@ class PurchaseOrderCalculation(BaseModel):
                 "net_amount": "960300.00"
             }
         }
+
+
+# Element constraints for batch pricing columns (same bounds as /orders/calculate)
+Quantity = Annotated[int, Field(gt=0)]
+UnitPrice = Annotated[Decimal, Field(gt=0)]
+DifficultyRate = Annotated[Decimal, Field(ge=Decimal("1.0"), le=Decimal("2.0"))]
+UrgencyRate = Annotated[Decimal, Field(ge=Decimal("1.0"), le=Decimal("1.5"))]
+WithholdingTaxRate = Annotated[Decimal, Field(ge=Decimal("0"), le=Decimal("0.1"))]
+
+
+class PurchaseOrderBatchCalculationRequest(BaseModel):
+    """
+    Schema for batch pricing: one array per input, priced index by index
+    
+    Omitted rate arrays use the /orders/calculate defaults for every row.
+    """
+    quantity: List[Quantity] = Field(..., min_length=1, max_length=100000)
+    unit_price: List[UnitPrice]
+    difficulty_rate: Optional[List[DifficultyRate]] = None
+    urgency_rate: Optional[List[UrgencyRate]] = None
+    withholding_tax_rate: Optional[List[WithholdingTaxRate]] = None
+    
+    @model_validator(mode="after")
+    def check_lengths(self):
+        size = len(self.quantity)
+        for name in ("unit_price", "difficulty_rate", "urgency_rate", "withholding_tax_rate"):
+            column = getattr(self, name)
+            if column is not None and len(column) != size:
+                raise ValueError(f"{name} must have the same length as quantity ({size})")
+        return self
+
+
+class PurchaseOrderBatchCalculation(BaseModel):
+    """Schema for batch pricing results, index-aligned with the request arrays"""
+    vat_rate: Decimal
+    base_amount: List[Decimal]
+    adjusted_amount: List[Decimal]
+    vat_amount: List[Decimal]
+    withholding_tax: List[Decimal]
+    net_amount: List[Decimal]
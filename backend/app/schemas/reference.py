@@ -0,0 +1,30 @@
+"""
+Reference schemas - Compact representations of related records for expand=
+"""
+from pydantic import BaseModel
+from typing import Optional
+from app.models.project import ProjectStatus
+from app.models.vendor import VendorType
+
+
+class ProjectBrief(BaseModel):
+    """Project fields shown next to orders and settlements"""
+    id: int
+    project_no: str
+    name: str
+    name_jp: Optional[str]
+    status: ProjectStatus
+    
+    class Config:
+        from_attributes = True
+
+
+class VendorBrief(BaseModel):
+    """Vendor fields shown next to orders and settlements"""
+    id: int
+    name: str
+    name_jp: Optional[str]
+    type: VendorType
+    
+    class Config:
+        from_attributes = True
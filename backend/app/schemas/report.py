@@ -0,0 +1,44 @@
+"""
+Report schemas - Pydantic models for finance rollup reads
+"""
+from pydantic import BaseModel
+from datetime import date
+from decimal import Decimal
+
+
+class FinanceRollupRow(BaseModel):
+    """Totals for one source, project, vendor and month"""
+    source: str
+    project_id: int
+    vendor_id: int
+    period: date
+    document_count: int
+    net_amount: Decimal
+    final_amount: Decimal
+    vat_amount: Decimal
+    withholding_tax: Decimal
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "source": "settlement",
+                "project_id": 1,
+                "vendor_id": 2,
+                "period": "2026-02-01",
+                "document_count": 12,
+                "net_amount": "11523600.00",
+                "final_amount": "11400000.00",
+                "vat_amount": "1080000.00",
+                "withholding_tax": "356400.00"
+            }
+        }
+
+
+class FinanceTotals(BaseModel):
+    """Totals for one source across all matching rollup rows"""
+    source: str
+    document_count: int
+    net_amount: Decimal
+    final_amount: Decimal
+    vat_amount: Decimal
+    withholding_tax: Decimal
@@ -2,7 +2,7 @@
 Settlement schemas - Pydantic models for settlement processing
 """
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime, date
 from decimal import Decimal
 from app.models.settlement import SettlementStatus
@@ -61,6 +61,25 @@ class Settlement(SettlementBase):
         from_attributes = True
 
 
+class SettlementBrief(BaseModel):
+    """Settlement fields shown next to orders (expand=settlements)"""
+    id: int
+    settlement_no: str
+    final_amount: Decimal
+    status: SettlementStatus
+    completed_at: Optional[datetime]
+    
+    class Config:
+        from_attributes = True
+
+
+class SettlementStatusTotal(BaseModel):
+    """Count and final amount total for one settlement status"""
+    status: SettlementStatus
+    count: int
+    total_amount: Decimal
+
+
 class SettlementSummary(BaseModel):
     """Schema for settlement dashboard summary"""
     total_settlements: int
@@ -70,6 +89,7 @@ class SettlementSummary(BaseModel):
     total_pending_amount: Decimal
     total_approved_amount: Decimal
     total_paid_amount: Decimal
+    by_status: List[SettlementStatusTotal]
     
     class Config:
         json_schema_extra = {
@@ -80,6 +100,13 @@ class SettlementSummary(BaseModel):
                 "paid_count": 115,
                 "total_pending_amount": "45000000.00",
                 "total_approved_amount": "15000000.00",
-                "total_paid_amount": "230000000.00"
+                "total_paid_amount": "230000000.00",
+                "by_status": [
+                    {"status": "pending", "count": 25, "total_amount": "45000000.00"},
+                    {"status": "approved", "count": 10, "total_amount": "15000000.00"},
+                    {"status": "paid", "count": 115, "total_amount": "230000000.00"},
+                    {"status": "disputed", "count": 0, "total_amount": "0.00"},
+                    {"status": "cancelled", "count": 0, "total_amount": "0.00"}
+                ]
             }
         }
@@ -0,0 +1,73 @@
+"""
+Batch pricing throughput benchmark
+Prices N scenarios three ways and reports scenarios/sec: the pricing
+function in-process, POST /orders/calculate/batch in one call, and
+POST /orders/calculate once per scenario (the budgeting tool's old path).
+
+Usage: python benchmarks/batch_pricing.py [--scenarios N] [--single N]
+--single sets how many scenarios the per-scenario baseline prices.
+"""
+import argparse
+import random
+import time
+from decimal import Decimal
+
+import common
+import httpx
+
+from app.models.purchase_order import VAT_RATE, calculate_order_amounts_batch
+
+
+def scenarios(count: int) -> dict:
+    """Index-aligned pricing inputs, as the batch endpoint takes them"""
+    rng = random.Random(0)
+    return {
+        "quantity": [rng.randint(1, 300) for _ in range(count)],
+        "unit_price": [f"{rng.randint(100, 50000)}.{rng.randint(0, 99):02d}" for _ in range(count)],
+        "difficulty_rate": [f"{rng.choice(['1.0', '1.2', '1.5', '2.0'])}" for _ in range(count)],
+        "urgency_rate": [f"{rng.choice(['1.0', '1.25', '1.5'])}" for _ in range(count)],
+        "withholding_tax_rate": [f"{rng.choice(['0', '0.033', '0.1'])}" for _ in range(count)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", type=int, default=50_000)
+    parser.add_argument("--single", type=int, default=500)
+    args = parser.parse_args()
+
+    inputs = scenarios(args.scenarios)
+    rows = []
+
+    decimals = {name: [Decimal(value) for value in values] for name, values in inputs.items() if name != "quantity"}
+    started = time.perf_counter()
+    calculate_order_amounts_batch(
+        inputs["quantity"], decimals["unit_price"], decimals["difficulty_rate"], decimals["urgency_rate"],
+        [VAT_RATE] * args.scenarios, decimals["withholding_tax_rate"],
+    )
+    elapsed = time.perf_counter() - started
+    rows.append(["calculate_order_amounts_batch", args.scenarios, f"{elapsed:.3f}", f"{args.scenarios / elapsed:,.0f}"])
+
+    with common.serve(PRINCIPAL_CACHE_TTL_SECONDS="600") as base, httpx.Client(base_url=base, timeout=600) as http:
+        headers = common.login(base)
+        http.post("/api/v1/orders/calculate/batch", json=scenarios(10), headers=headers).raise_for_status()  # Warm-up
+
+        started = time.perf_counter()
+        response = http.post("/api/v1/orders/calculate/batch", json=inputs, headers=headers)
+        elapsed = time.perf_counter() - started
+        response.raise_for_status()
+        assert len(response.json()["net_amount"]) == args.scenarios
+        rows.append(["POST /orders/calculate/batch", args.scenarios, f"{elapsed:.3f}", f"{args.scenarios / elapsed:,.0f}"])
+
+        started = time.perf_counter()
+        for i in range(args.single):
+            params = {name: values[i] for name, values in inputs.items()}
+            http.post("/api/v1/orders/calculate", params=params, headers=headers).raise_for_status()
+        elapsed = time.perf_counter() - started
+        rows.append(["POST /orders/calculate x N", args.single, f"{elapsed:.3f}", f"{args.single / elapsed:,.0f}"])
+
+    common.table(["path", "scenarios", "seconds", "scenarios/s"], rows, title="Order pricing")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Bulk order creation benchmark
+Times POST /orders/bulk for 1k and 10k orders (one request, one
+transaction each) against creating orders one by one through POST /orders.
+
+Usage: python benchmarks/bulk_create.py [--sizes 1000,10000] [--single N] [--mode all_or_nothing|partial]
+--single sets how many orders the one-by-one baseline creates (its rate
+does not depend on the total).
+"""
+import argparse
+import time
+
+import common
+import httpx
+
+
+def order_items(count: int, ids: dict) -> list:
+    return [
+        {
+            "project_id": ids["project_id"], "vendor_id": ids["vendor_ids"][i % len(ids["vendor_ids"])],
+            "process_type": ("genga", "douga")[i % 2], "quantity": 1 + i % 40, "unit_price": "1500",
+            "difficulty_rate": "1.2", "withholding_tax_rate": "0.1" if i % 3 == 0 else "0",
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000")
+    parser.add_argument("--single", type=int, default=200)
+    parser.add_argument("--mode", choices=["all_or_nothing", "partial"], default="all_or_nothing")
+    args = parser.parse_args()
+
+    ids = common.sample_ids()
+    rows = []
+    with common.serve(PRINCIPAL_CACHE_TTL_SECONDS="600") as base, httpx.Client(base_url=base, timeout=600) as http:
+        headers = common.login(base)
+        # Warm-up: compile the statements and open the pool
+        http.post("/api/v1/orders/bulk", json={"items": order_items(10, ids)}, headers=headers).raise_for_status()
+
+        started = time.perf_counter()
+        for item in order_items(args.single, ids):
+            http.post("/api/v1/orders", json=item, headers=headers).raise_for_status()
+        elapsed = time.perf_counter() - started
+        rows.append(["POST /orders x N", args.single, f"{elapsed:.2f}", f"{args.single / elapsed:,.0f}"])
+
+        for size in (int(value) for value in args.sizes.split(",")):
+            body = {"items": order_items(size, ids), "mode": args.mode}
+            started = time.perf_counter()
+            response = http.post("/api/v1/orders/bulk", json=body, headers=headers)
+            elapsed = time.perf_counter() - started
+            response.raise_for_status()
+            created = len(response.json()["created"])
+            rows.append(["POST /orders/bulk", created, f"{elapsed:.2f}", f"{created / elapsed:,.0f}"])
+
+    common.table(["request", "orders", "seconds", "orders/s"], rows, title=f"Order creation (bulk mode {args.mode})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Shared helpers for the benchmark scripts
+
+The scripts run against DATABASE_URL / DATABASE_MODE like the app does;
+the database must be migrated and seeded first (python init_db.py). Use
+a scratch database: benchmarks leave the rows they create behind.
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+import httpx
+from sqlalchemy import func, select
+
+from app.core.database import SessionLocal, ensure_engines
+from app.models import Organization, Project, ProjectType, PurchaseOrder, User, Vendor
+
+# Seeded by init_db.py
+EMAIL = "pd@recess-studio.jp"
+PASSWORD = "password123"
+
+# Base URL -> uvicorn process of the servers serve() is running
+_servers: Dict[str, subprocess.Popen] = {}
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+@contextmanager
+def serve(workers: int = 1, backend: str = BACKEND, **env: str) -> Iterator[str]:
+    """
+    Run uvicorn on app.main:app in a subprocess and yield its base URL
+
+    `env` overrides settings for the server only (e.g. DATABASE_MODE="sync").
+    `backend` serves another checkout, for before/after comparisons. Slow
+    query logging is off unless `env` turns it back on.
+    """
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning", "--ws-ping-interval", "0"],
+        cwd=backend, env={**os.environ, "SLOW_QUERY_THRESHOLD_MS": "0", **env},
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(300):
+            try:
+                httpx.get(f"{base}/health")
+                break
+            except httpx.ConnectError:
+                if process.poll() is not None:
+                    raise RuntimeError("uvicorn exited during startup")
+                time.sleep(0.1)
+        else:
+            raise RuntimeError("uvicorn did not start")
+        _servers[base] = process
+        yield base
+    finally:
+        _servers.pop(base, None)
+        process.terminate()
+        process.wait()
+
+
+def _cpu_ticks(pid: int) -> int:
+    # utime + stime (fields 14 and 15 of /proc/<pid>/stat; the name in field 2 may hold spaces)
+    with open(f"/proc/{pid}/stat") as stat:
+        fields = stat.read().rsplit(")", 1)[1].split()
+    return int(fields[11]) + int(fields[12])
+
+
+def server_cpu_seconds(base: str) -> float:
+    """
+    CPU seconds used so far by the server serve() started at `base`
+
+    Counts the uvicorn process and its live worker processes. Reads /proc,
+    so it is Linux only.
+    """
+    pid = _servers[base].pid
+    ticks = _cpu_ticks(pid)
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat:
+                parent = int(stat.read().rsplit(")", 1)[1].split()[1])
+            if parent == pid:
+                ticks += _cpu_ticks(int(entry))
+        except (OSError, ValueError):
+            continue  # exited while we looked
+    return ticks / CLOCK_TICKS
+
+
+def login(base: str, email: str = EMAIL, password: str = PASSWORD) -> dict:
+    """Authorization headers for a seeded user"""
+    response = httpx.post(f"{base}/api/v1/auth/login", data={"username": email, "password": password}, timeout=60)
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def sample_ids() -> dict:
+    """Lowest existing user/vendor ids and a project to create orders in (added if there is none)"""
+    ensure_engines()
+    db = SessionLocal()
+    try:
+        user_id = db.scalar(select(func.min(User.id)))
+        vendor_ids = list(db.scalars(select(Vendor.id).order_by(Vendor.id).limit(2)))
+        if user_id is None or not vendor_ids:
+            raise SystemExit("No users or vendors: run python init_db.py first")
+
+        project_id = db.scalar(select(func.min(Project.id)))
+        if project_id is None:
+            project = Project(
+                project_no="PRJ-BENCH-001", name="Benchmark", type=ProjectType.TVA,
+                client_org_id=db.scalar(select(func.min(Organization.id))), created_by=user_id,
+            )
+            db.add(project)
+            db.commit()
+            project_id = project.id
+        return {"user_id": user_id, "vendor_ids": vendor_ids, "project_id": project_id}
+    finally:
+        db.close()
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def latency_summary(seconds: List[float]) -> str:
+    """p50/p99/max of request latencies, in milliseconds"""
+    return (
+        f"p50 {percentile(seconds, 0.5) * 1000:.1f} ms, p99 {percentile(seconds, 0.99) * 1000:.1f} ms, "
+        f"max {max(seconds) * 1000:.1f} ms"
+    )
+
+
+def table(header: Sequence[str], rows: Sequence[Sequence], title: Optional[str] = None) -> None:
+    """Print rows as an aligned text table"""
+    cells = [[str(value) for value in row] for row in [header, *rows]]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(header))]
+    if title:
+        print(title)
+    for number, row in enumerate(cells):
+        print("  ".join(value.rjust(width) for value, width in zip(row, widths)))
+        if number == 0:
+            print("  ".join("-" * width for width in widths))
+
+
+def ensure_orders(base: str, headers: dict, count: int) -> None:
+    """Create draft orders through POST /orders/bulk until the database holds at least `count`"""
+    ensure_engines()
+    db = SessionLocal()
+    try:
+        existing = db.scalar(select(func.count(PurchaseOrder.id)))
+    finally:
+        db.close()
+
+    ids = sample_ids()
+    missing = count - existing
+    while missing > 0:
+        items = [
+            {
+                "project_id": ids["project_id"], "vendor_id": ids["vendor_ids"][i % len(ids["vendor_ids"])],
+                "process_type": "genga", "quantity": 1 + i % 40, "unit_price": "1500",
+            }
+            for i in range(min(missing, 1000))
+        ]
+        response = httpx.post(f"{base}/api/v1/orders/bulk", json={"items": items}, headers=headers, timeout=300)
+        response.raise_for_status()
+        missing -= len(items)
+
+
+async def run_load(
+    request: Callable[[httpx.AsyncClient], Awaitable[httpx.Response]],
+    concurrency: int,
+    seconds: float,
+) -> Tuple[List[float], int, float]:
+    """
+    Send `request` from `concurrency` clients back to back for `seconds`
+
+    Returns the latencies of the successful responses, the number of
+    failed ones (5xx, e.g. pool timeouts under overload, and 429s from
+    load shedding) and the seconds until the last response arrived, which
+    is what rates should be divided by. Other client errors mean the
+    benchmark itself is wrong and are raised.
+    """
+    latencies = []
+    failures = 0
+    started_at = time.perf_counter()
+    deadline = started_at + seconds
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+
+    async with httpx.AsyncClient(timeout=120, limits=limits) as http:
+        async def client() -> None:
+            nonlocal failures
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                response = await request(http)
+                if response.status_code >= 500 or response.status_code == 429:
+                    failures += 1
+                    continue
+                if response.status_code >= 400:
+                    raise RuntimeError(f"{response.status_code}: {response.text[:200]}")
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, failures, time.perf_counter() - started_at
+
+
+async def poll_health(base: str, seconds: float, interval: float = 0.05) -> List[float]:
+    """Latencies of GET /health polled every `interval` for `seconds` (event loop responsiveness)"""
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    async with httpx.AsyncClient(timeout=120) as http:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            (await http.get(f"{base}/health")).raise_for_status()
+            latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(interval)
+    return latencies
@@ -0,0 +1,68 @@
+"""
+Response compression benchmark
+Fetches order list pages and the CSV export with each Accept-Encoding and
+reports the bytes on the wire and the server CPU per request; the CPU
+above the identity row is the cost of compressing. Levels come from the
+environment like the app's (COMPRESSION_GZIP_LEVEL, COMPRESSION_BROTLI_QUALITY,
+COMPRESSION_ZSTD_LEVEL), so runs with different values pick the defaults.
+
+Usage: python benchmarks/compression.py [--requests N] [--limit N]
+"""
+import argparse
+
+import common
+import httpx
+
+ENCODINGS = ["identity", "gzip", "br", "zstd"]
+
+
+def measure(base: str, http: httpx.Client, path: str, encoding: str, requests: int) -> tuple:
+    """(wire bytes, server CPU ms per request), or None when the server did not use `encoding`"""
+    headers = {"Accept-Encoding": encoding}
+    with http.stream("GET", path, headers=headers) as response:
+        response.raise_for_status()
+        if response.headers.get("Content-Encoding", "identity") != encoding:
+            return None
+        response.read()
+
+    size = 0
+    cpu_before = common.server_cpu_seconds(base)
+    for _ in range(requests):
+        with http.stream("GET", path, headers=headers) as response:
+            size = sum(len(chunk) for chunk in response.iter_raw())
+    return size, (common.server_cpu_seconds(base) - cpu_before) / requests * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--limit", type=int, default=500, help="page size of the largest list page")
+    args = parser.parse_args()
+
+    rows = []
+    with common.serve() as base:
+        headers = common.login(base)
+        common.ensure_orders(base, headers, args.limit)
+        with httpx.Client(base_url=f"{base}/api/v1", headers=headers, timeout=300) as http:
+            for path in [f"/orders?limit={args.limit}", "/orders?limit=100", "/orders/export?format=csv"]:
+                identity = None
+                for encoding in ENCODINGS:
+                    result = measure(base, http, path, encoding, args.requests)
+                    if result is None:
+                        rows.append([path, encoding, "not available", "", "", ""])
+                        continue
+                    size, cpu = result
+                    identity = identity or result
+                    rows.append([
+                        path, encoding, f"{size:,}", f"{identity[0] / size:.1f}x",
+                        f"{cpu:.1f}", f"{cpu - identity[1]:+.1f}",
+                    ])
+
+    common.table(
+        ["GET", "encoding", "wire bytes", "ratio", "cpu ms", "vs identity"],
+        rows, title=f"{args.requests} requests each",
+    )
+
+
+if __name__ == "__main__":
+    main()
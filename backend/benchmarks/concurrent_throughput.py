@@ -0,0 +1,63 @@
+"""
+Concurrent request throughput benchmark
+Serves the app with uvicorn in each DATABASE_MODE and sends GET /orders
+(100-row pages) from many concurrent clients, while one more client polls
+/health to show whether the event loop stays responsive.
+
+Usage: python benchmarks/concurrent_throughput.py [--modes async,sync] [--concurrency N] [--seconds N]
+                                                  [--backend DIR]
+--backend serves another checkout (e.g. a git worktree of a revision from
+before the async database layer) on the same database for a before/after
+comparison; its mode label is then "DIR:mode".
+"""
+import argparse
+import asyncio
+
+import common
+
+
+async def measure(base: str, headers: dict, concurrency: int, seconds: float) -> tuple:
+    """(list latencies, failed list requests, elapsed seconds, /health latencies) under load"""
+    def page(http):
+        return http.get(f"{base}/api/v1/orders", params={"limit": 100}, headers=headers)
+
+    (latencies, failures, elapsed), health = await asyncio.gather(
+        common.run_load(page, concurrency, seconds), common.poll_health(base, seconds)
+    )
+    return latencies, failures, elapsed, health
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modes", default="async,sync")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--orders", type=int, default=1000, help="Orders to have in the database first")
+    parser.add_argument("--backend", default=common.BACKEND)
+    args = parser.parse_args()
+
+    with common.serve(PRINCIPAL_CACHE_TTL_SECONDS="600") as base:
+        common.ensure_orders(base, common.login(base), args.orders)
+
+    results = []
+    for mode in args.modes.split(","):
+        with common.serve(backend=args.backend, DATABASE_MODE=mode, PRINCIPAL_CACHE_TTL_SECONDS="600") as base:
+            headers = common.login(base)
+            asyncio.run(measure(base, headers, args.concurrency, 2))  # Warm-up
+            latencies, failures, elapsed, health = asyncio.run(measure(base, headers, args.concurrency, args.seconds))
+
+        label = mode if args.backend == common.BACKEND else f"{args.backend}:{mode}"
+        results.append([
+            label, len(latencies), failures, f"{len(latencies) / elapsed:.1f}",
+            f"{common.percentile(latencies, 0.5) * 1000:.1f}", f"{common.percentile(latencies, 0.99) * 1000:.1f}",
+            f"{common.percentile(health, 0.99) * 1000:.1f}",
+        ])
+
+    common.table(
+        ["mode", "requests", "failed", "req/s", "p50 ms", "p99 ms", "/health p99 ms"], results,
+        title=f"GET /orders?limit=100, {args.concurrency} concurrent clients, {args.seconds:.0f}s",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Conditional GET polling benchmark
+A client polls unchanged order and settlement resources, once fetching
+them in full every time and once sending back the ETag it got as
+If-None-Match. Reports bytes received (status line, headers and body)
+and server CPU per poll, read from /proc for the uvicorn process.
+
+Usage: python benchmarks/conditional_polling.py [--polls N] [--limit N]
+"""
+import argparse
+
+import common
+import httpx
+
+
+def response_bytes(response: httpx.Response) -> int:
+    """Bytes of the HTTP/1.1 response as sent: status line, headers and body"""
+    head = len(f"HTTP/1.1 {response.status_code} {response.reason_phrase}\r\n") + 2
+    head += sum(len(name) + len(value) + 4 for name, value in response.headers.raw)
+    return head + len(response.content)
+
+
+def poll(base: str, http: httpx.Client, path: str, polls: int, conditional: bool) -> tuple:
+    """(bytes per poll, server CPU ms per poll, status of the last poll) over `polls` GETs of `path`"""
+    etag = http.get(path).headers.get("ETag")
+    if conditional and etag is None:
+        raise RuntimeError(f"{path} sent no ETag")
+    headers = {"If-None-Match": etag} if conditional else {}
+
+    received = 0
+    cpu_before = common.server_cpu_seconds(base)
+    for _ in range(polls):
+        response = http.get(path, headers=headers)
+        if response.status_code not in (200, 304):
+            raise RuntimeError(f"{response.status_code}: {response.text[:200]}")
+        received += response_bytes(response)
+    cpu = common.server_cpu_seconds(base) - cpu_before
+    return received / polls, cpu / polls * 1000, response.status_code
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--polls", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=500, help="page size of the list polls")
+    args = parser.parse_args()
+
+    with common.serve() as base:
+        headers = common.login(base)
+        common.ensure_orders(base, headers, args.limit)
+        with httpx.Client(base_url=f"{base}/api/v1", headers=headers, timeout=120) as http:
+            order_id = http.get("/orders", params={"limit": 1}).json()[0]["id"]
+            paths = [f"/orders?limit={args.limit}", f"/orders/{order_id}", "/settlements?limit=500", "/settlements/summary"]
+
+            rows = []
+            for path in paths:
+                full_bytes, full_cpu, _ = poll(base, http, path, args.polls, conditional=False)
+                cached_bytes, cached_cpu, status = poll(base, http, path, args.polls, conditional=True)
+                rows.append([
+                    path, f"{full_bytes:,.0f}", f"{cached_bytes:,.0f}", status,
+                    f"{full_cpu:.2f}", f"{cached_cpu:.2f}", f"{full_bytes / cached_bytes:.0f}x",
+                ])
+
+    common.table(
+        ["GET", "bytes full", "bytes 304", "status", "cpu ms full", "cpu ms 304", "full/304"],
+        rows, title=f"{args.polls} polls per resource, nothing changing in between",
+    )
+
+
+if __name__ == "__main__":
+    main()
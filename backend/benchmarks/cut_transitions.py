@@ -0,0 +1,94 @@
+"""
+Cut transition throughput benchmark
+Creates an episode of N cuts (default 10k) and walks all of them through
+QC with POST /cuts/transitions/batch, one request per status, reporting
+transitions/sec per step. A second episode is moved one cut per request
+through POST /cuts/{id}/transition for comparison.
+
+Usage: python benchmarks/cut_transitions.py [--cuts N] [--batch-size N] [--single N]
+"""
+import argparse
+import time
+
+import common
+import httpx
+from sqlalchemy import func, insert, select
+
+from app.core.database import SessionLocal
+from app.core.progress import recompute_progress
+from app.models import Cut, CutStatus, Episode, ProcessType
+
+# Every QC stage approved, in order
+QC_PATH = [
+    CutStatus.in_progress, CutStatus.qc1_pending, CutStatus.qc1_approved, CutStatus.qc2_pending,
+    CutStatus.qc2_approved, CutStatus.qc3_pending, CutStatus.qc3_approved, CutStatus.completed,
+]
+
+
+def new_episode(project_id: int, cuts: int) -> list:
+    """Ids of `cuts` assigned cuts in a new episode of the project"""
+    db = SessionLocal()
+    try:
+        episode_no = (db.scalar(select(func.max(Episode.episode_no)).where(Episode.project_id == project_id)) or 0) + 1
+        episode = Episode(project_id=project_id, episode_no=episode_no, name=f"Benchmark {episode_no}")
+        db.add(episode)
+        db.flush()
+        db.execute(insert(Cut), [
+            {"episode_id": episode.id, "cut_no": f"C{i + 1:05d}", "process_type": ProcessType.genga,
+             "status": CutStatus.assigned}
+            for i in range(cuts)
+        ])
+        # Core INSERTs skip the counter listeners
+        recompute_progress(db)
+        db.commit()
+        return list(db.scalars(select(Cut.id).where(Cut.episode_id == episode.id).order_by(Cut.id)))
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cuts", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=10_000, help="Cuts per batch request (at most 10000)")
+    parser.add_argument("--single", type=int, default=200)
+    args = parser.parse_args()
+
+    ids = common.sample_ids()
+    cut_ids = new_episode(ids["project_id"], args.cuts)
+    single_ids = new_episode(ids["project_id"], args.single)
+
+    rows = []
+    with common.serve(PRINCIPAL_CACHE_TTL_SECONDS="600") as base, httpx.Client(base_url=base, timeout=600) as http:
+        headers = common.login(base)
+
+        total_started = time.perf_counter()
+        for status in QC_PATH:
+            started = time.perf_counter()
+            moved = 0
+            for start in range(0, len(cut_ids), args.batch_size):
+                response = http.post("/api/v1/cuts/transitions/batch", headers=headers, json={
+                    "cut_ids": cut_ids[start:start + args.batch_size], "status": status.value,
+                })
+                response.raise_for_status()
+                moved += response.json()["transitioned"]
+            elapsed = time.perf_counter() - started
+            rows.append([f"batch -> {status.value}", moved, f"{elapsed:.2f}", f"{moved / elapsed:,.0f}"])
+        total = time.perf_counter() - total_started
+        transitions = len(cut_ids) * len(QC_PATH)
+        rows.append(["batch, whole QC path", transitions, f"{total:.2f}", f"{transitions / total:,.0f}"])
+
+        started = time.perf_counter()
+        for cut_id in single_ids:
+            response = http.post(f"/api/v1/cuts/{cut_id}/transition", json={"status": "in_progress"}, headers=headers)
+            response.raise_for_status()
+        elapsed = time.perf_counter() - started
+        rows.append(["one cut per request", len(single_ids), f"{elapsed:.2f}", f"{len(single_ids) / elapsed:,.0f}"])
+
+    common.table(
+        ["transition", "cuts", "seconds", "cuts/s"], rows,
+        title=f"{args.cuts} cuts, batches of {args.batch_size}",
+    )
+
+
+if __name__ == "__main__":
+    main()
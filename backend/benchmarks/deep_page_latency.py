@@ -0,0 +1,68 @@
+"""
+Deep page latency benchmark
+Times GET /orders for page 1 and page N (default 1000) with keyset
+cursors, and page N with skip= for comparison. With the cursor, page N
+costs the same index range scan as page 1; with skip= the database reads
+and discards every row before it.
+
+Usage: python benchmarks/deep_page_latency.py [--page N] [--limit N] [--repeat N]
+Creates orders first until page N exists (page * limit of them).
+"""
+import argparse
+import time
+
+import common
+import httpx
+
+from app.core.pagination import NEXT_CURSOR_HEADER
+
+
+def timed(http: httpx.Client, url: str, params: dict, headers: dict, repeat: int) -> list:
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        http.get(url, params=params, headers=headers).raise_for_status()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with common.serve(PRINCIPAL_CACHE_TTL_SECONDS="600") as base:
+        headers = common.login(base)
+        common.ensure_orders(base, headers, args.page * args.limit)
+        url = f"{base}/api/v1/orders"
+
+        with httpx.Client(timeout=120) as http:
+            # Walk the cursors to page N
+            cursor = None
+            for _ in range(args.page - 1):
+                params = {"limit": args.limit, **({"cursor": cursor} if cursor else {})}
+                cursor = http.get(url, params=params, headers=headers).headers[NEXT_CURSOR_HEADER]
+
+            cases = [
+                ("page 1", {"limit": args.limit}),
+                (f"page {args.page} (cursor)", {"limit": args.limit, "cursor": cursor}),
+                (f"page {args.page} (skip)", {"limit": args.limit, "skip": (args.page - 1) * args.limit}),
+            ]
+            for _, params in cases:
+                timed(http, url, params, headers, 3)  # Warm-up
+
+            rows = []
+            for label, params in cases:
+                latencies = timed(http, url, params, headers, args.repeat)
+                rows.append([
+                    label, f"{common.percentile(latencies, 0.5) * 1000:.1f}",
+                    f"{common.percentile(latencies, 0.99) * 1000:.1f}",
+                ])
+
+    common.table(["request", "p50 ms", "p99 ms"], rows, title=f"GET /orders?limit={args.limit}, {args.repeat} requests each")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Import throughput benchmark
+Generates an order sheet and runs the import job on it in-process, then
+reports rows per second. Rows load with COPY on PostgreSQL (asyncpg in
+DATABASE_MODE=async, psycopg2 in sync) and with executemany elsewhere.
+
+Usage: python benchmarks/import_throughput.py [--rows N] [--format csv|xlsx] [--batch-size N]
+"""
+import argparse
+import asyncio
+import csv
+import os
+import tempfile
+import time
+
+import common
+from openpyxl import Workbook
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.imports import run_import
+from app.models import ImportJob
+
+HEADER = ["project_id", "vendor_id", "process_type", "quantity", "unit_price", "difficulty_rate", "deadline", "notes"]
+
+
+def sheet_rows(rows: int, project_id: int, vendor_ids: list):
+    for i in range(rows):
+        yield [
+            project_id, vendor_ids[i % len(vendor_ids)], ("genga", "douga")[i % 2], 1 + i % 40,
+            f"{1000 + i % 500}.50", "1.2" if i % 3 == 0 else "", "2026-12-24" if i % 2 else "", f"row {i}",
+        ]
+
+
+def write_sheet(path: str, file_format: str, rows: int, ids: dict) -> None:
+    data = sheet_rows(rows, ids["project_id"], ids["vendor_ids"])
+    if file_format == "csv":
+        with open(path, "w", newline="", encoding="utf-8") as target:
+            writer = csv.writer(target)
+            writer.writerow(HEADER)
+            writer.writerows(data)
+        return
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(HEADER)
+    for row in data:
+        sheet.append(row)
+    workbook.save(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--format", choices=["csv", "xlsx"], default="csv")
+    parser.add_argument("--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    ids = common.sample_ids()
+    settings.IMPORT_BATCH_SIZE = args.batch_size
+    path = os.path.join(tempfile.mkdtemp(prefix="recess-bench-"), f"orders.{args.format}")
+
+    started = time.perf_counter()
+    write_sheet(path, args.format, args.rows, ids)
+    print(f"Wrote {args.rows} rows to {path} in {time.perf_counter() - started:.1f}s")
+
+    db = SessionLocal()
+    try:
+        job = ImportJob(filename=os.path.basename(path), file_path=path, file_format=args.format, created_by=ids["user_id"])
+        db.add(job)
+        db.commit()
+        job_id = job.id
+    finally:
+        db.close()
+
+    started = time.perf_counter()
+    asyncio.run(run_import(job_id))
+    elapsed = time.perf_counter() - started
+
+    db = SessionLocal()
+    try:
+        job = db.get(ImportJob, job_id)
+        print(f"Job {job_id}: {job.status.value}, {job.imported_count} imported, {job.error_count} errors")
+        if job.last_error:
+            print(f"  {job.last_error}")
+    finally:
+        db.close()
+
+    common.table(
+        ["database", "mode", "format", "batch", "rows", "seconds", "rows/s"],
+        [[settings.DATABASE_URL.split(":", 1)[0], settings.DATABASE_MODE, args.format, args.batch_size,
+          job.imported_count, f"{elapsed:.2f}", f"{job.imported_count / elapsed:,.0f}"]],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+List serialization benchmark
+Encodes order rows in-process the way FastAPI does by default (validate
+through PurchaseOrderSchema from_attributes, dump, json.dumps) and the way
+FAST_JSON_RESPONSES does (column rows straight to orjson), checks the
+bytes are identical and reports rows per second. Then times GET /orders
+end to end with the setting off and on.
+
+Usage: python benchmarks/json_serialization.py [--rows N] [--limit N] [--requests N]
+"""
+import argparse
+import json
+import time
+from typing import List
+
+import common
+import httpx
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.core.fast_json import encode_rows, orjson, schema_columns
+from app.models import PurchaseOrder
+from app.schemas.purchase_order import PurchaseOrder as PurchaseOrderSchema
+
+
+def rows_per_second(encode, rows: int, seconds: float = 3.0) -> float:
+    calls = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        encode()
+        calls += 1
+    return calls * rows / (time.perf_counter() - started)
+
+
+def encoders(rows: int) -> dict:
+    """Encoder name -> zero-argument function encoding the first `rows` orders"""
+    db = SessionLocal()
+    try:
+        orders = db.scalars(select(PurchaseOrder).order_by(PurchaseOrder.id).limit(rows)).all()
+        column_rows = db.execute(
+            select(*schema_columns(PurchaseOrder, PurchaseOrderSchema)).order_by(PurchaseOrder.id).limit(rows)
+        ).all()
+    finally:
+        db.close()
+
+    adapter = TypeAdapter(List[PurchaseOrderSchema])
+    names = list(PurchaseOrderSchema.model_fields)
+
+    def default():
+        # fastapi.routing.serialize_response followed by JSONResponse.render
+        content = adapter.dump_python(adapter.validate_python(orders, from_attributes=True), mode="json")
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+    def fast():
+        return encode_rows(column_rows, names)
+
+    if default() != fast():
+        raise RuntimeError("orjson output differs from the default encoder")
+    return {"schema + json": default, "rows + orjson": fast}
+
+
+def request_rows_per_second(limit: int, requests: int, fast: bool) -> tuple:
+    with common.serve(FAST_JSON_RESPONSES=str(fast).lower()) as base:
+        headers = common.login(base)
+        with httpx.Client(base_url=f"{base}/api/v1", headers=headers, timeout=120) as http:
+            for _ in range(5):
+                http.get("/orders", params={"limit": limit}).raise_for_status()
+            started = time.perf_counter()
+            for _ in range(requests):
+                http.get("/orders", params={"limit": limit}).raise_for_status()
+            elapsed = time.perf_counter() - started
+    return elapsed / requests * 1000, requests * limit / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500, help="rows per in-process encode")
+    parser.add_argument("--limit", type=int, default=500, help="page size of the GET /orders requests")
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+    if orjson is None:
+        raise SystemExit("orjson is not installed")
+
+    with common.serve() as base:
+        common.ensure_orders(base, common.login(base), max(args.rows, args.limit))
+
+    results = {name: rows_per_second(encode, args.rows) for name, encode in encoders(args.rows).items()}
+    baseline = results["schema + json"]
+    common.table(
+        ["encoder", "rows/s", "speedup"],
+        [[name, f"{rate:,.0f}", f"{rate / baseline:.1f}x"] for name, rate in results.items()],
+        title=f"Encoding {args.rows} orders in-process (byte-identical output)",
+    )
+    print()
+
+    common.table(
+        ["FAST_JSON_RESPONSES", "ms/request", "rows/s"],
+        [
+            [str(fast).lower(), f"{ms:.1f}", f"{rate:,.0f}"]
+            for fast in (False, True)
+            for ms, rate in [request_rows_per_second(args.limit, args.requests, fast)]
+        ],
+        title=f"GET /orders?limit={args.limit}, {args.requests} requests",
+    )
+
+
+if __name__ == "__main__":
+    main()
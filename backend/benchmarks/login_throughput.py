@@ -0,0 +1,56 @@
+"""
+Login throughput benchmark
+Serves the app with each PASSWORD_HASH_WORKERS setting and sends
+POST /auth/login (one bcrypt verification each) from many concurrent
+clients, reporting logins/sec, 429s from the saturated pool and /health
+latency during the storm.
+
+Usage: python benchmarks/login_throughput.py [--workers 1,4,16] [--concurrency N] [--seconds N] [--max-queue N]
+bcrypt releases the GIL, so logins/sec grows with the workers up to the
+host's CPU count.
+"""
+import argparse
+import asyncio
+
+import common
+
+
+async def measure(base: str, concurrency: int, seconds: float) -> tuple:
+    """(login latencies, rejected logins, elapsed seconds, /health latencies) under load"""
+    def login(http):
+        return http.post(f"{base}/api/v1/auth/login", data={"username": common.EMAIL, "password": common.PASSWORD})
+
+    (latencies, rejected, elapsed), health = await asyncio.gather(
+        common.run_load(login, concurrency, seconds), common.poll_health(base, seconds)
+    )
+    return latencies, rejected, elapsed, health
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", default="1,4,16")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--max-queue", type=int, default=64, help="PASSWORD_HASH_MAX_QUEUE")
+    args = parser.parse_args()
+
+    results = []
+    for workers in (int(value) for value in args.workers.split(",")):
+        with common.serve(PASSWORD_HASH_WORKERS=str(workers), PASSWORD_HASH_MAX_QUEUE=str(args.max_queue)) as base:
+            asyncio.run(measure(base, workers, 2))  # Warm-up
+            latencies, rejected, elapsed, health = asyncio.run(measure(base, args.concurrency, args.seconds))
+
+        results.append([
+            workers, len(latencies), rejected, f"{len(latencies) / elapsed:.1f}",
+            f"{common.percentile(latencies, 0.5) * 1000:.0f}", f"{common.percentile(latencies, 0.99) * 1000:.0f}",
+            f"{common.percentile(health, 0.99) * 1000:.1f}",
+        ])
+
+    common.table(
+        ["workers", "logins", "429s", "logins/s", "p50 ms", "p99 ms", "/health p99 ms"], results,
+        title=f"POST /auth/login, {args.concurrency} concurrent clients, {args.seconds:.0f}s",
+    )
+
+
+if __name__ == "__main__":
+    main()
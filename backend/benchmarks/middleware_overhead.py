@@ -0,0 +1,90 @@
+"""
+Metrics middleware overhead benchmark
+Calls the application in-process (ASGI, no sockets or HTTP client) with
+and without RequestMetricsMiddleware and reports microseconds per
+request. "noop" replaces it with a pass-through middleware: the cost any
+middleware layer has, against which the metrics work itself is measured.
+
+Usage: python benchmarks/middleware_overhead.py [--requests N] [--rounds N] [--path /]
+Rounds alternate between the apps so drift in the host affects all alike.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import common
+
+from app.core.metrics import RequestMetricsMiddleware
+from app.main import create_app
+
+
+class PassThrough:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        await self.app(scope, receive, send)
+
+
+def build(middleware):
+    """The app with RequestMetricsMiddleware replaced by `middleware` (None removes it)"""
+    app = create_app()
+    app.user_middleware = [entry for entry in app.user_middleware if entry.cls is not RequestMetricsMiddleware]
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+async def per_request(app, path: str, requests: int) -> float:
+    """Microseconds per GET `path` sent straight to the ASGI app"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"", "headers": [],
+        "server": ("bench", 80), "client": ("bench", 1),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+async def run(path: str, requests: int, rounds: int) -> dict:
+    apps = {"bare": build(None), "noop": build(PassThrough), "metrics": build(RequestMetricsMiddleware)}
+    for app in apps.values():
+        await per_request(app, path, 500)  # Warm-up; builds the middleware stack
+    timings = {name: [] for name in apps}
+    for _ in range(rounds):
+        for name, app in apps.items():
+            timings[name].append(await per_request(app, path, requests))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--path", default="/")
+    args = parser.parse_args()
+
+    timings = asyncio.run(run(args.path, args.requests, args.rounds))
+    bare = statistics.median(timings["bare"])
+    common.table(
+        ["app", "min us", "median us", "vs bare us"],
+        [
+            [name, f"{min(values):.1f}", f"{statistics.median(values):.1f}", f"{statistics.median(values) - bare:+.1f}"]
+            for name, values in timings.items()
+        ],
+        title=f"GET {args.path}, {args.rounds} rounds of {args.requests} requests",
+    )
+
+
+if __name__ == "__main__":
+    main()
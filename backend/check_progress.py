@@ -0,0 +1,40 @@
+"""
+Production progress consistency check
+Compares stored episode/project cut counters with a recount; exits 1 on drift.
+Safe to run on a schedule (read-only); repair with rebuild_progress.py.
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import SessionLocal, ensure_engines
+from app.core.progress import find_drift
+
+
+def main() -> int:
+    """Report counter drift; returns the process exit code"""
+    ensure_engines()
+    db = SessionLocal()
+    
+    try:
+        drift = find_drift(db)
+    finally:
+        db.close()
+    
+    if not drift:
+        print("✓ Progress counters are consistent")
+        return 0
+    
+    for row in drift:
+        print(
+            f"✗ {row['scope']} {row['id']}: stored total/completed {row['stored']}, "
+            f"counted {row['counted']}"
+        )
+    print(f"\n{len(drift)} inconsistent counters; run rebuild_progress.py to repair")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
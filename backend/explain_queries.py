@@ -0,0 +1,98 @@
+"""
+Query plan report
+Prints EXPLAIN ANALYZE (PostgreSQL) or EXPLAIN QUERY PLAN (SQLite) for the
+hot list/filter queries, to confirm they use the composite indexes.
+
+Usage: python explain_queries.py [--project-id N] [--vendor-id N] [--episode-id N] [--user-id N]
+Sample ids default to the lowest existing id of each table.
+"""
+import sys
+import os
+import argparse
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import desc, func, select, text
+from app.core.database import SessionLocal, ensure_engines
+from app.models import (
+    PurchaseOrder, OrderStatus,
+    Settlement, SettlementStatus,
+    Episode, Cut, CutStatus,
+    Project, Vendor, User
+)
+
+
+def hot_queries(project_id, vendor_id, episode_id, user_id, order_id):
+    """(label, statement) for each query the list endpoints run most"""
+    def newest_first(query, model):
+        return query.order_by(desc(model.created_at), desc(model.id)).limit(100)
+
+    return [
+        ("orders by project + status", newest_first(
+            select(PurchaseOrder).where(PurchaseOrder.project_id == project_id, PurchaseOrder.status == OrderStatus.approved),
+            PurchaseOrder,
+        )),
+        ("orders by vendor + status", newest_first(
+            select(PurchaseOrder).where(PurchaseOrder.vendor_id == vendor_id, PurchaseOrder.status == OrderStatus.pending),
+            PurchaseOrder,
+        )),
+        ("settlements by project + status", newest_first(
+            select(Settlement).where(Settlement.project_id == project_id, Settlement.status == SettlementStatus.pending),
+            Settlement,
+        )),
+        ("settlements by vendor + status", newest_first(
+            select(Settlement).where(Settlement.vendor_id == vendor_id, Settlement.status == SettlementStatus.approved),
+            Settlement,
+        )),
+        ("settlement of an order", select(Settlement.id).where(Settlement.order_id == order_id)),
+        ("settlement summary for a project", select(
+            Settlement.status, func.count(Settlement.id), func.sum(Settlement.final_amount)
+        ).where(Settlement.project_id == project_id).group_by(Settlement.status)),
+        ("QC queue of an episode", select(Cut).where(Cut.episode_id == episode_id, Cut.status == CutStatus.qc1_pending)),
+        ("worklist of an assignee", select(Cut).where(Cut.assigned_to == user_id, Cut.status == CutStatus.in_progress)),
+        ("cuts by status, newest first", newest_first(select(Cut).where(Cut.status == CutStatus.qc2_pending), Cut)),
+        ("episodes of a project", select(Episode).where(Episode.project_id == project_id)),
+    ]
+
+
+def main():
+    """Print the plan of every hot query"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--project-id", type=int)
+    parser.add_argument("--vendor-id", type=int)
+    parser.add_argument("--episode-id", type=int)
+    parser.add_argument("--user-id", type=int)
+    args = parser.parse_args()
+
+    ensure_engines()
+    db = SessionLocal()
+
+    try:
+        def sample(model, given):
+            return given if given is not None else (db.scalar(select(func.min(model.id))) or 1)
+
+        queries = hot_queries(
+            project_id=sample(Project, args.project_id),
+            vendor_id=sample(Vendor, args.vendor_id),
+            episode_id=sample(Episode, args.episode_id),
+            user_id=sample(User, args.user_id),
+            order_id=sample(PurchaseOrder, None),
+        )
+
+        dialect = db.get_bind().dialect
+        prefix = "EXPLAIN (ANALYZE, BUFFERS)" if dialect.name == "postgresql" else "EXPLAIN QUERY PLAN"
+
+        for label, statement in queries:
+            sql = str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+            print(f"\n=== {label} ===")
+            for row in db.execute(text(f"{prefix} {sql}")):
+                # PostgreSQL returns one text column; SQLite returns (id, parent, notused, detail)
+                print(row[-1])
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 """
 Database initialization script
-Creates tables and seeds initial data
+Applies migrations (alembic upgrade head) and seeds initial data
 """
 import sys
 import os
@@ -9,7 +9,10 @@ from decimal import Decimal
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.core.database import engine, SessionLocal, Base
+from alembic import command
+from alembic.config import Config
+from app.core import progress, rollups
+from app.core.database import SessionLocal, ensure_engines
 from app.core.security import get_password_hash
 from app.models import (
     User, UserStatus,
@@ -18,15 +21,24 @@ from app.models import (
 )
 
 
+# Alembic configuration next to this script
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
+
+
 def create_tables():
-    """Create all database tables"""
-    print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    print("✓ Tables created successfully")
+    """Create or upgrade all database tables through the migrations"""
+    print("Applying database migrations...")
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "alembic"))
+    command.upgrade(config, "head")
+    print("✓ Database schema is up to date")
 
 
 def seed_data():
     """Seed initial data"""
+    ensure_engines()
+    rollups.register_listeners()
+    progress.register_listeners()
     db = SessionLocal()
     
     try:
@@ -0,0 +1,34 @@
+"""
+Production progress rebuild script
+Recounts episode and project cut counters from the cuts table (repair)
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import SessionLocal, ensure_engines
+from app.core.progress import recompute_progress
+
+
+def main():
+    """Recompute all progress counters in a single transaction"""
+    ensure_engines()
+    db = SessionLocal()
+    
+    try:
+        print("Recounting cut progress...")
+        episodes, projects = recompute_progress(db)
+        db.commit()
+        print(f"✓ {episodes} episodes and {projects} projects updated")
+    except Exception as e:
+        print(f"\n✗ Error recounting progress: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
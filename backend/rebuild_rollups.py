@@ -0,0 +1,34 @@
+"""
+Finance rollup rebuild script
+Recomputes finance_rollups from purchase_orders and settlements (backfill / repair)
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import SessionLocal, ensure_engines
+from app.core.rollups import rebuild_rollups
+
+
+def main():
+    """Rebuild all finance rollups in a single transaction"""
+    ensure_engines()
+    db = SessionLocal()
+    
+    try:
+        print("Rebuilding finance rollups...")
+        rows = rebuild_rollups(db)
+        db.commit()
+        print(f"✓ {rows} rollup rows written")
+    except Exception as e:
+        print(f"\n✗ Error rebuilding rollups: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
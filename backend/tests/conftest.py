@@ -0,0 +1,112 @@
+"""
+Test fixtures - a migrated, seeded SQLite database and an app client per database mode
+"""
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+# Point the global settings at a throwaway database before the app is imported
+DATABASE_FILE = os.path.join(tempfile.mkdtemp(prefix="recess-tests-"), "recess.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASE_FILE}"
+os.environ.setdefault("ENVIRONMENT", "test")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import init_db
+from app.core import database as database_module
+from app.core.config import Settings
+from app.main import create_app
+from app.models import Project
+
+PASSWORD = "password123"
+
+
+def pytest_addoption(parser):
+    parser.addoption("--runslow", action="store_true", help="Also run tests marked slow (full-size runs)")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: full-size run, skipped unless --runslow is given")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--runslow"):
+        return
+    skip = pytest.mark.skip(reason="full-size run; use --runslow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def database():
+    """Migrated database with the init_db seed data and one project"""
+    init_db.create_tables()
+    init_db.seed_data()
+
+    db = init_db.SessionLocal()
+    project = Project(project_no="PRJ-2026-001", name="Test", client_org_id=1, type="TVA", created_by=1)
+    db.add(project)
+    db.commit()
+    db.close()
+    return DATABASE_FILE
+
+
+@pytest.fixture(params=["async", "sync"])
+def client(request, database):
+    """TestClient of an app using the requested DATABASE_MODE"""
+    config = Settings(DATABASE_URL=f"sqlite:///{database}", DATABASE_MODE=request.param)
+    with TestClient(create_app(config), raise_server_exceptions=False) as test_client:
+        yield test_client
+
+
+def login(client, email: str = "pd@recess-studio.jp") -> dict:
+    """Authorization headers for a seeded user"""
+    response = client.post("/api/v1/auth/login", data={"username": email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@contextmanager
+def count_statements():
+    """Collect the SQL statements the app's engines execute while the block runs"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engines = [database_module.engine]
+    if database_module.async_engine is not None:
+        engines.append(database_module.async_engine.sync_engine)
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", record)
+
+
+def selects(statements: list) -> list:
+    return [statement for statement in statements if statement.lstrip().upper().startswith("SELECT")]
+
+
+def create_order(client, headers, **values) -> dict:
+    """A draft purchase order in the seeded project"""
+    order = client.post("/api/v1/orders", json={
+        "project_id": 1, "vendor_id": 2, "process_type": "genga", "quantity": 5, "unit_price": "100", **values,
+    }, headers=headers)
+    assert order.status_code == 201, order.text
+    return order.json()
+
+
+def approved_order(client, headers) -> dict:
+    """An approved purchase order, ready to be settled"""
+    order = create_order(client, headers)
+    assert client.put(f"/api/v1/orders/{order['id']}", json={"status": "pending"}, headers=headers).status_code == 200
+    assert client.post(f"/api/v1/orders/{order['id']}/approve", headers=headers).status_code == 200
+    return order
@@ -0,0 +1,80 @@
+"""
+create_app(config) - the application and its shared services follow the config passed in
+"""
+import asyncio
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app.core.changes import change_feed
+from app.core.config import Settings, settings
+from app.core.fast_json import fast_json_enabled, orjson
+from app.core.principal_cache import principal_cache
+from app.core.security import PasswordHashPool, password_pool
+from app.core.sequences import document_numbers
+from app.main import create_app
+
+
+def test_app_uses_factory_config(database):
+    config = Settings(
+        DATABASE_URL=f"sqlite:///{database}",
+        VERSION="9.9.9",
+        ENVIRONMENT="staging",
+        PASSWORD_HASH_WORKERS=2,
+        PASSWORD_HASH_MAX_QUEUE=5,
+        PRINCIPAL_CACHE_TTL_SECONDS=7,
+        PRINCIPAL_CACHE_MAX_SIZE=11,
+        DOCUMENT_NUMBER_BLOCK_SIZE=20,
+        CHANGE_FEED_BUFFER_SIZE=30,
+        CHANGE_FEED_QUEUE_SIZE=3,
+        CHANGE_FEED_KEEPALIVE_SECONDS=4,
+        FAST_JSON_RESPONSES=not settings.FAST_JSON_RESPONSES,
+    )
+
+    try:
+        with TestClient(create_app(config)) as client:
+            assert client.get("/").json()["version"] == "9.9.9"
+
+            health = client.get("/health").json()
+            assert (health["environment"], health["version"]) == ("staging", "9.9.9")
+            assert (health["password_pool"]["workers"], health["password_pool"]["max_queue"]) == (2, 5)
+            assert (health["principal_cache"]["ttl_seconds"], health["principal_cache"]["max_size"]) == (7, 11)
+
+            assert document_numbers.block_size == 20
+            assert (change_feed.buffer.maxlen, change_feed.queue_size, change_feed.keepalive_seconds) == (30, 3, 4)
+            assert fast_json_enabled() == (config.FAST_JSON_RESPONSES and orjson is not None)
+    finally:
+        # Later tests run against services configured from the global settings
+        with TestClient(create_app(Settings(DATABASE_URL=f"sqlite:///{database}"))):
+            pass
+
+
+def test_password_pool_resize_drains_running_jobs():
+    pool = PasswordHashPool(1, 5)
+    lock = threading.Lock()
+    running, peak, finished = 0, [], []
+
+    def job(number):
+        nonlocal running
+        with lock:
+            running += 1
+            peak.append(running)
+        time.sleep(0.1)
+        with lock:
+            running -= 1
+        finished.append(number)
+
+    async def resize_under_load():
+        old = [asyncio.ensure_future(pool.run(job, number)) for number in range(3)]
+        await asyncio.sleep(0.02)
+        pool.configure(2, 5)
+        # The old workers finished everything submitted to them before the swap
+        drained = sorted(finished)
+        await asyncio.gather(*old, *(pool.run(job, number) for number in range(3, 7)))
+        return drained
+
+    assert asyncio.run(resize_under_load()) == [0, 1, 2]
+    assert sorted(finished) == list(range(7))
+    assert max(peak) <= 2
+    assert pool.stats()["completed"] == 7 and pool.in_flight == 0
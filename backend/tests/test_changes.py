@@ -0,0 +1,160 @@
+"""
+Change feed - stream authentication and fan-out to many subscribers of a real server
+"""
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+import pytest
+import websockets
+
+from app.core.changes import change_feed
+from app.core.config import settings
+from conftest import PASSWORD, login
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ORDER = {"project_id": 1, "vendor_id": 2, "process_type": "genga", "quantity": 1, "unit_price": "100"}
+
+
+def test_stream_requires_a_valid_token(client):
+    assert client.get("/api/v1/changes/stream").status_code == 401
+    assert client.get("/api/v1/changes/stream", params={"token": "not-a-token"}).status_code == 401
+    assert client.get("/api/v1/changes/stream", headers={"Authorization": "Bearer not-a-token"}).status_code == 401
+
+
+def test_import_publishes_each_committed_batch(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_STORAGE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 3)
+    headers = login(client)
+    sheet = "project_id,vendor_id,process_type,quantity,unit_price\n" + "".join(
+        f"1,{1 + i % 2},genga,{1 + i},100\n" for i in range(5)
+    ) + "1,999,genga,1,100\n"
+
+    last_id = change_feed.last_id
+    response = client.post("/api/v1/orders/imports", files={"file": ("orders.csv", sheet)}, headers=headers)
+    assert response.status_code == 202, response.text
+    job_id = response.json()["id"]
+    assert client.get(f"/api/v1/orders/imports/{job_id}", headers=headers).json()["status"] == "completed"
+
+    events = [json.loads(event.data) for event in change_feed.buffer if event.id > last_id]
+    # Batches of 3 rows; the unknown vendor's row is rejected in the second
+    assert [(event["entity"], event["entity_id"], event["vendor_id"]) for event in events] == [
+        ("order_import", job_id, 1), ("order_import", job_id, 2),
+        ("order_import", job_id, 1), ("order_import", job_id, 2),
+    ]
+    assert {(event["status"], event["project_id"]) for event in events} == {("draft", 1)}
+
+
+@pytest.fixture(scope="module")
+def server(database):
+    """Base URL of uvicorn serving the app on the test database (TestClient buffers whole streams)"""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{database}", "PRINCIPAL_CACHE_TTL_SECONDS": "600"}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--log-level", "warning", "--ws-ping-interval", "0"],
+        cwd=BACKEND, env=env,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"{base}/health")
+                break
+            except httpx.ConnectError:
+                time.sleep(0.1)
+        yield base
+    finally:
+        process.terminate()
+        process.wait()
+
+
+async def access_token(http: httpx.AsyncClient) -> str:
+    response = await http.post("/api/v1/auth/login", data={"username": "pd@recess-studio.jp", "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return response.json()["access_token"]
+
+
+async def sse_subscriber(http: httpx.AsyncClient, params: dict, headers: dict, events: int, ready: list) -> list:
+    """Ids of the first `events` change events of an event stream"""
+    received = []
+    async with http.stream("GET", "/api/v1/changes/stream", params=params, headers=headers) as response:
+        assert response.status_code == 200
+        ready.append(1)
+        async for line in response.aiter_lines():
+            if line.startswith("data: ") and '"change"' in line:
+                received.append(json.loads(line[len("data: "):])["id"])
+                if len(received) == events:
+                    return received
+
+
+async def ws_subscriber(url: str, events: int, ready: list) -> list:
+    """Ids of the first `events` change events of a WebSocket"""
+    async with websockets.connect(url, max_queue=None) as websocket:
+        ready.append(1)
+        return [json.loads(await websocket.recv())["id"] for _ in range(events)]
+
+
+async def fan_out(base: str, subscribers: int, events: int) -> list:
+    """Event ids each subscriber received, half on SSE with ?token= and half on WebSockets"""
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=base, timeout=60, limits=limits) as http:
+        token = await access_token(http)
+        ready = []
+        ws_url = f"{base.replace('http', 'ws', 1)}/api/v1/changes/ws?token={token}&project_id=1"
+        tasks = [
+            asyncio.ensure_future(
+                sse_subscriber(http, {"token": token, "project_id": 1}, {}, events, ready) if i % 2
+                else ws_subscriber(ws_url, events, ready)
+            )
+            for i in range(subscribers)
+        ]
+        while len(ready) < subscribers:
+            await asyncio.sleep(0.05)
+            for task in tasks:
+                if task.done():
+                    task.result()
+
+        for _ in range(events):
+            response = await http.post("/api/v1/orders", json=ORDER, headers={"Authorization": f"Bearer {token}"})
+            assert response.status_code == 201, response.text
+        return await asyncio.wait_for(asyncio.gather(*tasks), 120)
+
+
+def test_stream_accepts_token_query_and_header(server):
+    async def run() -> list:
+        async with httpx.AsyncClient(base_url=server, timeout=30) as http:
+            token = await access_token(http)
+            ready = []
+            tasks = [
+                asyncio.ensure_future(sse_subscriber(http, {"token": token}, {}, 1, ready)),
+                asyncio.ensure_future(sse_subscriber(http, {}, {"Authorization": f"Bearer {token}"}, 1, ready)),
+            ]
+            while len(ready) < len(tasks):
+                await asyncio.sleep(0.05)
+            response = await http.post("/api/v1/orders", json=ORDER, headers={"Authorization": f"Bearer {token}"})
+            assert response.status_code == 201, response.text
+            return await asyncio.wait_for(asyncio.gather(*tasks), 30)
+
+    from_query, from_header = asyncio.run(run())
+    assert from_query == from_header
+
+
+@pytest.mark.parametrize("subscribers", [50, pytest.param(1000, marks=pytest.mark.slow)])
+def test_every_subscriber_gets_every_event(server, subscribers):
+    events = 5
+    received = asyncio.run(fan_out(server, subscribers, events))
+
+    assert len(received) == subscribers
+    first = received[0]
+    assert len(first) == events == len(set(first))
+    assert all(ids == first for ids in received)
+    assert httpx.get(f"{server}/health").json()["change_feed"]["overflows"] == 0
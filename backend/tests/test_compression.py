@@ -0,0 +1,29 @@
+"""
+Response compression - a 304 carries the same validator as the 200 it stands for
+"""
+import pytest
+
+from conftest import login
+
+
+@pytest.mark.parametrize("accept_encoding", ["gzip", "identity"])
+def test_not_modified_etag_matches_small_response(client, accept_encoding):
+    headers = login(client)
+    order = client.post("/api/v1/orders", json={
+        "project_id": 1, "vendor_id": 2, "process_type": "genga", "quantity": 1, "unit_price": "100",
+    }, headers=headers)
+    assert order.status_code == 201, order.text
+
+    # Far below COMPRESSION_MIN_SIZE
+    url = f"/api/v1/orders/{order.json()['id']}?fields=id,status"
+    headers["Accept-Encoding"] = accept_encoding
+    full = client.get(url, headers=headers)
+    assert full.status_code == 200
+    etag = full.headers["ETag"]
+
+    assert full.headers.get("Content-Encoding") == ("gzip" if accept_encoding == "gzip" else None)
+    assert etag.startswith("W/") == (accept_encoding == "gzip")
+
+    not_modified = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
@@ -0,0 +1,60 @@
+"""
+Optimistic concurrency - concurrent updates from the same version: one wins, none is lost
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import init_db
+from app.models import PurchaseOrder, Settlement
+from conftest import approved_order, create_order, login
+
+
+def put_concurrently(client, url: str, bodies: list, headers: dict) -> list:
+    """Send one PUT per body at the same moment; responses in body order"""
+    barrier = threading.Barrier(len(bodies))
+
+    def put(body):
+        barrier.wait()
+        return client.put(url, json=body, headers=headers)
+
+    with ThreadPoolExecutor(len(bodies)) as pool:
+        return list(pool.map(put, bodies))
+
+
+def stored(model, row_id: int):
+    db = init_db.SessionLocal()
+    try:
+        return db.get(model, row_id)
+    finally:
+        db.close()
+
+
+def assert_one_update_wins(client, model, url: str, row_id: int, headers: dict) -> None:
+    etag = client.get(url, headers=headers).headers["ETag"]
+    version = stored(model, row_id).version
+
+    bodies = [{"notes": "desk A"}, {"notes": "desk B"}]
+    responses = put_concurrently(client, url, bodies, {**headers, "If-Match": etag})
+
+    assert sorted(response.status_code for response in responses) == [200, 412], [r.text for r in responses]
+    winner = bodies[[response.status_code for response in responses].index(200)]
+    row = stored(model, row_id)
+    assert row.version == version + 1
+    assert row.notes == winner["notes"]
+
+
+def test_concurrent_order_updates(client):
+    headers = login(client)
+    order = create_order(client, headers)
+    assert_one_update_wins(client, PurchaseOrder, f"/api/v1/orders/{order['id']}", order["id"], headers)
+
+
+def test_concurrent_settlement_updates(client):
+    headers = login(client)
+    order = approved_order(client, headers)
+    settlement = client.post("/api/v1/settlements", json={
+        "order_id": order["id"], "vendor_id": 2, "project_id": 1, "completed_cuts": 5,
+    }, headers=headers)
+    assert settlement.status_code == 201, settlement.text
+    settlement_id = settlement.json()["id"]
+    assert_one_update_wins(client, Settlement, f"/api/v1/settlements/{settlement_id}", settlement_id, headers)
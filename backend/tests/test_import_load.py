@@ -0,0 +1,136 @@
+"""
+Import loads - rows reach the table column for column on every load path
+
+The COPY paths need PostgreSQL: set TEST_POSTGRES_URL (a database the
+tests may create and drop schemas in) and install psycopg2/asyncpg. The
+executemany fallback always runs on SQLite.
+"""
+import asyncio
+import os
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import Column, MetaData, Table, create_engine, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.core.database import SyncSessionAdapter, get_async_url
+from app.core.imports import build_order_rows, load_rows
+from app.models import OrderStatus, PurchaseOrder
+from app.schemas.purchase_order import PurchaseOrderCreate
+
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+ORDERED_AT = datetime(2026, 10, 18, 9, 30, tzinfo=timezone.utc)
+
+
+def order_rows() -> list:
+    """Rows as _import_batches builds them, with values the COPY encodings must round-trip"""
+    items = [
+        PurchaseOrderCreate(
+            project_id=1, vendor_id=2, process_type="genga", quantity=12, unit_price=Decimal("1234.56"),
+            difficulty_rate=Decimal("1.25"), withholding_tax_rate=Decimal("0.1"),
+            deadline=date(2026, 12, 24), description=None, notes="tab\there\nnew line \\N back\\slash 作画",
+        ),
+        PurchaseOrderCreate(
+            project_id=3, vendor_id=4, process_type="douga", quantity=300, unit="sheet",
+            unit_price=Decimal("0.5"), urgency_rate=Decimal("1.5"), description="", notes=None,
+        ),
+    ]
+    rows = build_order_rows(items, ["PO-2026-0001", "PO-2026-0002"], 5, ORDERED_AT)
+    for row in rows:
+        row.update(created_at=ORDERED_AT, updated_at=ORDERED_AT)
+    return rows
+
+
+def load_table(metadata: MetaData) -> Table:
+    """purchase_orders without its foreign keys, so rows load without their parents"""
+    return Table(PurchaseOrder.__tablename__, metadata, *(
+        Column(
+            column.name, column.type, primary_key=column.primary_key, nullable=column.nullable,
+            server_default=column.server_default.arg if column.server_default is not None else None,
+        )
+        for column in PurchaseOrder.__table__.columns
+    ))
+
+
+def comparable(value):
+    # SQLite hands timestamps back naive, PostgreSQL in the session time zone
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    return value
+
+
+async def load(driver: str, url: str, connect_args: dict, rows: list) -> None:
+    if driver == "asyncpg":
+        engine = create_async_engine(url, connect_args=connect_args)
+        async with AsyncSession(engine) as db:
+            await load_rows(db, rows)
+            await db.commit()
+        await engine.dispose()
+    else:
+        engine = create_engine(url, connect_args=connect_args)
+        db = SyncSessionAdapter(Session(engine))
+        try:
+            await load_rows(db, rows)
+            await db.commit()
+        finally:
+            await db.close()
+        engine.dispose()
+
+
+@pytest.fixture(params=["sqlite", "psycopg2", "asyncpg"])
+def target(request, tmp_path):
+    """(driver, url, connect args, sync engine) over an empty purchase_orders table"""
+    driver = request.param
+    if driver == "sqlite":
+        url = f"sqlite:///{tmp_path / 'load.db'}"
+        engine = create_engine(url)
+        load_table(MetaData()).create(engine)
+        yield driver, url, {}, engine
+        engine.dispose()
+        return
+
+    if not POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    pytest.importorskip("psycopg2")
+    if driver == "asyncpg":
+        pytest.importorskip("asyncpg")
+
+    # A schema of its own, first on the search path, so the real table is untouched
+    schema = f"load_test_{uuid.uuid4().hex[:8]}"
+    engine = create_engine(POSTGRES_URL, connect_args={"options": f"-csearch_path={schema}"})
+    with engine.begin() as connection:
+        connection.execute(text(f"CREATE SCHEMA {schema}"))
+    load_table(MetaData()).create(engine)
+
+    if driver == "asyncpg":
+        yield driver, get_async_url(POSTGRES_URL), {"server_settings": {"search_path": schema}}, engine
+    else:
+        yield driver, POSTGRES_URL, {"options": f"-csearch_path={schema}"}, engine
+
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+    engine.dispose()
+
+
+def test_loaded_rows_match_column_for_column(target):
+    driver, url, connect_args, engine = target
+    rows = order_rows()
+
+    asyncio.run(load(driver, url, connect_args, rows))
+
+    table = load_table(MetaData())
+    with engine.connect() as connection:
+        stored = connection.execute(select(table).order_by(table.c.order_no)).mappings().all()
+
+    assert len(stored) == len(rows)
+    for row, loaded in zip(rows, stored):
+        assert loaded["id"] is not None and loaded["version"] == 1
+        assert {column: comparable(loaded[column]) for column in row} == {
+            column: comparable(value) for column, value in row.items()
+        }
+    assert stored[0]["status"] == OrderStatus.draft
+    assert isinstance(stored[0]["unit_price"], Decimal) and isinstance(stored[0]["deadline"], date)
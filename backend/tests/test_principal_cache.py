@@ -0,0 +1,107 @@
+"""
+Principal cache - cached users survive rollbacks and are evicted when an authorization change commits
+"""
+from sqlalchemy import select, update
+
+import init_db
+from app.core.principal_cache import detached_copy, principal_cache
+from app.models import Settlement, User, UserStatus
+from conftest import approved_order, login
+
+
+def test_cached_user_survives_rollback(client):
+    headers = login(client)
+    order = approved_order(client, headers)
+
+    # A settlement the endpoint's pre-checks do not see: its insert hits
+    # uq_settlements_order_id and the request session rolls back
+    db = init_db.SessionLocal()
+    db.add(Settlement(
+        settlement_no=f"ST-TEST-{order['id']}", order_id=order["id"], vendor_id=2, project_id=1,
+        completed_cuts=1, base_amount=1, adjusted_amount=1, vat_amount=0, withholding_tax=0,
+        net_amount=1, final_amount=1, settled_by=1,
+    ))
+    db.commit()
+    db.close()
+
+    # The duplicate request is the one that loads and caches the user
+    principal_cache.clear()
+    duplicate = client.post("/api/v1/settlements", json={
+        "order_id": order["id"], "vendor_id": 2, "project_id": 1, "completed_cuts": 5,
+    }, headers=headers)
+    assert duplicate.status_code == 400
+    assert duplicate.json()["detail"] == "Settlement already exists for this order"
+
+    me = client.get("/api/v1/auth/me", headers=headers)
+    assert me.status_code == 200, me.text
+    assert me.json()["email"] == "pd@recess-studio.jp"
+    assert client.get("/api/v1/orders", headers=headers).status_code == 200
+
+
+def cached_user(email: str = "pd@recess-studio.jp") -> User:
+    """A seeded user, loaded and cached the way get_current_user does it"""
+    db = init_db.SessionLocal()
+    try:
+        user = detached_copy(db.scalar(select(User).where(User.email == email)))
+    finally:
+        db.close()
+    principal_cache.clear()
+    principal_cache.set(user)
+    return user
+
+
+def test_authz_change_evicts_on_commit_not_flush(database):
+    user = cached_user()
+    db = init_db.SessionLocal()
+    try:
+        row = db.get(User, user.id)
+        role_level = row.role_level
+        row.role_level = role_level + 1
+        db.flush()
+        # Not committed: a request reloading the user now would read the old row
+        assert principal_cache.get(user.id) is not None
+
+        db.commit()
+        assert principal_cache.get(user.id) is None
+
+        row.role_level = role_level
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_rolled_back_change_keeps_user(database):
+    user = cached_user()
+    db = init_db.SessionLocal()
+    try:
+        db.get(User, user.id).status = UserStatus.suspended
+        db.flush()
+        db.rollback()
+    finally:
+        db.close()
+    assert principal_cache.get(user.id) is not None
+
+
+def test_bulk_update_evicts_every_user_on_commit(database):
+    user = cached_user()
+    db = init_db.SessionLocal()
+    try:
+        db.execute(update(User).where(User.id == user.id).values(org_id=User.org_id))
+        assert principal_cache.get(user.id) is not None
+        db.commit()
+    finally:
+        db.close()
+    assert principal_cache.get(user.id) is None
+
+
+def test_load_racing_an_eviction_is_not_cached(database):
+    user = cached_user()
+    principal_cache.clear()
+
+    # get_current_user reads the generation, then loads the (old) row...
+    generation = principal_cache.generation
+    # ...while another request commits a change to the user
+    principal_cache.invalidate(user.id)
+    principal_cache.set(user, generation)
+
+    assert principal_cache.get(user.id) is None
@@ -0,0 +1,62 @@
+"""
+Production progress - cut counters follow every flush once the listeners are registered
+"""
+import os
+import subprocess
+import sys
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+import init_db
+from app.core import progress
+from app.core.progress import find_drift
+from app.models import Cut, CutStatus, Episode
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+REGISTRATION_PROBE = """
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.core import progress
+from app.main import create_app
+
+imported = event.contains(Session, "after_flush", progress._maintain_progress)
+create_app()
+print(imported, event.contains(Session, "after_flush", progress._maintain_progress))
+"""
+
+
+def test_listener_is_registered_by_create_app_not_by_import():
+    result = subprocess.run([sys.executable, "-c", REGISTRATION_PROBE], cwd=BACKEND, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ["False", "True"]
+
+
+def test_registering_again_does_not_count_twice(database):
+    progress.register_listeners()
+    progress.register_listeners()
+    assert event.contains(Session, "after_flush", progress._maintain_progress)
+
+    db = init_db.SessionLocal()
+    try:
+        episode = Episode(project_id=1, episode_no=901)
+        db.add(episode)
+        db.flush()
+        cuts = [Cut(episode_id=episode.id, cut_no=f"C{number:03d}", process_type="genga") for number in range(3)]
+        db.add_all(cuts)
+        db.commit()
+
+        cuts[0].status = CutStatus.completed
+        db.commit()
+        db.refresh(episode)
+        assert (episode.total_cuts, episode.completed_cuts) == (3, 1)
+        assert find_drift(db) == []
+
+        for cut in cuts:
+            db.delete(cut)
+        db.delete(episode)
+        db.commit()
+        assert find_drift(db) == []
+    finally:
+        db.close()
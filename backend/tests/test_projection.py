@@ -0,0 +1,70 @@
+"""
+expand= and fields= - a fixed number of queries per page and only the requested columns
+"""
+import pytest
+
+from conftest import approved_order, count_statements, login, selects
+
+
+@pytest.fixture
+def listed(client):
+    """Authenticated headers, with enough orders and settlements for a 50-row page"""
+    headers = login(client)
+    items = [
+        {"project_id": 1, "vendor_id": 1 + i % 2, "process_type": "douga", "quantity": 1 + i, "unit_price": "100"}
+        for i in range(60)
+    ]
+    assert client.post("/api/v1/orders/bulk", json={"items": items}, headers=headers).status_code == 201
+
+    for _ in range(3):
+        order = approved_order(client, headers)
+        settlement = client.post("/api/v1/settlements", json={
+            "order_id": order["id"], "vendor_id": 2, "project_id": 1, "completed_cuts": 5,
+        }, headers=headers)
+        assert settlement.status_code == 201, settlement.text
+    return headers
+
+
+def page_statements(client, headers, url: str, limit: int) -> tuple:
+    with count_statements() as statements:
+        response = client.get(url, params={"limit": limit}, headers=headers)
+    assert response.status_code == 200, response.text
+    return len(response.json()), statements
+
+
+@pytest.mark.parametrize("url, expand", [
+    ("/api/v1/orders", "project,vendor,settlements"),
+    ("/api/v1/settlements", "order,project,vendor"),
+])
+def test_expand_query_count_does_not_grow_with_page_size(client, listed, url, expand):
+    url = f"{url}?expand={expand}"
+    # Authenticate once so the principal comes from the cache below
+    assert client.get("/api/v1/auth/me", headers=listed).status_code == 200
+
+    rows_1, statements_1 = page_statements(client, listed, url, 1)
+    rows_50, statements_50 = page_statements(client, listed, url, 50)
+
+    assert (rows_1, rows_50 > 1) == (1, True)
+    assert len(statements_1) == len(statements_50) == 1 + len(expand.split(","))
+
+
+def selected_columns(statement: str) -> set:
+    """Column names in the SELECT list of a single-table statement"""
+    select_list = statement.split("FROM", 1)[0].strip()[len("SELECT"):]
+    return {column.strip().split(".")[-1] for column in select_list.split(",")}
+
+
+@pytest.mark.parametrize("url, table", [
+    ("/api/v1/orders", "purchase_orders"),
+    ("/api/v1/settlements", "settlements"),
+])
+def test_fields_selects_only_requested_columns(client, listed, url, table):
+    with count_statements() as statements:
+        response = client.get(url, params={"fields": "status,net_amount", "limit": 5}, headers=listed)
+    assert response.status_code == 200, response.text
+    assert set(response.json()[0]) == {"status", "net_amount"}
+
+    # The page query; the other SELECT is the ETag's count/max/sum
+    page = [statement for statement in selects(statements) if "ORDER BY" in statement and f"FROM {table}" in statement]
+    assert len(page) == 1, statements
+    assert selected_columns(page[0]) == {"status", "net_amount", "id", "created_at", "version"}
@@ -0,0 +1,80 @@
+"""
+Finance rollups - incremental maintenance leaves the same rows as a rebuild
+"""
+import os
+import subprocess
+import sys
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+import init_db
+from app.core import rollups
+from app.core.rollups import MEASURES, rebuild_rollups
+from app.models import FinanceRollup
+from conftest import login
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+REGISTRATION_PROBE = """
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.core import rollups
+from app.main import create_app
+
+imported = event.contains(Session, "after_flush", rollups._maintain_rollups)
+create_app()
+print(imported, event.contains(Session, "after_flush", rollups._maintain_rollups))
+"""
+
+
+def rollup_rows(db) -> set:
+    names = ("source", "project_id", "vendor_id", "period", "status") + MEASURES
+    return set(db.execute(select(*(getattr(FinanceRollup, name) for name in names))).all())
+
+
+def test_emptied_bucket_is_removed(client):
+    headers = login(client)
+    order = client.post("/api/v1/orders", json={
+        "project_id": 1, "vendor_id": 3, "process_type": "douga", "quantity": 2, "unit_price": "100",
+    }, headers=headers)
+    assert order.status_code == 201, order.text
+    # The order leaves the draft bucket, which has no other document
+    assert client.put(f"/api/v1/orders/{order.json()['id']}", json={"status": "pending"}, headers=headers).status_code == 200
+
+    db = init_db.SessionLocal()
+    try:
+        incremental = rollup_rows(db)
+        assert all(row.document_count > 0 for row in incremental)
+
+        rebuild_rollups(db)
+        assert rollup_rows(db) == incremental
+        db.rollback()
+    finally:
+        db.close()
+
+
+def test_listener_is_registered_by_create_app_not_by_import():
+    result = subprocess.run([sys.executable, "-c", REGISTRATION_PROBE], cwd=BACKEND, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ["False", "True"]
+
+
+def test_registering_again_does_not_count_twice(client):
+    rollups.register_listeners()
+    assert event.contains(Session, "after_flush", rollups._maintain_rollups)
+
+    headers = login(client)
+    order = client.post("/api/v1/orders", json={
+        "project_id": 1, "vendor_id": 3, "process_type": "genga", "quantity": 3, "unit_price": "250",
+    }, headers=headers)
+    assert order.status_code == 201, order.text
+
+    db = init_db.SessionLocal()
+    try:
+        incremental = rollup_rows(db)
+        rebuild_rollups(db)
+        assert rollup_rows(db) == incremental
+        db.rollback()
+    finally:
+        db.close()
@@ -0,0 +1,108 @@
+"""
+Document number counters - seeding from earlier numbers and allocating under concurrency
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, List
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import DbSession, SyncSessionAdapter
+from app.core.sequences import DocumentNumberAllocator, reserve_range
+from app.models import DocumentSequence, PurchaseOrder
+
+
+def test_counter_seeds_from_highest_number_not_highest_string():
+    engine = create_engine("sqlite://")
+    PurchaseOrder.metadata.create_all(engine, tables=[PurchaseOrder.__table__, DocumentSequence.__table__])
+    order = {
+        "project_id": 1, "vendor_id": 1, "process_type": "genga", "quantity": 1, "unit_price": 1,
+        "base_amount": 1, "adjusted_amount": 1, "vat_amount": 0, "net_amount": 1,
+        "status": "draft", "ordered_by": 1,
+    }
+
+    with engine.begin() as connection:
+        connection.execute(insert(PurchaseOrder), [
+            {**order, "order_no": order_no} for order_no in ("PO-2025-9999", "PO-2025-10000", "PO-2024-20000")
+        ])
+        # "PO-2025-9999" > "PO-2025-10000" as strings
+        assert reserve_range(connection, "PO", 2025, 1, PurchaseOrder.order_no) == 10001
+
+
+@asynccontextmanager
+async def new_sessions(kind: str, path) -> AsyncIterator[Callable[[], DbSession]]:
+    """Session factory of the given kind over a fresh SQLite file holding the counter tables"""
+    tables = [PurchaseOrder.__table__, DocumentSequence.__table__]
+    if kind == "async":
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        async with engine.begin() as connection:
+            await connection.run_sync(PurchaseOrder.metadata.create_all, tables=tables)
+        factory = async_sessionmaker(engine)
+        yield factory
+        await engine.dispose()
+    else:
+        engine = create_engine(f"sqlite:///{path}")
+        PurchaseOrder.metadata.create_all(engine, tables=tables)
+        factory = sessionmaker(engine)
+        yield lambda: SyncSessionAdapter(factory())
+        engine.dispose()
+
+
+async def allocate_one(allocator: DocumentNumberAllocator, new_session, limit: asyncio.Semaphore) -> str:
+    """One create's allocation, in its own session committed afterwards"""
+    async with limit:
+        db = new_session()
+        try:
+            [order_no] = await allocator.allocate(db, "PO", seed_column=PurchaseOrder.order_no)
+            await db.commit()
+        finally:
+            await db.close()
+    return order_no
+
+
+async def allocate_concurrently(kind: str, path, allocators: list, per_allocator: int) -> List[List[str]]:
+    """Numbers handed out by each allocator, all allocations running at once"""
+    async with new_sessions(kind, path) as new_session:
+        # Stay within the connection pool (5 + 10 overflow)
+        limit = asyncio.Semaphore(10)
+        tasks = [
+            [allocate_one(allocator, new_session, limit) for _ in range(per_allocator)]
+            for allocator in allocators
+        ]
+        results = await asyncio.gather(*(task for per_worker in tasks for task in per_worker))
+    return [results[i * per_allocator:(i + 1) * per_allocator] for i in range(len(allocators))]
+
+
+def number(order_no: str) -> int:
+    return int(order_no.rsplit("-", 1)[1])
+
+
+@pytest.mark.parametrize("kind", ["async", "sync"])
+def test_parallel_allocation_per_row(kind, tmp_path):
+    [order_nos] = asyncio.run(allocate_concurrently(kind, tmp_path / "seq.db", [DocumentNumberAllocator(1)], 2000))
+
+    assert len(set(order_nos)) == 2000
+    # Gap-free: every number is reserved in the create's own transaction
+    assert sorted(map(number, order_nos)) == list(range(1, 2001))
+
+
+@pytest.mark.parametrize("kind", ["async", "sync"])
+def test_parallel_allocation_in_blocks(kind, tmp_path):
+    block_size = 50
+    # One allocator per simulated worker
+    workers = [DocumentNumberAllocator(block_size) for _ in range(4)]
+    per_worker = asyncio.run(allocate_concurrently(kind, tmp_path / "seq.db", workers, 10 * block_size))
+
+    everything = [order_no for order_nos in per_worker for order_no in order_nos]
+    assert len(set(everything)) == len(everything) == 2000
+
+    for order_nos in per_worker:
+        numbers = sorted(map(number, order_nos))
+        # Each worker used up exactly its blocks, each a contiguous run
+        for start in range(0, len(numbers), block_size):
+            block = numbers[start:start + block_size]
+            assert block == list(range(block[0], block[0] + block_size))
+            assert (block[0] - 1) % block_size == 0
@@ -0,0 +1,29 @@
+"""
+Settlement summary - one aggregate query whatever the filters
+"""
+from datetime import date, timedelta
+
+from app.models import SettlementStatus
+from conftest import count_statements, login, selects
+
+
+def test_summary_is_one_query(client):
+    headers = login(client)
+    # Authenticate once so the principal comes from the cache below
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    today = date.today()
+    params = {
+        "status": "pending", "vendor_id": 2, "project_id": 1,
+        "date_from": (today - timedelta(days=30)).isoformat(), "date_to": today.isoformat(),
+    }
+    with count_statements() as statements:
+        response = client.get("/api/v1/settlements/summary", params=params, headers=headers)
+
+    assert response.status_code == 200, response.text
+    assert len(statements) == 1, statements
+    assert len(selects(statements)) == 1
+
+    summary = response.json()
+    assert [entry["status"] for entry in summary["by_status"]] == [status.value for status in SettlementStatus]
+    assert all(entry["count"] == 0 for entry in summary["by_status"] if entry["status"] != "pending")
@@ -0,0 +1,69 @@
+"""
+Startup - `import app.main` is cheap and building the app touches no database
+"""
+import json
+import os
+import subprocess
+import sys
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Wall-clock budget for a cold `import app.main` in a fresh interpreter
+IMPORT_BUDGET_SECONDS = 1.5
+
+IMPORT_PROBE = """
+import time
+started = time.perf_counter()
+import app.main
+print(time.perf_counter() - started)
+"""
+
+# Counts connects and statements from every engine, including ones created later
+BUILD_PROBE = """
+import json, sys
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+connects, ddl = [], []
+event.listen(Engine, "connect", lambda *args: connects.append(1))
+event.listen(Engine, "before_cursor_execute", lambda conn, cursor, statement, *args: ddl.append(statement))
+
+import app.main
+lazy = not any(name.startswith(("app.routers", "app.models")) for name in sys.modules)
+
+app.main.app
+from app.core import database
+print(json.dumps({
+    "lazy": lazy,
+    "engine": database.engine is not None or database.async_engine is not None,
+    "connects": len(connects),
+    "statements": ddl,
+}))
+"""
+
+
+def run_probe(probe: str, database_file) -> str:
+    """Last line printed by `probe` in a fresh interpreter, against a database that does not exist"""
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{database_file}"}
+    result = subprocess.run(
+        [sys.executable, "-c", probe], cwd=BACKEND, env=env, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip().splitlines()[-1]
+
+
+def test_building_the_app_does_no_ddl_or_connect(tmp_path):
+    database_file = tmp_path / "never-created.db"
+    probe = json.loads(run_probe(BUILD_PROBE, database_file))
+
+    assert probe["lazy"], "app.main imported the routers or models"
+    assert probe["engine"] is False
+    assert probe["connects"] == 0
+    assert probe["statements"] == []
+    assert not database_file.exists()
+
+
+def test_import_stays_within_budget(tmp_path):
+    # Best of three, so one slow start on a busy machine does not fail the run
+    seconds = min(float(run_probe(IMPORT_PROBE, tmp_path / "never-created.db")) for _ in range(3))
+    assert seconds < IMPORT_BUDGET_SECONDS, f"import app.main took {seconds:.2f}s"
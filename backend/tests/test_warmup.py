@@ -0,0 +1,22 @@
+"""
+Startup warmup - the statements of the unfiltered list endpoints are compiled before the first request
+"""
+import pytest
+
+from app.core import database as database_module
+from app.core.warmup import hot_statements
+from conftest import count_statements, login
+
+
+@pytest.mark.parametrize("url", ["/api/v1/orders", "/api/v1/settlements", "/api/v1/settlements/summary"])
+def test_list_statements_are_warmed(client, url):
+    headers = login(client)
+    # Authenticate once so the principal comes from the cache below
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    with count_statements() as statements:
+        assert client.get(url, headers=headers).status_code == 200
+
+    engine = database_module.async_engine.sync_engine if database_module.async_engine else database_module.engine
+    warmed = {str(statement.compile(dialect=engine.dialect)) for statement in hot_statements()}
+    assert statements and set(statements) <= warmed, set(statements) - warmed